@@ -1,16 +1,262 @@
+import argparse
+import asyncio
 import json
-from langchain.messages import HumanMessage
+import sys
 
-from tradagent.agents.stock_analyst_agent import build_agent as build_stock_agent
-from tradagent.agents.report_writer_agent import build_agent as build_report_agent
-from tradagent.agents.orchestrator_agent import build_agent as build_orchestrator_agent
-from tradagent.utils.answer_utils import extract_final_answer
+# Only light modules are imported here; LangChain, the agents and the market
+# data stack load on first use so --help and rule-routed queries start fast
+from tradagent.utils.routing import ROUTE_STATS, extract_tickers, format_route_stats, route_query
+from tradagent.monitor import DEFAULT_INTERVAL
+from tradagent.utils.tracing import TRACE_DIR, TRACER, format_percentiles, format_trace, span
+from tradagent.pipeline import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_LLM_CONCURRENCY,
+    DEFAULT_TIMEOUT,
+    format_summary,
+    record_analyses,
+    run_batch,
+    run_stock_pipeline,
+)
 
 
-def main():
-    orchestrator = build_orchestrator_agent()
-    stock_agent = build_stock_agent()
-    report_agent = build_report_agent()
+class LazyAgents:
+    """Builds each agent on first use and keeps it for the rest of the session."""
+
+    def __init__(self, mode="pipeline"):
+        self.mode = mode
+        self._built = {}
+
+    def _get(self, name, build):
+        if name not in self._built:
+            self._built[name] = build()
+        return self._built[name]
+
+    @property
+    def orchestrator(self):
+        from tradagent.agents.orchestrator_agent import build_agent
+        return self._get("orchestrator", build_agent)
+
+    @property
+    def stock(self):
+        from tradagent.agents.stock_analyst_agent import build_agent
+        return self._get("stock", build_agent)
+
+    @property
+    def prose_llm(self):
+        if self.mode != "pipeline":
+            return None
+        from tradagent.agents.stock_analyst_agent import build_prose_llm
+        return self._get("prose_llm", build_prose_llm)
+
+
+def _print_llm_cache_stats():
+    from tradagent.utils.llm_cache import get_llm_cache
+
+    if get_llm_cache():
+        print(get_llm_cache().format_stats())
+
+
+def _print_client_stats():
+    # Only when a provider client was used this session (importing it pulls in requests)
+    clients = sys.modules.get("tradagent.utils.clients")
+    if clients and clients.STATS:
+        print(clients.format_client_stats())
+
+
+def _print_profile(profile: bool):
+    if not profile:
+        return
+    path = TRACER.write_metrics()
+    TRACER.close()
+    print(f"\n[Profile] Stage latencies\n{format_percentiles()}")
+    print(f"[Profile] Spans and metrics written to {path.parent}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="TRADAgent -- LLM Orchestrated System")
+    parser.add_argument(
+        "--mode",
+        choices=["pipeline", "agent"],
+        default="pipeline",
+        help="pipeline: compute metrics locally and call the LLM once for prose; "
+             "agent: tool-calling stock analyst agent",
+    )
+    parser.add_argument("--llm-cache", action="store_true", help="Serve repeated LLM prompts from the local SQLite cache")
+    parser.add_argument("--tickers", help="Comma-separated watchlist to analyze in batch mode, e.g. AAPL,MSFT,NVDA")
+    parser.add_argument("--report", action="store_true", help="Also generate a PDF report per ticker (batch mode)")
+    parser.add_argument("--output-dir", default="./reports", help="Directory for generated reports")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Tickers processed at once")
+    parser.add_argument("--llm-concurrency", type=int, default=DEFAULT_LLM_CONCURRENCY, help="Simultaneous LLM agent calls")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-ticker timeout in seconds")
+    parser.add_argument("--monitor", action="store_true", help="Watch --tickers on a schedule and alert on RSI 30/70 "
+                        "crossings and MACD histogram sign changes")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between monitor refreshes")
+    parser.add_argument("--analyze-alerts", action="store_true", help="Run the stock analysis for tickers that raised "
+                        "an alert (monitor mode; with --report, also the PDF)")
+    parser.add_argument("--profile", action="store_true", help="Trace every stage: per-request breakdown, stage "
+                        "percentiles on exit, spans and OpenMetrics written to --trace-dir")
+    parser.add_argument("--trace-dir", default=str(TRACE_DIR), help="Directory for spans.jsonl and metrics.prom")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP API (analyze, report, job polling, "
+                        "screen); --concurrency sets the worker pool")
+    parser.add_argument("--host", default="127.0.0.1", help="Address the HTTP API listens on")
+    parser.add_argument("--port", type=int, default=8080, help="Port the HTTP API listens on")
+    parser.add_argument("--queue-size", type=int, default=32, help="Jobs the HTTP API queues before answering 429")
+    return parser.parse_args()
+
+
+def main_batch(args):
+    tickers = args.tickers.split(",")
+    agents = LazyAgents(args.mode)
+    if args.mode == "pipeline":
+        stock_agent, prose_llm = None, agents.prose_llm
+    else:
+        stock_agent, prose_llm = agents.stock, None
+
+    print(f"[System] Analyzing {len(tickers)} tickers "
+          f"(concurrency={args.concurrency}, llm={args.llm_concurrency}, timeout={args.timeout}s)...")
+    results = asyncio.run(run_batch(
+        tickers,
+        stock_agent,
+        report=args.report,
+        output_dir=args.output_dir,
+        concurrency=args.concurrency,
+        llm_concurrency=args.llm_concurrency,
+        timeout=args.timeout,
+        prose_llm=prose_llm,
+    ))
+    print("\n" + format_summary(results))
+    _print_llm_cache_stats()
+    _print_client_stats()
+    _print_profile(args.profile)
+
+
+def main_monitor(args):
+    from tradagent.monitor import WatchlistMonitor
+
+    agents = LazyAgents(args.mode)
+    monitor = WatchlistMonitor(
+        args.tickers.split(","),
+        interval=args.interval,
+        llm_concurrency=args.llm_concurrency,
+        analyze=args.analyze_alerts,
+        report=args.report,
+        output_dir=args.output_dir,
+        # LLM clients are only built when alerts should trigger analyses
+        stock_agent=agents.stock if args.analyze_alerts and args.mode == "agent" else None,
+        prose_llm=agents.prose_llm if args.analyze_alerts else None,
+    )
+    print(f"[System] Monitoring {len(monitor.tickers)} tickers every {args.interval:.0f}s (Ctrl+C to stop)...")
+    try:
+        asyncio.run(monitor.run())
+    except KeyboardInterrupt:
+        print(f"\n[System] Monitor stopped after {monitor.cycles} cycles.")
+    _print_llm_cache_stats()
+    _print_client_stats()
+    _print_profile(args.profile)
+
+
+def main_serve(args):
+    from tradagent.server import serve
+
+    print(f"[System] Serving on http://{args.host}:{args.port} "
+          f"(workers={args.concurrency}, queue={args.queue_size}, llm={args.llm_concurrency})...")
+    serve(
+        host=args.host,
+        port=args.port,
+        mode=args.mode,
+        workers=args.concurrency,
+        queue_size=args.queue_size,
+        llm_concurrency=args.llm_concurrency,
+        timeout=args.timeout,
+        output_dir=args.output_dir,
+    )
+    _print_llm_cache_stats()
+    _print_client_stats()
+    _print_profile(args.profile)
+
+
+def handle_query(user_input: str, agents: LazyAgents):
+    """One REPL request: orchestration plan, stock analysis and optional report."""
+    # ---- Step 1: Orchestration plan ----
+    # Unambiguous queries ("Analyze AAPL", "AAPL report pdf") are routed
+    # locally; only the rest pay for an orchestrator LLM round-trip
+    with span("orchestrator.route"):
+        plan = route_query(user_input)
+    if plan is None:
+        from langchain.messages import HumanMessage
+        from tradagent.utils.answer_utils import extract_final_answer
+
+        ROUTE_STATS["llm"] += 1
+        with span("agent.orchestrator"):
+            orchestration_response = agents.orchestrator.invoke({
+                "messages": [HumanMessage(content=user_input)]
+            })
+
+        plan_raw = extract_final_answer(orchestration_response)
+
+        try:
+            plan = json.loads(plan_raw)
+        except json.JSONDecodeError:
+            print("ERROR: Orchestrator produced invalid JSON")
+            # print(plan_raw) # Optional debug
+            return
+
+    # ---- Step 2: Stock analysis (if required) ----
+    analysis = None
+    if plan["run_stock_analysis"]:
+        tickers = extract_tickers(plan["clean_query"])
+        if agents.prose_llm is not None and len(tickers) == 1:
+            # Numbers are computed locally; the LLM only writes the prose
+            print("\n[System] Running stock analysis pipeline...")
+            analysis = run_stock_pipeline(tickers[0], agents.prose_llm)
+        else:
+            from langchain.messages import HumanMessage
+            from tradagent.utils.analysis_record import AnalysisRecord
+            from tradagent.utils.answer_utils import extract_final_answer
+
+            print("\n[System] Running stock analysis agent...")
+            with span("agent.stock"):
+                analysis_response = agents.stock.invoke({
+                    "messages": [HumanMessage(content=plan["clean_query"])]
+                })
+            # Validate the agent's answer once; everything downstream is typed
+            try:
+                with span("parse.json"):
+                    analysis = AnalysisRecord.from_json(extract_final_answer(analysis_response))
+            except ValueError:
+                print("ERROR: Stock analysis agent produced invalid JSON")
+        if analysis is not None:
+            with span("store.record"):
+                record_analyses([analysis])
+
+        # Optional: Print preview of analysis
+        # print("\n[System] Analysis completed.")
+
+    # ---- Step 3: Report generation (if required) ----
+    if plan["run_report_generation"]:
+        if analysis is not None:
+            # Render the record DIRECTLY instead of through the agent
+            # This avoids JSON escaping issues with the LLM
+            from tradagent.tools.report_writer_tools import build_report
+
+            print("\n[System] Generating PDF report...")
+            with span("report.build"):
+                result = build_report(analysis)
+
+            if result.get("success"):
+                print("[Success] Report generated successfully.")
+                print(f"Path: {result['pdf_path']}")
+                print(f"Size: {result['size_kb']} KB")
+            else:
+                print("[Error] Report generation failed.")
+                print(f"Details: {result.get('error')}")
+        else:
+            print("\n[Warning] No analysis available to generate report.")
+
+
+def main(mode="pipeline", profile=False):
+    # Agents are built when a query first needs them, not at startup
+    agents = LazyAgents(mode)
 
     print("=" * 60)
     print("TRADAgent -- LLM Orchestrated System")
@@ -25,62 +271,38 @@ def main():
         user_input = input("USER > ").strip()
 
         if user_input.lower() in {"exit", "quit"}:
-            print("\nShutting down system. Goodbye.")
+            print(f"\n{format_route_stats()}")
+            _print_llm_cache_stats()
+            _print_client_stats()
+            _print_profile(profile)
+            print("Shutting down system. Goodbye.")
             break
 
         if not user_input:
             continue
 
-        # ---- Step 1: Orchestration plan ----
-        orchestration_response = orchestrator.invoke({
-            "messages": [HumanMessage(content=user_input)]
-        })
-
-        plan_raw = extract_final_answer(orchestration_response)
-
-        try:
-            plan = json.loads(plan_raw)
-        except json.JSONDecodeError:
-            print("ERROR: Orchestrator produced invalid JSON")
-            # print(plan_raw) # Optional debug
-            continue
-
-        # ---- Step 2: Stock analysis (if required) ----
-        analysis_json = None
-        if plan["run_stock_analysis"]:
-            print("\n[System] Running stock analysis agent...")
-            analysis_response = stock_agent.invoke({
-                "messages": [HumanMessage(content=plan["clean_query"])]
-            })
-            analysis_json = extract_final_answer(analysis_response)
-            
-            # Optional: Print preview of analysis
-            # print("\n[System] Analysis completed.")
-
-        # ---- Step 3: Report generation (if required) ----
-        if plan["run_report_generation"]:
-            if analysis_json:
-                # Call the tool DIRECTLY instead of through the agent
-                # This avoids JSON escaping issues with the LLM
-                from tradagent.tools.report_writer_tools import generate_report_from_analysis
-                
-                print("\n[System] Generating PDF report...")
-                result = generate_report_from_analysis.invoke({
-                    "analysis_json": analysis_json
-                })
-                
-                if result.get("success"):
-                    print(f"[Success] Report generated successfully.")
-                    print(f"Path: {result['pdf_path']}")
-                    print(f"Size: {result['size_kb']} KB")
-                else:
-                    print(f"[Error] Report generation failed.")
-                    print(f"Details: {result.get('error')}")
-            else:
-                print("\n[Warning] No analysis available to generate report.")
+        with span("request", query=user_input) as request:
+            handle_query(user_input, agents)
+        if profile:
+            print(f"\n[Profile]\n{format_trace(request.trace_id)}")
 
         print("\n" + "-" * 60 + "\n")
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.llm_cache:
+        from tradagent.utils.llm_cache import enable_llm_cache
+        enable_llm_cache()
+    if args.profile:
+        TRACER.enable(args.trace_dir)
+    if args.serve:
+        main_serve(args)
+    elif args.monitor:
+        if not args.tickers:
+            raise SystemExit("--monitor needs a watchlist: --tickers AAPL,MSFT,...")
+        main_monitor(args)
+    elif args.tickers:
+        main_batch(args)
+    else:
+        main(mode=args.mode, profile=args.profile)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pydantic import SecretStr
+
+from tradagent import config
+from tradagent.agents.news_analyst_agent import FinnhubClient
+from tradagent.utils import clients
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers JSON echoing the request; the first POST gets a 429."""
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, dict(self.headers)))
+        self._reply(200, {"path": self.path})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append(("POST", self.path, dict(self.headers)))
+        posts = sum(1 for method, *_ in self.server.requests if method == "POST")
+        self._reply(429 if posts == 1 else 200, {"ok": True})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_finnhub_client_uses_the_shared_session(stub):
+    before = clients.STATS["finnhub"]["requests"]
+    client = FinnhubClient("secret", base_url=f"http://127.0.0.1:{stub.server_port}/api/v1")
+
+    assert client.quote("AAPL") == {"path": "/api/v1/quote?symbol=AAPL"}
+    client.company_news("AAPL", _from="2024-01-01", to="2024-01-31")
+
+    _, path, headers = stub.requests[-1]
+    assert path == "/api/v1/company-news?symbol=AAPL&from=2024-01-01&to=2024-01-31"
+    assert headers["X-Finnhub-Token"] == "secret"
+    assert clients.STATS["finnhub"]["requests"] - before == 2
+
+
+def test_async_mistral_client_is_rate_limited_and_retried(stub, monkeypatch):
+    monkeypatch.setattr(config, "MISTRAL_API_KEY", SecretStr("key"))
+    monkeypatch.setenv("MISTRAL_BASE_URL", f"http://127.0.0.1:{stub.server_port}/v1")
+    monkeypatch.setattr(clients, "_clients", {})
+    before = dict(clients.STATS["mistral"])
+
+    async def post_twice():
+        client = clients.get_mistral_async_client()
+        assert clients.get_mistral_async_client() is client
+        return [(await client.post("/chat/completions", json={})).status_code for _ in range(2)]
+
+    assert asyncio.run(post_twice()) == [200, 200]
+    assert [path for _, path, _ in stub.requests] == ["/v1/chat/completions"] * 3
+    assert stub.requests[0][2]["Authorization"] == "Bearer key"
+    assert clients.STATS["mistral"]["requests"] - before.get("requests", 0) == 3
+    assert clients.STATS["mistral"]["retries"] - before.get("retries", 0) == 1
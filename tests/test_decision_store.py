@@ -0,0 +1,100 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from tradagent.utils import decision_store
+
+# The decisions table as shipped in tradagent.db, before the extracted columns
+BASELINE_SCHEMA = """
+CREATE TABLE decisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts_utc TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    decision_json TEXT NOT NULL
+)
+"""
+HOLD = {"action": "HOLD", "target_weight": 0.1, "confidence": 0.7, "rationale": "Stable.", "risk_notes": "None."}
+
+
+def _analysis(ticker: str, rsi: float, close: float = 100.0) -> dict:
+    return {
+        "ticker": ticker,
+        "price": {"close": close},
+        "momentum": {"rsi_14d": rsi, "macd": {"macd": 1.5, "signal": 1.0, "histogram": 0.5}},
+        "volatility": {"vol_30d": 0.2, "vol_90d": 0.25, "vol_1y": 0.3},
+        "valuation": {"pe_trailing": 30.0},
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "decisions.db"
+
+
+def test_migration_backfills_the_baseline_table(db):
+    conn = sqlite3.connect(db)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO decisions (ts_utc, ticker, decision_json) VALUES (?, ?, ?)",
+        [
+            ("2026-01-05T21:30:38.342318+00:00", "AAPL", json.dumps(HOLD)),
+            ("2026-01-05T21:33:37.016545+00:00", "AAPL", json.dumps(_analysis("AAPL", 72.0, close=190.0))),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    rows = decision_store.last_decisions("aapl", records=True, db_path=db)
+
+    assert [row["id"] for row in rows] == [2, 1]
+    assert rows[0]["rsi_14d"] == 72.0 and rows[0]["close"] == 190.0 and rows[0]["macd_histogram"] == 0.5
+    assert rows[0]["analysis"].ticker == "AAPL"
+    assert rows[1]["rsi_14d"] is None and rows[1]["analysis"] is None  # the HOLD decision is kept, not parsed
+    indexes = {row[1] for row in sqlite3.connect(db).execute("PRAGMA index_list(decisions)")}
+    assert {"idx_decisions_ticker_ts", "idx_decisions_ts_rsi"} <= indexes
+
+
+def test_writer_batches_and_skips_non_analyses(db):
+    with decision_store.DecisionWriter(batch_size=2, db_path=db) as writer:
+        writer.add(_analysis("AAPL", 50.0))
+        writer.add({"momentum": {"rsi_14d": 10.0}})  # no ticker
+        assert writer.written == 0
+        writer.add(_analysis("MSFT", 60.0))
+        assert writer.written == 2  # a full batch is written at once
+        writer.add(_analysis("NVDA", 70.0))
+        assert writer.written == 2
+    assert writer.written == 3  # close() flushes the rest
+    assert [row["ticker"] for row in decision_store.last_decisions("NVDA", db_path=db)] == ["NVDA"]
+
+
+def test_same_second_analyses_keep_their_order(db):
+    decision_store.record_decisions([_analysis("AAPL", rsi) for rsi in (40.0, 50.0, 60.0)], db_path=db)
+    decision_store.record_decisions([_analysis("AAPL", 65.0)], ts_utc="2026-01-05T10:00:00.000000+00:00", db_path=db)
+    decision_store.record_decisions([_analysis("AAPL", 66.0)], ts_utc="2026-01-05T10:00:00.000000+00:00", db_path=db)
+
+    latest = decision_store.last_decisions("AAPL", n=3, db_path=db)
+    assert [row["rsi_14d"] for row in latest] == [60.0, 50.0, 40.0]
+    assert all(len(row["ts_utc"]) == len("2026-01-05T10:00:00.000000+00:00") for row in latest)
+    history = decision_store.decision_history("AAPL", since="2026-01-05", until="2026-01-06", db_path=db)
+    assert [row["rsi_14d"] for row in history] == [65.0, 66.0]
+
+
+def test_screen_uses_each_tickers_latest_analysis(db):
+    ts = "2026-01-05T10:00:00.000000+00:00"
+    decision_store.record_decisions([_analysis("AAPL", 75.0), _analysis("MSFT", 80.0)], ts_utc=ts, db_path=db)
+    decision_store.record_decisions([_analysis("AAPL", 55.0), _analysis("NVDA", 71.0)], ts_utc=ts, db_path=db)
+    decision_store.record_decisions([_analysis("JPM", 90.0)], ts_utc="2026-01-04T10:00:00.000000+00:00", db_path=db)
+
+    rows = decision_store.screen_decisions("rsi_14d", ">", 70, day="2026-01-05", db_path=db)
+    assert [(row["ticker"], row["rsi_14d"]) for row in rows] == [("MSFT", 80.0), ("NVDA", 71.0)]
+
+    today = decision_store.screen_decisions("rsi_14d", ">", 0, db_path=db)
+    assert today == []
+    decision_store.record_decisions([_analysis("XOM", 30.0)], db_path=db)
+    assert [row["ticker"] for row in decision_store.screen_decisions("rsi_14d", "<", 35, db_path=db)] == ["XOM"]
+    assert datetime.fromisoformat(decision_store.last_decisions("XOM", db_path=db)[0]["ts_utc"]).tzinfo == timezone.utc
+
+    with pytest.raises(ValueError):
+        decision_store.screen_decisions("decision_json", ">", 0, db_path=db)
@@ -0,0 +1,67 @@
+import asyncio
+import math
+
+import pandas as pd
+import pytest
+
+from tradagent import pipeline
+from tradagent.benchmarks.fixtures import DEFAULT_TICKERS, synthetic_history
+from tradagent.tools import stock_analyst_tools
+from tradagent.utils import indicator_panel
+from tradagent.utils.stock_utils import MarketData, compute_macd, compute_rsi, compute_volatility
+
+
+def _closes() -> pd.DataFrame:
+    closes = pd.DataFrame({t: synthetic_history(t)["Close"] for t in DEFAULT_TICKERS})
+    closes.loc[closes.index[:60], "XOM"] = float("nan")  # a shorter history
+    return closes
+
+
+@pytest.mark.parametrize("ticker", DEFAULT_TICKERS)
+def test_panel_matches_per_ticker_functions(ticker):
+    closes = _closes()
+    row = indicator_panel.compute_indicator_panel(closes).loc[ticker]
+    data = MarketData(ticker, history=synthetic_history(ticker).loc[closes[ticker].notna()])
+
+    expected = {
+        "close": float(data.history["Close"].iloc[-1]),
+        "rsi_14d": compute_rsi(ticker, data=data),
+        **compute_macd(ticker, data=data),
+        **compute_volatility(ticker, data=data),
+    }
+    for name, value in expected.items():
+        assert math.isclose(row[name], value, rel_tol=1e-9, abs_tol=1e-12), name
+
+
+def test_batch_passes_panel_rows_to_each_analysis(monkeypatch):
+    panel = indicator_panel.compute_indicator_panel(_closes())
+    received = {}
+
+    def analysis(ticker, *args):
+        received[ticker] = args[-1]
+        return {"ticker": ticker, "status": "ok"}
+
+    monkeypatch.setattr(indicator_panel, "screen_tickers", lambda tickers: panel.loc[tickers])
+    monkeypatch.setattr(pipeline, "analyze_ticker", analysis)
+
+    asyncio.run(pipeline.run_batch(["aapl", "MSFT"], record=False))
+
+    assert set(received) == {"AAPL", "MSFT"}
+    for ticker, row in received.items():
+        assert row.equals(panel.loc[ticker])
+
+
+def test_stock_report_tool_reads_panel_rows(monkeypatch):
+    panel = indicator_panel.compute_indicator_panel(_closes())
+    calls = []
+    monkeypatch.setattr(
+        stock_analyst_tools, "build_stock_report", lambda ticker, indicators=None: calls.append(indicators) or {},
+    )
+
+    with stock_analyst_tools.indicator_rows({"AAPL": panel.loc["AAPL"]}):
+        stock_analyst_tools.get_stock_report.invoke({"ticker": "aapl"})
+        stock_analyst_tools.get_stock_report.invoke({"ticker": "MSFT"})
+    stock_analyst_tools.get_stock_report.invoke({"ticker": "AAPL"})
+
+    assert calls[0].equals(panel.loc["AAPL"])
+    assert calls[1:] == [None, None]
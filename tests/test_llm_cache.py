@@ -0,0 +1,72 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from tradagent.utils import llm_cache
+from tradagent.utils.llm_cache import SQLiteLLMCache
+
+LLM = "mistral-medium temperature=0.0"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+def _answer(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = SQLiteLLMCache(db_path=tmp_path / "llm.db", ttl=60)
+    cache.update("prompt", LLM, _answer("cached"))
+
+    clock[0] += 59
+    assert cache.lookup("prompt", LLM)[0].message.content == "cached"
+    clock[0] += 2  # reads do not extend the lifetime
+    assert cache.lookup("prompt", LLM) is None
+    assert cache.stats["expired"] == 1 and cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+    assert cache.lookup("prompt", "mistral-small temperature=0.0") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = SQLiteLLMCache(db_path=tmp_path / "llm.db", max_entries=2)
+    for prompt in ("a", "b"):
+        clock[0] += 1
+        cache.update(prompt, LLM, _answer(prompt))
+    clock[0] += 1
+    cache.lookup("a", LLM)  # "b" is now the least recently used
+    clock[0] += 1
+    cache.update("c", LLM, _answer("c"))
+
+    assert cache.lookup("b", LLM) is None
+    assert [cache.lookup(p, LLM)[0].message.content for p in ("a", "c")] == ["a", "c"]
+    assert cache.stats["evictions"] == 1
+
+
+def test_tool_call_generations_round_trip(tmp_path):
+    message = AIMessage(
+        content="",
+        tool_calls=[{"name": "get_stock_report", "args": {"ticker": "AAPL"}, "id": "abc123XYZ"}],
+        usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+    )
+    SQLiteLLMCache(db_path=tmp_path / "llm.db").update("prompt", LLM, [ChatGeneration(message=message)])
+
+    # Another instance on the same store (e.g. another worker) sees the entry
+    cached = SQLiteLLMCache(db_path=tmp_path / "llm.db").lookup("prompt", LLM)[0].message
+    assert isinstance(cached, AIMessage)
+    assert cached.tool_calls == message.tool_calls
+    assert cached.usage_metadata == message.usage_metadata
+
+
+def test_chat_model_calls_are_served_from_the_cache(tmp_path):
+    cache = SQLiteLLMCache(db_path=tmp_path / "llm.db")
+    model = FakeMessagesListChatModel(responses=[AIMessage(content="first"), AIMessage(content="second")], cache=cache)
+
+    answers = [model.invoke([HumanMessage(content="Analyze AAPL")]).content for _ in range(2)]
+    assert answers == ["first", "first"]
+    assert model.invoke([HumanMessage(content="Analyze MSFT")]).content == "second"
+    assert cache.stats["hits"] == 1 and cache.stats["writes"] == 2
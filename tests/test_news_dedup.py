@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from tradagent.utils.news_dedup import NearDuplicateIndex, deduplicate, deduplicate_paths
+
+FEEDS = Path(__file__).resolve().parents[1] / "tradagent" / "test" / "data" / "news" / "macro"
+SHARED_URL = "https://www.stocktitan.net/news/NCPL/netcapital-to-tokenize-hydrogen-drilling-qht7gkcsbot0.html"
+
+SUMMARY = (
+    "The regional utility said on Tuesday it will build three offshore wind farms with a combined "
+    "capacity of two gigawatts, financed by a new green bond programme."
+)
+
+
+def test_same_story_across_feeds_is_one_cluster():
+    files = [FEEDS / "news_blockchain.json", FEEDS / "news_energy_transportation.json"]
+    unique = deduplicate_paths(files)
+
+    assert sum(item["cluster_size"] for item in unique) == 2000
+    shared = [item for item in unique if SHARED_URL in item["cluster_urls"]]
+    assert len(shared) == 1 and shared[0]["cluster_size"] >= 2
+    assert len(unique) == len(deduplicate_paths(files[::-1]))
+
+
+def test_near_duplicates_with_other_urls_are_clustered():
+    items = [
+        {"url": "https://a.example/wind", "title": "Utility plans offshore wind farms", "summary": SUMMARY},
+        {"url": "https://b.example/wind?utm_source=x", "title": "Utility plans offshore wind farms",
+         "summary": SUMMARY + " Shares rose 2%."},
+        {"url": "https://c.example/other", "title": "Chipmaker misses revenue forecast",
+         "summary": "Quarterly revenue fell short of estimates as demand for memory chips slowed."},
+    ]
+    unique = deduplicate(items)
+    assert [item["cluster_size"] for item in unique] == [2, 1]
+
+
+def test_items_without_text_are_not_clustered_together():
+    index = NearDuplicateIndex()
+    first = index.add({"url": "https://a.example/1", "title": "", "summary": ""})
+    second = index.add({"url": "https://b.example/2", "title": None, "summary": None})
+    again = index.add({"url": "https://a.example/1/", "title": "", "summary": ""})
+    story = index.add({"url": "https://c.example/3", "title": "Utility plans offshore wind farms", "summary": SUMMARY})
+
+    assert first != second
+    assert again == first
+    assert story not in (first, second)
+    assert [len(members) for members in index.clusters] == [2, 1, 1]
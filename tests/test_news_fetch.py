@@ -0,0 +1,92 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tradagent.utils import news_fetch
+
+SUMMARY = "Shares of the exchange rallied after quarterly trading volume beat every analyst estimate by a wide margin."
+
+
+def _items():
+    return [
+        {"url": "https://a.example/story", "title": "Exchange volume beats estimates", "summary": SUMMARY},
+        {"url": "https://A.example/story/", "title": "Exchange volume beats estimates", "summary": SUMMARY},
+        {"url": "https://b.example/copy", "title": "Exchange volume beats estimates", "summary": SUMMARY + " More."},
+    ]
+
+
+def test_enrich_shares_fetches_only_for_the_same_url(monkeypatch):
+    requested = []
+
+    def fetch(urls, **kwargs):
+        requested.extend(urls)
+        return {u: {"url": u, "status": 200, "text": f"body of {u}"} for u in urls}
+
+    monkeypatch.setattr(news_fetch, "fetch_articles", fetch)
+
+    items = news_fetch.enrich_feed_items(_items())
+    assert requested == ["https://a.example/story", "https://b.example/copy"]
+    assert [i["body"] for i in items] == [
+        "body of https://a.example/story", "body of https://a.example/story", "body of https://b.example/copy",
+    ]
+
+    requested.clear()
+    items = news_fetch.enrich_feed_items(_items(), dedupe=True)
+    assert requested == ["https://a.example/story"]
+    assert items[2]["body_url"] == "https://a.example/story"
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+    def do_GET(self):
+        self.server.hits.append((self.headers["Host"], time.monotonic(), self.client_address))
+        body = b"<html><title>Story</title><p>Article body.</p></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def article_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ArticleHandler)
+    server.hits = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_articles_rate_per_host_and_pool_reuse(article_server, tmp_path):
+    port = article_server.server_port
+    # Two hostnames for the same stub server: each gets its own bucket
+    slow = [f"http://127.0.0.1:{port}/a/{i}" for i in range(5)]
+    other = [f"http://localhost:{port}/b/{i}" for i in range(5)]
+    rate = 5.0
+
+    results = news_fetch.fetch_articles(slow + other, max_workers=2, rate_per_host=rate, db_path=tmp_path / "n.db")
+
+    assert all(results[u]["status"] == 200 and results[u]["text"] == "Article body." for u in slow + other)
+    hits = article_server.hits
+    assert len(hits) == 10
+    for host in (f"127.0.0.1:{port}", f"localhost:{port}"):
+        times = [t for h, t, _ in hits if h == host]
+        assert len(times) == 5
+        assert min(b - a for a, b in zip(times, times[1:])) >= 1 / rate - 0.02
+    # The second host does not queue behind the first host's bucket
+    first_other = next(t for h, t, _ in hits if h.startswith("localhost"))
+    second_slow = [t for h, t, _ in hits if h.startswith("127.0.0.1")][1]
+    assert first_other < second_slow
+    # Keep-alive: at most one connection per worker and host
+    assert len({client for *_, client in hits}) <= 4
+
+    # Cached bodies are not fetched again
+    news_fetch.fetch_articles(slow + other, db_path=tmp_path / "n.db")
+    assert len(article_server.hits) == 10
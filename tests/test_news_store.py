@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tradagent.utils import news_store
+
+NEWS = Path(__file__).resolve().parents[1] / "tradagent" / "test" / "data" / "news"
+FEEDS = [NEWS / "macro" / "news_blockchain.json", NEWS / "macro" / "news_energy_transportation.json"]
+
+
+def _urls(feed) -> set:
+    return {item["url"] for item in json.loads(feed.read_text(encoding="utf-8"))["feed"]}
+
+
+@pytest.mark.parametrize("chunk_size", [97, 4096, news_store._CHUNK_SIZE])
+def test_streaming_parser_matches_json_load(chunk_size):
+    # Small chunks split the "feed" key and most items across reads
+    expected = json.loads(FEEDS[0].read_text(encoding="utf-8"))["feed"]
+    assert list(news_store.iter_feed_items(FEEDS[0], chunk_size=chunk_size)) == expected
+
+
+def test_feed_header_is_read_without_the_items():
+    header = news_store.read_feed_header(FEEDS[0])
+    assert header["items"] == str(len(json.loads(FEEDS[0].read_text(encoding="utf-8"))["feed"]))
+    assert "sentiment_score_definition" in header
+
+
+def test_ingest_is_idempotent(tmp_path):
+    db = tmp_path / "news.db"
+    first, second = _urls(FEEDS[0]), _urls(FEEDS[1])
+    assert first & second  # the feeds share a few stories
+
+    assert news_store.ingest_feed(FEEDS[0], db_path=db) == len(first)
+    assert news_store.ingest_feed(FEEDS[0], db_path=db) == 0
+    assert news_store.ingest_path(NEWS / "macro", db_path=db) == {
+        str(FEEDS[0]): 0,
+        str(FEEDS[1]): len(second - first),
+    }
+
+    conn = news_store.connect(db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM news_articles").fetchone()[0] == len(first | second)
+    finally:
+        conn.close()
+
+
+def test_queries_read_time_ranges_newest_first(tmp_path):
+    db = tmp_path / "news.db"
+    news_store.ingest_feed(FEEDS[0], db_path=db)
+    items = list(news_store.iter_feed_items(FEEDS[0]))
+    ticker = items[0]["ticker_sentiment"][0]["ticker"]
+    topic = items[0]["topics"][0]["topic"]
+    published = sorted(i["time_published"] for i in items if any(t["ticker"] == ticker for t in i["ticker_sentiment"]))
+
+    rows = news_store.query_ticker_news(ticker.lower(), db_path=db)
+    assert len(rows) == len(published)
+    assert [r["time_published"] for r in rows] == sorted((r["time_published"] for r in rows), reverse=True)
+
+    since = news_store.parse_time(published[len(published) // 2])
+    recent = news_store.query_ticker_news(ticker, since=since, db_path=db)
+    assert all(r["time_published"] >= published[len(published) // 2] for r in recent)
+    assert len(news_store.query_ticker_news(ticker, limit=1, db_path=db)) == 1
+
+    topics = news_store.query_topic_news(topic, db_path=db)
+    assert topics and {r["topic"] for r in topics} == {topic}
@@ -0,0 +1,95 @@
+import json
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+from tradagent.utils import news_summary
+from tradagent.utils.news_store import format_time, ingest_feed
+
+WORDS = (
+    "bank oil chip cloud retail freight copper lithium bond yield merger dividend guidance tariff crypto "
+    "vaccine drone satellite battery solar wheat coffee airline hotel casino railway shipping steel "
+    "insurance lending mortgage payroll inflation export import lawsuit recall buyback forecast"
+).split()
+
+
+def _text(seed: int, words: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _article(n: int, tickers: dict) -> dict:
+    return {
+        "url": f"https://news.example/{n}",
+        "title": _text(n, 8),
+        "summary": _text(1000 + n, 40),
+        "source": "Example",
+        "time_published": format_time(datetime.now(timezone.utc) - timedelta(hours=1)),
+        "ticker_sentiment": [
+            {"ticker": t, "relevance_score": str(rel), "ticker_sentiment_score": "0.1"} for t, rel in tickers.items()
+        ],
+    }
+
+
+class StubNewsLLM:
+    """Answers NEWS_PROMPT with one takeaway per numbered article and records what it was sent."""
+
+    def __init__(self):
+        self.requests = []
+
+    def invoke(self, messages):
+        numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", messages[-1].content, re.M)]
+        self.requests.append(messages[-1].content)
+        articles = [{"id": n, "takeaway": f"Takeaway {n}", "impact": "bullish"} for n in numbers]
+
+        class Response:
+            content = json.dumps({"articles": articles})
+            usage_metadata = None
+
+        return Response()
+
+
+def test_pack_batches_stays_under_the_token_budget():
+    articles = [{"title": _text(n, 5), "summary": _text(n, 20 + 30 * (n % 4))} for n in range(40)]
+    batches = news_summary.pack_batches(articles, batch_tokens=200, article_tokens=60)
+
+    assert [a["title"] for batch in batches for a in batch] == [a["title"] for a in articles]  # order kept
+    assert all(news_summary.estimate_tokens(a["text"]) <= 60 + 1 for batch in batches for a in batch)
+    assert all(sum(news_summary.estimate_tokens(a["text"]) + 4 for a in batch) <= 200 for batch in batches)
+    assert len(batches) > 1
+
+
+def test_budget_is_shared_round_robin_and_summaries_are_cached(tmp_path):
+    feed = {"feed": [
+        _article(1, {"AAA": 0.9}), _article(2, {"AAA": 0.8}), _article(3, {"AAA": 0.7}),
+        _article(4, {"BBB": 0.9}), _article(5, {"BBB": 0.8}),
+        _article(6, {"AAA": 0.1, "BBB": 0.6}),  # tagged with both tickers
+    ]}
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(feed))
+    db = tmp_path / "news.db"
+    ingest_feed(path, db_path=db)
+
+    # One article per batch; the budget covers three requests
+    batch_tokens = 120
+    one = news_summary.batch_cost(news_summary.pack_batches([feed["feed"][0]], batch_tokens)[0])
+    llm = StubNewsLLM()
+    result = news_summary.summarize_news(
+        ["AAA", "BBB"], llm, min_relevance=0.0, max_tokens=3 * one + one // 2, batch_tokens=batch_tokens,
+        concurrency=1, db_path=db,
+    )
+
+    sent = [a["title"] for request in llm.requests for a in feed["feed"] if a["title"] in request]
+    titles = [a["title"] for a in feed["feed"]]
+    assert sent == [titles[0], titles[3], titles[1]]  # best of AAA, best of BBB, then AAA again
+    assert result["usage"]["requests"] == 3
+    assert result["tickers"]["AAA"]["skipped"] == result["tickers"]["BBB"]["skipped"] == 2
+
+    # The next run pays only for what is not cached yet, and the shared article once
+    llm = StubNewsLLM()
+    result = news_summary.summarize_news(["AAA", "BBB"], llm, min_relevance=0.0, batch_tokens=batch_tokens, db_path=db)
+    assert result["usage"]["cached"] == 3
+    assert sorted(len(r.split("\n")) - 1 for r in llm.requests) == [1, 1, 1]
+    assert sum(titles[5] in request for request in llm.requests) == 1
+    assert result["tickers"]["AAA"]["skipped"] == result["tickers"]["BBB"]["skipped"] == 0
+    assert result["tickers"]["BBB"]["impact"]["bullish"] == 3
@@ -0,0 +1,42 @@
+import math
+
+import pytest
+
+from tradagent.benchmarks.fixtures import DEFAULT_TICKERS, synthetic_history
+from tradagent.utils import online_indicators, stock_utils
+from tradagent.utils.online_indicators import TickerIndicators
+from tradagent.utils.stock_utils import MarketData
+
+
+@pytest.mark.parametrize("ticker", DEFAULT_TICKERS)
+def test_online_matches_batch(ticker):
+    data = MarketData(ticker, history=synthetic_history(ticker))
+    assert online_indicators.compare_with_batch(ticker, data=data) == {}
+
+
+def test_compare_with_batch_reports_mismatches(monkeypatch):
+    data = MarketData("AAPL", history=synthetic_history("AAPL"))
+    rsi = stock_utils.compute_rsi("AAPL", data=data)
+    monkeypatch.setattr(stock_utils, "compute_rsi", lambda ticker, data=None: rsi + 1.0)
+
+    mismatches = online_indicators.compare_with_batch("AAPL", data=data)
+    assert list(mismatches) == ["rsi_14d"]
+    online, batch = mismatches["rsi_14d"]
+    assert batch == rsi + 1.0 and math.isclose(online, rsi, rel_tol=1e-3)
+
+
+def test_incremental_updates_match_a_full_seed():
+    closes = synthetic_history("MSFT")["Close"]
+    state = TickerIndicators.from_closes("MSFT", closes[:120])
+    for end in range(121, len(closes) + 1, 7):
+        # Persisted and reloaded between refreshes, as the monitor does
+        state = TickerIndicators.from_dict(state.to_dict())
+        state = online_indicators.advance("MSFT", state, closes[:end])
+    state = online_indicators.advance("MSFT", state, closes)
+
+    expected = TickerIndicators.from_closes("MSFT", closes).snapshot()
+    snapshot = state.snapshot()
+    assert snapshot["date"] == expected["date"]
+    for name, value in expected.items():
+        if isinstance(value, float):
+            assert math.isclose(snapshot[name], value, rel_tol=1e-9, abs_tol=1e-12), name
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tradagent import pipeline
+from tradagent.utils import indicator_panel
+
+
+def test_timed_out_tickers_release_their_slot(monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def analysis(ticker, *args):
+        started.append(ticker)
+        if ticker == "HUNG":
+            release.wait(5)  # a call that never comes back on its own
+        return {"ticker": ticker, "status": "ok"}
+
+    monkeypatch.setattr(pipeline, "analyze_ticker", analysis)
+    monkeypatch.setattr(indicator_panel, "screen_tickers", lambda tickers: None)
+
+    start = time.perf_counter()
+    results = asyncio.run(pipeline.run_batch(["HUNG", "AAA", "BBB"], concurrency=1, timeout=0.2, record=False))
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert [r["status"] for r in results] == ["timeout", "ok", "ok"]
+    assert started == ["HUNG", "AAA", "BBB"]
+    assert results[0]["seconds"] < 1.0
+    assert elapsed < 1.0  # neither the batch nor the loop's shutdown waits for the hung thread
+
+
+def test_run_in_thread_returns_results_and_errors():
+    async def main():
+        assert await pipeline.run_in_thread(1.0, lambda x: x * 2, 21) == 42
+        with pytest.raises(ValueError):
+            await pipeline.run_in_thread(1.0, int, "not a number")
+
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tradagent.utils import price_cache
+
+
+def _bars(days: int = 30) -> pd.DataFrame:
+    index = pd.DatetimeIndex(pd.date_range(end=date.today() - timedelta(days=1), periods=days, freq="D"), name="Date")
+    close = pd.Series(range(100, 100 + days), index=index, dtype=float)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000}, index=index)
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Fake Yahoo: returns the frames in `data` (tickers missing from it get no data) and logs requests."""
+    state = {"data": {}, "calls": []}
+
+    def fetch(tickers, start):
+        state["calls"].append(list(tickers))
+        return {t: state["data"][t] for t in tickers if t in state["data"]}
+
+    monkeypatch.setattr(price_cache, "_fetch", fetch)
+    return state
+
+
+def test_refresh_without_data_for_a_ticker(fetched, tmp_path):
+    db = tmp_path / "cache.db"
+    fetched["data"] = {"AAPL": _bars(), "MSFT": _bars()}
+    panel = price_cache.get_close_panel(["AAPL", "MSFT"], days=60, db_path=db)
+    assert panel["MSFT"].notna().sum() == 30
+
+    # MSFT is missing from the incremental refetch and the full refetch of a cold ticker
+    fetched["data"] = {"AAPL": _bars()}
+    panel = price_cache.get_close_panel(["AAPL", "MSFT", "GONE"], days=60, force=True, db_path=db)
+
+    assert fetched["calls"][-1] == ["AAPL", "MSFT"]
+    assert panel["AAPL"].notna().sum() == 30
+    assert panel["MSFT"].notna().sum() == 30  # cached bars are kept
+    assert panel["GONE"].isna().all()
+
+    # A longer window makes MSFT cold again: an empty full refetch must not wipe its cache
+    panel = price_cache.get_close_panel(["MSFT"], days=90, db_path=db)
+    assert panel["MSFT"].notna().sum() == 30
+
+
+def test_single_ticker_without_data(fetched, tmp_path):
+    hist = price_cache.get_history("GONE", days=60, db_path=tmp_path / "cache.db")
+    assert hist.empty
+    assert list(hist.columns) == price_cache.COLUMNS
+
+
+def test_ticker_without_data_is_not_refetched_within_the_ttl(fetched, tmp_path):
+    db = tmp_path / "cache.db"
+    for _ in range(3):
+        panel = price_cache.get_close_panel(["GONE"], days=60, db_path=db)
+        assert panel["GONE"].isna().all()
+    assert fetched["calls"] == [["GONE"]]
+
+    # The negative entry expires with the TTL, and the ticker is fetched cold again
+    fetched["data"] = {"GONE": _bars()}
+    panel = price_cache.get_close_panel(["GONE"], days=60, ttl=timedelta(0), db_path=db)
+    assert fetched["calls"] == [["GONE"], ["GONE"]]
+    assert panel["GONE"].notna().sum() == 30
+
+
+def test_default_store_is_next_to_main(tmp_path):
+    root = Path(__file__).resolve().parents[1]
+    env = {k: v for k, v in os.environ.items() if k != "TRADAGENT_DB"}
+    env["PYTHONPATH"] = str(root)
+    out = subprocess.run(
+        [sys.executable, "-c", "from tradagent.utils.db_utils import DB_PATH; print(DB_PATH)"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    assert Path(out) == root / "tradagent.db"
@@ -0,0 +1,22 @@
+import os
+import threading
+
+from tradagent.tools import report_writer_tools
+
+
+def test_build_reports_compiles_on_threads_in_order(monkeypatch, tmp_path):
+    calls = []
+
+    def compile_latex(document, filename, output_path):
+        calls.append((os.getpid(), threading.get_ident()))
+        return {"success": True, "pdf_path": str(output_path / f"{filename}.pdf")}
+
+    monkeypatch.setattr(report_writer_tools, "compile_latex", compile_latex)
+    monkeypatch.setattr(report_writer_tools, "get_preamble_format", lambda: None)
+    analyses = [{"ticker": t, "price": {"close": 100.0}} for t in ("AAPL", "MSFT", "NVDA")]
+
+    results = report_writer_tools.build_reports(analyses, output_dir=str(tmp_path), max_workers=3)
+
+    assert [r["pdf_path"] for r in results] == [str(tmp_path / f"{t}_report.pdf") for t in ("AAPL", "MSFT", "NVDA")]
+    assert {pid for pid, _ in calls} == {os.getpid()}  # no worker processes are forked
+    assert all(ident != threading.get_ident() for _, ident in calls)
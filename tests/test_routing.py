@@ -0,0 +1,42 @@
+import pytest
+
+from tradagent.utils import routing
+
+ANALYZE = {"run_stock_analysis": True, "run_report_generation": False}
+REPORT = {"run_stock_analysis": True, "run_report_generation": True}
+
+
+@pytest.mark.parametrize("query, plan, ticker", [
+    ("Analyze AAPL", ANALYZE, "AAPL"),
+    ("AAPL", ANALYZE, "AAPL"),
+    ("Analyze $AAPL please.", ANALYZE, "AAPL"),
+    ("Check BTC-USD", ANALYZE, "BTC-USD"),
+    ("Analyze AAPL and generate a report", REPORT, "AAPL"),
+    ("Give me a PDF report for BRK.B.", REPORT, "BRK.B"),
+    ("Analyze MSFT and give me a report on it", REPORT, "MSFT"),
+    ("Analyze $IT", ANALYZE, "IT"),  # an explicit symbol
+    # Left to the orchestrator LLM
+    ("Analyze IT", None, None),  # a keyword or Gartner?
+    ("Analyze IT and AAPL", None, None),
+    ("Look AT NVDA", None, None),
+    ("Who is the CEO of AAPL?", None, None),  # CEO looks like a second ticker
+    ("Analyze AAPL, MSFT", None, None),
+    ("Compare AAPL with its peers", None, None),
+    ("What's the news on TSLA", None, None),
+    ("Analyze the stock market", None, None),
+    ("analyze aapl", None, None),
+])
+def test_route_query(query, plan, ticker):
+    route = routing.route_query(query)
+    if plan is None:
+        assert route is None
+    else:
+        assert route == {**plan, "clean_query": f"Analyze {ticker}"}
+
+
+def test_only_rule_routes_are_counted(monkeypatch):
+    monkeypatch.setattr(routing, "ROUTE_STATS", routing.Counter())
+    routing.route_query("Analyze AAPL")
+    routing.route_query("Analyze AAPL, MSFT")
+    assert routing.ROUTE_STATS == {"rules": 1}
+    assert routing.format_route_stats() == "Routing: rules=1 (100%)"
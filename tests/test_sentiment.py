@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from tradagent.utils import sentiment
+from tradagent.utils.news_store import format_time, ingest_feed
+
+STORY = (
+    "The regional utility said on Tuesday it will build three offshore wind farms with a combined "
+    "capacity of two gigawatts, financed by a new green bond programme."
+)
+
+
+def test_score_buckets_follow_the_feed_definition():
+    scores = np.array([-0.9, -0.35, -0.3499, -0.15, -0.1499, 0.0, 0.1499, 0.15, 0.3499, 0.35, 0.9])
+    expected = ["bearish", "bearish", "somewhat_bearish", "somewhat_bearish", "neutral", "neutral", "neutral",
+                "somewhat_bullish", "somewhat_bullish", "bullish", "bullish"]
+    assert [sentiment.BUCKETS[i] for i in sentiment.sentiment_buckets(scores)] == expected
+
+
+def _frame(rows: list) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=["ticker", "published", "relevance", "score"])
+    frame["published"] = pd.to_datetime(frame["published"], utc=True)
+    return frame
+
+
+def test_rolling_sentiment_decays_per_ticker():
+    frame = _frame([
+        ("AAA", "2026-01-01 09:00", 1.0, 0.5),
+        ("AAA", "2026-01-01 15:00", 0.5, -0.2),
+        ("AAA", "2026-01-03 10:00", 0.8, -0.4),
+        ("BBB", "2026-01-02 12:00", 0.6, 0.9),
+    ])
+    panel = sentiment.rolling_decayed_sentiment(frame, freq="1D", half_life=timedelta(days=1))
+
+    assert list(panel.index.strftime("%Y-%m-%d")) == ["2026-01-01", "2026-01-02", "2026-01-03"]
+    # Relevance-weighted mean of the daily sums, each day weighted 0.5^(days ago)
+    day1 = (1.0 * 0.5 + 0.5 * -0.2, 1.5)
+    day3 = (0.8 * -0.4, 0.8)
+    assert np.isclose(panel.loc["2026-01-01", "AAA"].item(), day1[0] / day1[1])
+    assert np.isclose(panel.loc["2026-01-02", "AAA"].item(), day1[0] / day1[1])  # no news: the level holds
+    expected = (0.25 * day1[0] + day3[0]) / (0.25 * day1[1] + day3[1])
+    assert np.isclose(panel.loc["2026-01-03", "AAA"].item(), expected)
+    assert np.isnan(panel.loc["2026-01-01", "BBB"].item())  # nothing before its first article
+    assert np.isclose(panel.loc["2026-01-03", "BBB"].item(), 0.9)
+
+
+def test_aggregate_weights_by_relevance_and_recency():
+    asof = datetime(2026, 1, 3, tzinfo=timezone.utc)
+    frame = _frame([("AAA", "2026-01-02 00:00", 1.0, 0.4), ("AAA", "2026-01-03 00:00", 1.0, -0.2)])
+    row = sentiment.aggregate_ticker_sentiment(frame, asof=asof, half_life=timedelta(days=1)).loc["AAA"]
+
+    assert row["articles"] == 2
+    assert np.isclose(row["weighted_score"], 0.1)
+    assert np.isclose(row["decayed_score"], (0.5 * 0.4 - 0.2) / 1.5)
+    assert row["bullish"] == 1 and row["somewhat_bearish"] == 1
+
+
+def test_copies_of_a_story_count_once(tmp_path):
+    published = format_time(datetime.now(timezone.utc) - timedelta(hours=2))
+    feed = {"items": "3", "feed": [
+        {"url": f"https://{host}.example/wind", "title": "Utility plans offshore wind farms", "summary": STORY,
+         "time_published": published, "source": host,
+         "ticker_sentiment": [{"ticker": "AAA", "relevance_score": str(rel), "ticker_sentiment_score": "0.4"}]}
+        for host, rel in (("a", 0.9), ("b", 0.3), ("c", 0.5))
+    ]}
+    path = tmp_path / "feed.json"
+    path.write_text(json.dumps(feed))
+    db = tmp_path / "news.db"
+    ingest_feed(path, db_path=db)
+
+    frame = sentiment.load_sentiment_frame(["AAA"], db_path=db)
+    assert len(frame) == 1 and frame.loc[0, "cluster_size"] == 3 and frame.loc[0, "relevance"] == 0.9
+    assert len(sentiment.load_sentiment_frame(["AAA"], dedupe=False, db_path=db)) == 3
+    assert sentiment.sentiment_for_ticker("AAA", db_path=db)["articles"] == 1
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from tradagent import server
+
+
+def _run(queue, scenario):
+    async def main():
+        async with TestClient(TestServer(server.create_app(queue, drain_timeout=5))) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+def test_timed_out_job_frees_its_worker(monkeypatch):
+    release = threading.Event()
+
+    def analysis(self, ticker, report):
+        if ticker == "HUNG":
+            release.wait(5)
+        return {"status": "ok", "ticker": ticker}
+
+    monkeypatch.setattr(server.JobQueue, "_analyze", analysis)
+
+    async def scenario(client):
+        hung = await (await client.post("/analyze", json={"ticker": "HUNG"})).json()
+        response = await client.post("/analyze?wait=5", json={"ticker": "AAA"})
+        done = await response.json()
+        status = await (await client.get(f"/jobs/{hung['id']}")).json()
+        return status, done
+
+    start = time.perf_counter()
+    hung, done = _run(server.JobQueue(workers=1, timeout=0.2), scenario)
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert hung["status"] == "timeout"
+    assert done["status"] == "done"
+    assert elapsed < 2.0
+
+
+def test_invalid_wait_does_not_queue_a_job():
+    queue = server.JobQueue(workers=1)
+
+    async def scenario(client):
+        for wait in ("abc", "-1", "nan"):
+            response = await client.post(f"/analyze?wait={wait}", json={"ticker": "AAPL"})
+            assert response.status == 400
+        return queue.stats()
+
+    stats = _run(queue, scenario)
+    assert not queue.jobs
+    assert stats["queued"] == stats["running"] == 0
+
+
+def test_report_rejects_empty_analyses():
+    queue = server.JobQueue(workers=1)
+
+    async def scenario(client):
+        for analysis in ({}, {"ticker": "AAPL"}, {"momentum": {"rsi_14d": 40}}, "AAPL"):
+            response = await client.post("/report", json={"analysis": analysis})
+            assert response.status == 400, analysis
+
+    _run(queue, scenario)
+    assert not queue.jobs
+
+
+def test_screen_ticker_list(monkeypatch):
+    import pandas as pd
+
+    from tradagent.benchmarks.fixtures import synthetic_history
+    from tradagent.utils import indicator_panel
+
+    closes = pd.DataFrame({t: synthetic_history(t)["Close"] for t in ("AAPL", "MSFT", "NVDA")})
+    closes["NEW"] = float("nan")
+    closes.loc[closes.index[-5:], "NEW"] = 10.0
+    monkeypatch.setattr(indicator_panel, "get_close_panel", lambda tickers, days: closes[tickers])
+    rsi = indicator_panel.compute_indicator_panel(closes)["rsi_14d"]
+    threshold = float(rsi[["AAPL", "MSFT", "NVDA"]].median())
+
+    async def scenario(client):
+        full = await (await client.get("/screen/tickers?tickers=aapl,MSFT,NVDA,NEW")).json()
+        above = await (await client.get(f"/screen/tickers?tickers=AAPL,MSFT,NVDA&op=>&value={threshold}")).json()
+        bad = [
+            (await client.get(query)).status
+            for query in ("/screen/tickers", "/screen/tickers?tickers=AAPL&column=pe&value=1",
+                          "/screen/tickers?tickers=AAPL&op=!&value=1", "/screen/tickers?tickers=AAPL&value=x")
+        ]
+        return full, above, bad
+
+    full, above, bad = _run(server.JobQueue(workers=1), scenario)
+    assert [r["ticker"] for r in full["results"]] == ["AAPL", "MSFT", "NVDA", "NEW"]
+    assert full["results"][0]["rsi_14d"] == pytest.approx(rsi["AAPL"])
+    assert full["results"][3]["rsi_14d"] is None  # not enough history
+    assert [r["ticker"] for r in above["results"]] == [t for t in ("AAPL", "MSFT", "NVDA") if rsi[t] > threshold]
+    assert bad == [400] * 4
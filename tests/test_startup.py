@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from tradagent.utils import startup
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_import_main_within_budget_and_lazy():
+    result = startup.measure_import("main", cwd=ROOT)
+    assert result["deferred_loaded"] == [], "imported at startup; import them where they are used"
+    assert result["total_ms"] <= startup.STARTUP_BUDGET_MS, result["slowest"]
+
+
+def test_deferred_modules_are_detected():
+    assert "pandas" in startup.measure_import("pandas", cwd=ROOT)["deferred_loaded"]
@@ -0,0 +1,90 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tradagent.utils import tracing
+
+
+@pytest.fixture
+def tracer(tmp_path, monkeypatch):
+    tracer = tracing.Tracer()
+    monkeypatch.setattr(tracing, "TRACER", tracer)
+    tracer.enable(tmp_path)
+    yield tracer
+    tracer.close()
+
+
+def test_spans_are_noops_when_disabled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACER", tracing.Tracer())
+    with tracing.span("stage") as s:
+        s.set(ignored=True)
+    assert not tracing.TRACER.spans
+
+
+def test_bound_calls_nest_under_the_caller(tracer, tmp_path):
+    @tracing.traced("fetch")
+    def fetch(ticker):
+        tracing.annotate(ticker=ticker)
+        return tracing._current.get().parent_id
+
+    with tracing.span("batch") as root:
+        with ThreadPoolExecutor(2) as pool:
+            futures = [pool.submit(tracing.bind(fetch), t) for t in ["AAA", "BBB"]]
+            parents = [f.result() for f in futures]
+        # Without bind() the worker threads start a trace of their own
+        with ThreadPoolExecutor(1) as pool:
+            pool.submit(fetch, "CCC").result()
+
+    assert parents == [root.span_id, root.span_id]
+    nested = tracer.trace(root.trace_id)
+    assert sorted(s.attrs.get("ticker", "") for s in nested) == ["", "AAA", "BBB"]
+    orphan = next(s for s in tracer.spans if s.attrs.get("ticker") == "CCC")
+    assert orphan.parent_id is None and orphan.trace_id != root.trace_id
+
+    tracer.close()
+    lines = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["fetch", "fetch", "fetch", "batch"]
+    assert lines[-1]["span_id"] == root.span_id
+
+
+def test_errors_are_recorded_and_reraised(tracer):
+    with pytest.raises(ValueError), tracing.span("parse"):
+        raise ValueError("bad feed")
+    (parse,) = tracer.spans
+    assert parse.status == "error" and parse.attrs["error"] == "ValueError: bad feed"
+    assert tracing._current.get() is None
+
+
+def test_write_metrics_is_openmetrics(tracer, tmp_path):
+    for _ in range(3):
+        with tracing.span("fetch"):
+            pass
+    tracer.add_tokens("mistral-small", input_tokens=120, output_tokens=30)
+
+    path = tracer.write_metrics()
+    assert path == tmp_path / "metrics.prom"
+    text = path.read_text()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE tradagent_stage_latency_seconds summary" in text
+    for q in tracing.QUANTILES:
+        assert f'tradagent_stage_latency_seconds{{stage="fetch",quantile="{q}"}} ' in text
+    assert 'tradagent_stage_latency_seconds_count{stage="fetch"} 3' in text
+    assert "# TYPE tradagent_llm_tokens counter" in text
+    assert 'tradagent_llm_tokens_total{model="mistral-small",kind="input"} 120' in text
+    assert 'tradagent_llm_tokens_total{model="mistral-small",kind="output"} 30' in text
+
+
+def test_format_trace_indents_children(tracer):
+    with tracing.span("request", ticker="AAPL") as root:
+        with tracing.span("fetch.prices"):
+            pass
+        with pytest.raises(RuntimeError), tracing.span("llm.summary"):
+            raise RuntimeError("timeout")
+
+    lines = tracing.format_trace(root.trace_id).splitlines()
+    assert lines[0].split() == ["STAGE", "MS", "SHARE", "DETAILS"]
+    assert lines[1].startswith("request ") and "100.0%" in lines[1] and lines[1].endswith("ticker=AAPL")
+    assert lines[2].startswith("  fetch.prices ")
+    assert lines[3].startswith("  llm.summary ") and lines[3].endswith("[error] RuntimeError: timeout")
+    assert tracing.format_trace("missing") == ""
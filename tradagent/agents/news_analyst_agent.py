@@ -1,15 +1,80 @@
-from dotenv import load_dotenv
-import finnhub
-from datetime import date, timedelta
-from newspaper import Article
-from ..config import FINNHUB_API_KEY
-import requests
-import pandas as pd
+from ..config import get_finnhub_api_key
 
-# replace the "demo" apikey below with your own key from https://www.alphavantage.co/support/#api-key
-url = 'https://www.alphavantage.co/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol=IBM&apikey=demo'
-r = requests.get(url)
-data = r.json()
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+FINNHUB_URL = "https://finnhub.io/api/v1"
 
+NEWS_PROMPT = """You are a senior financial analyst reading market news.
 
-print(data)
\ No newline at end of file
+You receive numbered news articles (title and summary). For EACH article, write
+one sentence with its key takeaway for investors and classify its likely impact
+on the companies it covers as "bullish", "bearish" or "neutral".
+
+Return ONLY a JSON object, no markdown:
+
+{
+    "articles": [
+        {"id": 1, "takeaway": "One sentence takeaway", "impact": "bullish"}
+    ]
+}
+"""
+
+
+def fetch_alpha_vantage(function: str, apikey: str = "demo", **params) -> dict:
+    """
+    Query an Alpha Vantage endpoint, e.g.
+    fetch_alpha_vantage("TIME_SERIES_DAILY_ADJUSTED", symbol="IBM").
+    Replace the "demo" apikey with your own key from https://www.alphavantage.co/support/#api-key
+    """
+    from ..utils.clients import get_session
+
+    response = get_session("alpha_vantage").get(
+        ALPHA_VANTAGE_URL,
+        params={"function": function, "apikey": apikey, **params},
+        timeout=30,
+    )
+    return response.json()
+
+
+class FinnhubClient:
+    """
+    Minimal Finnhub REST client on the shared, rate-limited Finnhub session.
+    Method names follow finnhub-python's Client; `get` reaches any other endpoint.
+    """
+
+    def __init__(self, api_key: str, base_url: str = FINNHUB_URL, timeout: float = 30):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def get(self, path: str, **params):
+        from ..utils.clients import get_session
+
+        response = get_session("finnhub").get(
+            f"{self.base_url}/{path.lstrip('/')}",
+            params={k: v for k, v in params.items() if v is not None},
+            headers={"X-Finnhub-Token": self.api_key},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def company_news(self, symbol: str, _from: str, to: str) -> list:
+        return self.get("company-news", symbol=symbol, **{"from": _from}, to=to)
+
+    def general_news(self, category: str = "general", min_id: int = 0) -> list:
+        return self.get("news", category=category, minId=min_id)
+
+    def quote(self, symbol: str) -> dict:
+        return self.get("quote", symbol=symbol)
+
+
+def build_finnhub_client() -> FinnhubClient:
+    """Finnhub client sending through the shared, rate-limited Finnhub session."""
+    return FinnhubClient(get_finnhub_api_key().get_secret_value())
+
+
+def build_news_llm():
+    """LLM used to summarize news batches (see utils.news_summary.summarize_news)."""
+    from ..utils.clients import get_chat_model
+
+    return get_chat_model("mistral-medium", temperature=0.0)
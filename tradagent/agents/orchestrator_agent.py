@@ -1,10 +1,3 @@
-from langchain_mistralai import ChatMistralAI
-from langchain.agents import create_agent
-from langchain.messages import SystemMessage
-
-from ..config import MISTRAL_API_KEY
-
-
 SYSTEM_PROMPT = """
 You are an orchestration agent for a financial AI system.
 
@@ -35,11 +28,13 @@ LOGIC:
 """
 
 def build_agent():
-    llm = ChatMistralAI(
-        name="mistral-small",
-        api_key=MISTRAL_API_KEY,
-        temperature=0.0  # important for determinism
-    )
+    # Heavy client libraries load on first use, not at import
+    from langchain.agents import create_agent
+    from langchain.messages import SystemMessage
+
+    from ..utils.clients import get_chat_model
+
+    llm = get_chat_model("mistral-small", temperature=0.0)  # important for determinism
 
     return create_agent(
         model=llm,
@@ -1,11 +1,3 @@
-from langchain_mistralai import ChatMistralAI
-from langchain.agents import create_agent
-from langchain.messages import SystemMessage, HumanMessage
-
-from ..config import MISTRAL_API_KEY
-from ..tools.report_writer_tools import REPORT_TOOLS
-
-
 SYSTEM_PROMPT = r"""You are an expert report writer specializing in producing professional financial PDF reports.
 
 Your ONLY task is to call the generate_report_from_analysis tool with the JSON analysis provided by the user.
@@ -35,12 +27,13 @@ Remember: Your job is ONLY to pass the JSON to the tool and return its result.
 
 def build_agent():
     """Build and return the report writing agent."""
-    
-    llm = ChatMistralAI(
-        name="mistral-medium",
-        api_key=MISTRAL_API_KEY,
-        temperature=0.3
-    )
+    from langchain.agents import create_agent
+    from langchain.messages import SystemMessage
+
+    from ..tools.report_writer_tools import REPORT_TOOLS
+    from ..utils.clients import get_chat_model
+
+    llm = get_chat_model("mistral-medium", temperature=0.3)
     
     agent = create_agent(
         model=llm,
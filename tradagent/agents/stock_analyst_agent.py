@@ -1,10 +1,3 @@
-from langchain.agents import create_agent
-from langchain_mistralai import ChatMistralAI
-from langchain.messages import SystemMessage, HumanMessage
-
-from ..config import MISTRAL_API_KEY
-from ..tools.stock_analyst_tools import TOOLS
-
 SYSTEM_PROMPT = """You are a senior financial analyst and capital markets expert.
 You provide rigorous, quantitative, and risk-aware analysis.
 
@@ -63,12 +56,40 @@ IMPORTANT NOTES:
 - Do NOT add extra fields like "rsi_interpretation", "momentum_bias", "valuation_stance" - these are calculated by the report generator
 """
 
+PROSE_PROMPT = """You are a senior financial analyst and capital markets expert.
+
+You receive the quantitative metrics of a stock (already computed, do NOT repeat them)
+and a Wikipedia excerpt about the company.
+
+Your ONLY task is to write two short texts and return them as a JSON object:
+
+{
+    "summary": "2-3 sentence overview of the company and its business",
+    "conclusion": "2-3 sentence summary covering structural strength, valuation stance, and momentum bias"
+}
+
+For the conclusion:
+- Valuation stance (based on P/E ratios: >30 = "premium", 15-30 = "fair", <15 = "cheap")
+- Momentum bias (based on MACD histogram and RSI)
+
+Output ONLY the JSON object, no markdown, no numbers table, no extra fields.
+"""
+
+def build_prose_llm():
+    """LLM used by the compute-only pipeline to write the summary and conclusion."""
+    from ..utils.clients import get_chat_model
+
+    return get_chat_model("mistral-medium", temperature=0.2)
+
 def build_agent():
-    llm = ChatMistralAI(
-        name="mistral-medium", 
-        api_key=MISTRAL_API_KEY,
-        temperature=0.2
-    )
+    from langchain.agents import create_agent
+    from langchain.messages import SystemMessage
+
+    from ..tools.stock_analyst_tools import TOOLS
+    from ..utils.clients import get_chat_model
+
+    # Same shared client as the prose LLM
+    llm = get_chat_model("mistral-medium", temperature=0.2)
 
     agent = create_agent(
         model=llm,
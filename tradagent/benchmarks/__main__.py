@@ -0,0 +1,86 @@
+import argparse
+import sys
+
+from .fixtures import Fixtures, record_fixtures
+from .suite import (
+    REGRESSION_THRESHOLD,
+    RESULTS_PATH,
+    baseline_run,
+    compare,
+    format_results,
+    load_runs,
+    run,
+    save,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m tradagent.benchmarks", description="TRADAgent benchmarks")
+    sub = parser.add_subparsers(dest="command")
+
+    run_parser = sub.add_parser("run", help="Run the suite and append the results to the results file")
+    run_parser.add_argument("-k", "--filter", help="Only benchmarks whose name contains this string")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark")
+    run_parser.add_argument("--no-save", action="store_true", help="Print the results without storing them")
+    run_parser.add_argument("--compare", action="store_true", help="Compare with the previous commit's run")
+
+    compare_parser = sub.add_parser("compare", help="Compare the latest run with an earlier commit's run")
+    compare_parser.add_argument("--against", help="Commit to compare with (default: the previous commit's run)")
+
+    for p in (run_parser, compare_parser):
+        p.add_argument("--results", default=RESULTS_PATH, help="Results file (JSON lines)")
+        p.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                       help="Median time ratio reported as a regression")
+
+    record_parser = sub.add_parser("record", help="Record real market data fixtures (needs network access)")
+    record_parser.add_argument("tickers", nargs="*")
+    return parser.parse_args()
+
+
+def _compare(current: dict, runs: list, against: str, threshold: float) -> int:
+    baseline = baseline_run(runs, current, against)
+    if baseline is None:
+        print("[System] No earlier run to compare with.")
+        return 0
+    lines, regressions = compare(current, baseline, threshold)
+    print(f"\n{current['commit']} vs {baseline['commit']} (regression above {threshold:.2f}x):")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n[Error] {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.command == "record":
+        record_fixtures(args.tickers or None)
+        print("[System] Fixtures recorded.")
+        return 0
+
+    if args.command == "compare":
+        runs = load_runs(args.results)
+        if not runs:
+            print(f"[System] No runs in {args.results}.")
+            return 0
+        return _compare(runs[-1], runs, args.against, args.threshold)
+
+    if args.command is None:
+        args = argparse.Namespace(
+            filter=None, repeat=5, no_save=False, compare=False, results=RESULTS_PATH, threshold=REGRESSION_THRESHOLD,
+        )
+    fixtures = Fixtures()
+    results = run(args.filter, repeat=args.repeat, fixtures=fixtures)
+    print(format_results(results))
+    if args.no_save:
+        return 0
+    entry = save(results, args.results, fixtures)
+    print(f"\n[System] Results for {entry['commit']} appended to {args.results}")
+    if args.compare:
+        return _compare(entry, load_runs(args.results), None, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+DEFAULT_TICKERS = ["AAPL", "MSFT", "NVDA", "JPM", "XOM"]
+
+# Final answers shaped like the ones the stock analyst agent returns
+LLM_OUTPUT_TEMPLATES = {
+    "plain": "{json}",
+    "fenced": "Here is the analysis:\n\n```json\n{json}\n```\n\nLet me know if you need a report.",
+    "prose_around": "Based on the tool outputs, the final analysis is {json} -- all values come from the tools.",
+    "escaped": "{escaped}",
+}
+
+
+def synthetic_history(ticker: str, days: int = 366) -> pd.DataFrame:
+    """Deterministic yfinance-shaped daily bars (seeded by the ticker) for offline runs."""
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    index = pd.bdate_range(end=pd.Timestamp("2026-01-05"), periods=int(days * 252 / 365), tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.018, len(index))))
+    spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+    return pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.3, len(index)),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(5_000_000, 80_000_000, len(index)),
+        },
+        index=pd.DatetimeIndex(index, name="Date"),
+    )
+
+
+def synthetic_info(ticker: str) -> dict:
+    return {
+        "longName": f"{ticker} Holdings Inc.",
+        "marketCap": 2.5e12,
+        "trailingEps": 6.1,
+        "forwardEps": 7.0,
+        "trailingPE": 31.4,
+        "forwardPE": 27.2,
+        "priceToSalesTrailing12Months": 8.3,
+    }
+
+
+def synthetic_wikipedia(ticker: str) -> str:
+    name = synthetic_info(ticker)["longName"]
+    return (
+        f"Page: {name}\nSummary: {name} is a multinational technology company. "
+        "It designs, manufactures and sells consumer electronics, software and services. "
+        "The company is one of the largest by market capitalization. " * 8
+    )
+
+
+def prose_response(ticker: str) -> str:
+    """Canned answer to PROSE_PROMPT, shaped like Mistral's."""
+    return json.dumps({
+        "summary": f"{ticker} designs consumer hardware and software with a large services business.",
+        "conclusion": "Momentum is neutral and valuation is rich; the profile favours patient investors.",
+    })
+
+
+class Fixtures:
+    """
+    Market data, Wikipedia overviews and LLM responses for the benchmark
+    tickers. Market data and overviews recorded with `python -m
+    tradagent.benchmarks record` are used when present (none are committed);
+    otherwise deterministic synthetic data stands in. LLM responses are
+    always canned.
+    """
+
+    def __init__(self, tickers: list = None, directory: Path = FIXTURES_DIR):
+        self.tickers = tickers or DEFAULT_TICKERS
+        self.directory = Path(directory)
+        self.recorded = (self.directory / "info.json").exists()
+        self._info = json.loads((self.directory / "info.json").read_text()) if self.recorded else {}
+        self._wiki = json.loads((self.directory / "wikipedia.json").read_text()) if self.recorded else {}
+        self._histories = {}
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        if ticker not in self._histories:
+            path = self.directory / f"history_{ticker}.csv"
+            if path.exists():
+                hist = pd.read_csv(path, index_col="Date")
+                hist.index = pd.DatetimeIndex(pd.to_datetime(hist.index, utc=True), name="Date")
+            else:
+                hist = synthetic_history(ticker)
+            self._histories[ticker] = hist
+        return self._histories[ticker]
+
+    def info(self, ticker: str) -> dict:
+        return self._info.get(ticker) or synthetic_info(ticker)
+
+    def wikipedia(self, ticker: str) -> str:
+        return self._wiki.get(ticker) or synthetic_wikipedia(ticker)
+
+    def llm_outputs(self, analysis_json: str) -> dict:
+        """The analysis JSON wrapped the ways agents return it, keyed by variant."""
+        escaped = analysis_json.replace('"', '\\"')
+        return {
+            name: template.replace("{json}", analysis_json).replace("{escaped}", escaped)
+            for name, template in LLM_OUTPUT_TEMPLATES.items()
+        }
+
+
+def record_fixtures(tickers: list = None, directory: Path = FIXTURES_DIR):
+    """Record real yfinance histories/info and Wikipedia overviews (needs network access)."""
+    import yfinance as yf
+
+    from ..utils.wiki_cache import _fetch as fetch_wikipedia
+
+    tickers = tickers or DEFAULT_TICKERS
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    info = {}
+    wiki = {}
+    for ticker in tickers:
+        yf_ticker = yf.Ticker(ticker)
+        yf_ticker.history(period="1y").to_csv(directory / f"history_{ticker}.csv")
+        full = yf_ticker.info
+        info[ticker] = {k: full.get(k) for k in synthetic_info(ticker)}
+        wiki[ticker] = fetch_wikipedia(info[ticker].get("longName") or ticker)
+    (directory / "info.json").write_text(json.dumps(info, indent=2))
+    (directory / "wikipedia.json").write_text(json.dumps(wiki, indent=2))
@@ -0,0 +1,376 @@
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .fixtures import Fixtures, prose_response
+
+# One JSON line per run, so runs on successive commits can be compared
+RESULTS_PATH = Path(os.environ.get("TRADAGENT_BENCH_RESULTS", ".benchmarks/results.jsonl"))
+
+# Slowdown (median time ratio) reported as a regression by compare()
+REGRESSION_THRESHOLD = 1.20
+
+MIN_RUN_SECONDS = 0.2
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, needs: str = None):
+    """Register `setup(ctx) -> callable`; the returned callable is what gets timed."""
+    def register(setup):
+        BENCHMARKS[name] = {"setup": setup, "needs": needs}
+        return setup
+    return register
+
+
+# ---- Offline environment ----
+
+class _StubMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubProseLLM:
+    """Stands in for ChatMistralAI in pipeline mode: returns a canned prose answer."""
+
+    def invoke(self, messages):
+        content = messages[-1].content
+        ticker = content.split('"ticker":"', 1)[-1].split('"', 1)[0] if '"ticker":"' in content else "?"
+        return _StubMessage(prose_response(ticker))
+
+
+class StubStockAgent:
+    """Stands in for the tool-calling agent: runs the real tool, answers in a fenced block."""
+
+    def __init__(self, fixtures: Fixtures):
+        self.fixtures = fixtures
+
+    def invoke(self, state):
+        from langchain.messages import AIMessage
+
+        from ..tools.stock_analyst_tools import get_stock_report
+
+        ticker = state["messages"][-1].content.split()[-1]
+        report = json.dumps(get_stock_report.invoke({"ticker": ticker}))
+        return {"messages": [AIMessage(content=self.fixtures.llm_outputs(report)["fenced"])]}
+
+
+@contextlib.contextmanager
+def offline(fixtures: Fixtures):
+    """
+    Route every network call to the fixtures: yfinance downloads, ticker info,
+    Wikipedia and the Mistral clients. The local store lives in a temp dir.
+    """
+    from ..agents import stock_analyst_agent
+    from ..utils import db_utils, price_cache, stock_utils, wiki_cache
+
+    names = {fixtures.info(t)["longName"].lower(): t for t in fixtures.tickers}
+    patches = [
+        (price_cache, "_fetch", lambda tickers, start: {t: fixtures.history(t) for t in tickers}),
+        (stock_utils.MarketData, "info", property(lambda self: fixtures.info(self.ticker))),
+        (wiki_cache, "_fetch", lambda query: fixtures.wikipedia(names.get(query.lower(), query))),
+        (stock_analyst_agent, "build_prose_llm", lambda: StubProseLLM()),
+        (stock_analyst_agent, "build_agent", lambda: StubStockAgent(fixtures)),
+    ]
+    workdir = Path(tempfile.mkdtemp(prefix="tradagent-bench-"))
+    patches.append((db_utils, "DB_PATH", workdir / "bench.db"))
+
+    saved = [(target, attr, target.__dict__[attr]) for target, attr, _ in patches]
+    try:
+        for target, attr, value in patches:
+            setattr(target, attr, value)
+        yield workdir
+    finally:
+        for target, attr, value in saved:
+            setattr(target, attr, value)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---- Benchmarks ----
+
+def _bundle(ctx, ticker="AAPL"):
+    from ..utils.stock_utils import MarketData
+
+    return MarketData(ticker, history=ctx["fixtures"].history(ticker), info=ctx["fixtures"].info(ticker))
+
+
+@benchmark("indicators.get_latest_ohlc")
+def _(ctx):
+    from ..utils.stock_utils import get_latest_ohlc
+    data = _bundle(ctx)
+    return lambda: get_latest_ohlc("AAPL", data=data)
+
+
+@benchmark("indicators.compute_rsi")
+def _(ctx):
+    from ..utils.stock_utils import compute_rsi
+    data = _bundle(ctx)
+    return lambda: compute_rsi("AAPL", data=data)
+
+
+@benchmark("indicators.compute_macd")
+def _(ctx):
+    from ..utils.stock_utils import compute_macd
+    data = _bundle(ctx)
+    return lambda: compute_macd("AAPL", data=data)
+
+
+@benchmark("indicators.compute_volatility")
+def _(ctx):
+    from ..utils.stock_utils import compute_volatility
+    data = _bundle(ctx)
+    return lambda: compute_volatility("AAPL", data=data)
+
+
+@benchmark("indicators.get_earnings_and_valuation")
+def _(ctx):
+    from ..utils.stock_utils import get_earnings_and_valuation
+    data = _bundle(ctx)
+    return lambda: get_earnings_and_valuation("AAPL", data=data)
+
+
+@benchmark("indicators.panel_100_tickers")
+def _(ctx):
+    import pandas as pd
+
+    from ..utils.indicator_panel import compute_indicator_panel
+    fixtures = ctx["fixtures"]
+    closes = pd.DataFrame({
+        f"{t}{i}": fixtures.history(t)["Close"] for i in range(20) for t in fixtures.tickers
+    })
+    return lambda: compute_indicator_panel(closes)
+
+
+@benchmark("report.build_stock_report")
+def _(ctx):
+    from ..tools.stock_analyst_tools import build_stock_report
+    data = _bundle(ctx)
+    return lambda: build_stock_report("AAPL", data=data)
+
+
+@benchmark("report.get_stock_report_tool")
+def _(ctx):
+    from ..tools.stock_analyst_tools import get_stock_report
+    get_stock_report.invoke({"ticker": "AAPL"})  # fill the OHLCV cache once
+    return lambda: get_stock_report.invoke({"ticker": "AAPL"})
+
+
+def _analysis_json(ctx) -> str:
+    from ..tools.stock_analyst_tools import build_stock_report
+    from ..utils.analysis_record import AnalysisRecord
+
+    record = AnalysisRecord.from_dict(build_stock_report("AAPL", data=_bundle(ctx)))
+    record.summary = json.loads(prose_response("AAPL"))["summary"]
+    return record.to_json()
+
+
+for _variant in ("plain", "fenced", "prose_around", "escaped"):
+    @benchmark(f"parse.extract_json_from_text[{_variant}]")
+    def _(ctx, variant=_variant):
+        from ..tools.report_writer_tools import extract_json_from_text
+        text = ctx["fixtures"].llm_outputs(_analysis_json(ctx))[variant]
+        return lambda: extract_json_from_text(text)
+
+
+@benchmark("parse.AnalysisRecord.from_json")
+def _(ctx):
+    from ..utils.analysis_record import AnalysisRecord
+    text = _analysis_json(ctx)
+    return lambda: AnalysisRecord.from_json(text)
+
+
+@benchmark("latex.render_analysis_document")
+def _(ctx):
+    from ..tools.report_writer_tools import render_analysis_document
+    from ..utils.analysis_record import AnalysisRecord
+    record = AnalysisRecord.from_json(_analysis_json(ctx))
+    return lambda: render_analysis_document(record)
+
+
+@benchmark("latex.compile_report", needs="pdflatex")
+def _(ctx):
+    from ..tools.report_writer_tools import build_report
+    from ..utils.analysis_record import AnalysisRecord
+    record = AnalysisRecord.from_json(_analysis_json(ctx))
+    output_dir = str(ctx["workdir"] / "reports")
+    return lambda: build_report(record, output_dir=output_dir)
+
+
+@benchmark("news.deduplicate_feeds")
+def _(ctx):
+    from ..utils.news_dedup import deduplicate
+    from ..utils.news_store import iter_feed_items
+    feeds = Path(__file__).resolve().parents[1] / "test" / "data" / "news"
+    items = [item for path in sorted(feeds.rglob("*.json")) for item in iter_feed_items(path)]
+    return lambda: deduplicate(items)
+
+
+@benchmark("pipeline.run_stock_pipeline")
+def _(ctx):
+    from ..pipeline import run_stock_pipeline
+    llm = StubProseLLM()
+    run_stock_pipeline("AAPL", llm)  # warm the price and Wikipedia caches
+    return lambda: run_stock_pipeline("AAPL", llm)
+
+
+@benchmark("pipeline.analyze_ticker_agent")
+def _(ctx):
+    from ..pipeline import analyze_ticker
+    agent = StubStockAgent(ctx["fixtures"])
+    return lambda: analyze_ticker("AAPL", agent)
+
+
+@benchmark("pipeline.run_batch")
+def _(ctx):
+    import asyncio
+
+    from ..pipeline import run_batch
+    tickers = ctx["fixtures"].tickers
+    llm = StubProseLLM()
+    return lambda: asyncio.run(run_batch(tickers, prose_llm=llm, record=False))
+
+
+@benchmark("main.repl_query")
+def _(ctx):
+    """One REPL turn of main.main() ("Analyze AAPL" then exit), output discarded."""
+    import main
+
+    def run():
+        queries = iter(["Analyze AAPL", "exit"])
+        original = builtins.input
+        builtins.input = lambda prompt="": next(queries)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                main.main(mode="pipeline")
+        finally:
+            builtins.input = original
+
+    return run
+
+
+# ---- Runner ----
+
+def _time(fn, repeat: int) -> dict:
+    fn()  # warm-up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_RUN_SECONDS or number >= 1_000_000:
+            break
+        number *= 2 if elapsed * 10 > MIN_RUN_SECONDS else 10
+
+    runs = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - start) / number)
+    return {
+        "median_us": statistics.median(runs) * 1e6,
+        "min_us": min(runs) * 1e6,
+        "stdev_us": statistics.stdev(runs) * 1e6 if len(runs) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(select: str = None, repeat: int = 5, fixtures: Fixtures = None) -> dict:
+    """Run the registered benchmarks (names containing `select`) offline. Returns name -> timings."""
+    fixtures = fixtures or Fixtures()
+    results = {}
+    with offline(fixtures) as workdir:
+        ctx = {"fixtures": fixtures, "workdir": workdir}
+        for name, bench in BENCHMARKS.items():
+            if select and select not in name:
+                continue
+            if bench["needs"] and shutil.which(bench["needs"]) is None:
+                results[name] = {"skipped": f"{bench['needs']} not found"}
+                continue
+            results[name] = _time(bench["setup"](ctx), repeat)
+    return results
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def save(results: dict, path: Path = RESULTS_PATH, fixtures: Fixtures = None) -> dict:
+    """Append a run, tagged with the current commit, to the results file."""
+    entry = {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "fixtures": "recorded" if fixtures and fixtures.recorded else "synthetic",
+        "results": results,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def load_runs(path: Path = RESULTS_PATH) -> list:
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_run(runs: list, current: dict, against: str = None):
+    """The run to compare with: the latest on `against`, else the latest on another commit."""
+    for entry in reversed(runs):
+        if entry is current:
+            continue
+        if against and entry["commit"].startswith(against):
+            return entry
+        if not against and entry["commit"] != current["commit"]:
+            return entry
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> tuple:
+    """(report lines, regressed names) comparing median times of two runs."""
+    lines = [f"{'BENCHMARK':<44} {'BASE us':>11} {'NOW us':>11} {'RATIO':>7}"]
+    regressions = []
+    for name, now in current["results"].items():
+        base = baseline["results"].get(name, {})
+        if "median_us" not in now or "median_us" not in base:
+            lines.append(f"{name:<44} {'-':>11} {now.get('median_us', 0):>11.1f} {'-':>7}")
+            continue
+        ratio = now["median_us"] / base["median_us"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        lines.append(f"{name:<44} {base['median_us']:>11.1f} {now['median_us']:>11.1f} {ratio:>6.2f}x{flag}")
+    return lines, regressions
+
+
+def format_results(results: dict) -> str:
+    lines = [f"{'BENCHMARK':<44} {'MEDIAN us':>12} {'MIN us':>12} {'RUNS':>10}"]
+    for name, r in results.items():
+        if "skipped" in r:
+            lines.append(f"{name:<44} {'skipped: ' + r['skipped']}")
+        else:
+            lines.append(f"{name:<44} {r['median_us']:>12.1f} {r['min_us']:>12.1f} {r['number'] * r['repeat']:>10}")
+    return "\n".join(lines)
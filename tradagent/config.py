@@ -4,7 +4,6 @@ import os
 load_dotenv()
 
 from pydantic import SecretStr
-import os
 
 MISTRAL_API_KEY = (
     SecretStr(os.environ["MISTRAL_API_KEY"])
@@ -12,15 +11,22 @@ MISTRAL_API_KEY = (
     else None
 )
 
-
-if not MISTRAL_API_KEY:
-    raise ValueError("MISTRAL_API_KEY is not set in the environment variables .env")
-
 FINNHUB_API_KEY = (
     SecretStr(os.environ["FINNHUB_API_KEY"])
     if "FINNHUB_API_KEY" in os.environ
     else None
 )
 
-if not FINNHUB_API_KEY:
-    raise ValueError("FINNHUB_API_KEY is not set in the environment variables (.env)")
\ No newline at end of file
+
+# Keys are checked when a client is built, not at import, so tools that
+# never call Mistral or Finnhub (and --help) start without them
+def get_mistral_api_key() -> SecretStr:
+    if not MISTRAL_API_KEY:
+        raise ValueError("MISTRAL_API_KEY is not set in the environment variables (.env)")
+    return MISTRAL_API_KEY
+
+
+def get_finnhub_api_key() -> SecretStr:
+    if not FINNHUB_API_KEY:
+        raise ValueError("FINNHUB_API_KEY is not set in the environment variables (.env)")
+    return FINNHUB_API_KEY
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from .pipeline import analyze_ticker, record_analyses
+
+DEFAULT_INTERVAL = 300.0  # seconds between refresh cycles
+DEFAULT_CHUNK_SIZE = 50  # tickers per batched price download
+DEFAULT_MONITOR_CONCURRENCY = 4  # price chunks refreshed at once
+RECENT_ANALYSES = 100  # latest analysis results kept in memory (all are stored in the decisions table)
+
+RSI_OVERSOLD = 30.0
+RSI_OVERBOUGHT = 70.0
+
+
+def _valid(value) -> bool:
+    return value is not None and value == value  # not None/NaN
+
+
+def detect_alerts(ticker: str, previous: dict, current: dict) -> list:
+    """
+    Alerts between two indicator snapshots: RSI crossing 30 or 70 in either
+    direction and the MACD histogram changing sign.
+    """
+    if not previous:
+        return []
+    alerts = []
+
+    def alert(kind, message, value):
+        alerts.append({"ticker": ticker, "date": current["date"], "kind": kind, "message": message, "value": value})
+
+    before, after = previous.get("rsi_14d"), current.get("rsi_14d")
+    if _valid(before) and _valid(after):
+        if before >= RSI_OVERSOLD > after:
+            alert("rsi_oversold", f"RSI fell below {RSI_OVERSOLD:.0f}", after)
+        elif before < RSI_OVERSOLD <= after:
+            alert("rsi_recovered", f"RSI rose back above {RSI_OVERSOLD:.0f}", after)
+        if before <= RSI_OVERBOUGHT < after:
+            alert("rsi_overbought", f"RSI rose above {RSI_OVERBOUGHT:.0f}", after)
+        elif before > RSI_OVERBOUGHT >= after:
+            alert("rsi_cooled", f"RSI fell back below {RSI_OVERBOUGHT:.0f}", after)
+
+    before, after = previous.get("histogram"), current.get("histogram")
+    if _valid(before) and _valid(after) and before and after and (before > 0) != (after > 0):
+        direction = "bullish" if after > 0 else "bearish"
+        alert(f"macd_{direction}", f"MACD histogram turned {'positive' if after > 0 else 'negative'}", after)
+    return alerts
+
+
+def format_alert(alert: dict) -> str:
+    return f"[Alert] {alert['date']} {alert['ticker']:<8} {alert['message']} ({alert['value']:.2f})"
+
+
+class WatchlistMonitor:
+    """
+    Tracks a watchlist on a schedule from one event loop.
+
+    Every cycle refreshes prices in batched chunks (at most `concurrency`
+    chunks in flight), advances the stored online indicators by the new bars
+    and compares them with the previous snapshot. Only tickers that raised an
+    alert get a full analysis run, bounded by `llm_concurrency`.
+    """
+
+    def __init__(
+        self,
+        tickers: list,
+        interval: float = DEFAULT_INTERVAL,
+        concurrency: int = DEFAULT_MONITOR_CONCURRENCY,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        llm_concurrency: int = 2,
+        analyze: bool = False,
+        report: bool = False,
+        output_dir: str = "./reports",
+        stock_agent=None,
+        prose_llm=None,
+        on_alert=None,
+        db_path=None,
+    ):
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        self.interval = interval
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.llm_concurrency = llm_concurrency
+        self.analyze = analyze
+        self.report = report
+        self.output_dir = output_dir
+        self.stock_agent = stock_agent
+        self.prose_llm = prose_llm
+        self.on_alert = on_alert or (lambda alert: print(format_alert(alert)))
+        self.db_path = db_path
+        self.snapshots = {}
+        self.analyses = deque(maxlen=RECENT_ANALYSES)
+        self.cycles = 0
+
+    def _load_snapshots(self):
+        """Last persisted snapshots, so a restart does not miss or repeat crossings."""
+        from .utils.online_indicators import load_states
+
+        states = load_states(self.tickers, db_path=self.db_path)
+        self.snapshots = {ticker: state.snapshot() for ticker, state in states.items()}
+
+    def _refresh_chunk(self, chunk: list) -> dict:
+        from .utils.online_indicators import update_indicators
+
+        # Prices older than one cycle are stale for the monitor
+        return update_indicators(chunk, db_path=self.db_path, ttl=timedelta(seconds=self.interval))
+
+    async def refresh(self) -> dict:
+        """New snapshots for the whole watchlist; failed chunks are reported and skipped."""
+        slots = asyncio.Semaphore(self.concurrency)
+        chunks = [self.tickers[i:i + self.chunk_size] for i in range(0, len(self.tickers), self.chunk_size)]
+
+        async def run(chunk):
+            async with slots:
+                try:
+                    return await asyncio.to_thread(self._refresh_chunk, chunk)
+                except Exception as e:
+                    print(f"[Warning] Refresh failed for {', '.join(chunk)}: {e}")
+                    return {}
+
+        snapshots = {}
+        for result in await asyncio.gather(*(run(c) for c in chunks)):
+            snapshots.update(result)
+        return snapshots
+
+    async def _analyze(self, tickers: list, llm_slots: threading.BoundedSemaphore) -> list:
+        async def run(ticker):
+            try:
+                return await asyncio.to_thread(
+                    analyze_ticker, ticker, self.stock_agent, self.report, self.output_dir, llm_slots, self.prose_llm,
+                )
+            except Exception as e:
+                return {"ticker": ticker, "status": "error", "error": str(e)}
+
+        results = await asyncio.gather(*(run(t) for t in tickers))
+        await asyncio.to_thread(record_analyses, [r["analysis"] for r in results if r.get("analysis")])
+        return results
+
+    async def run_cycle(self, llm_slots: threading.BoundedSemaphore = None) -> list:
+        """One refresh: returns the alerts raised and, with `analyze`, runs the analyses."""
+        snapshots = await self.refresh()
+        alerts = []
+        for ticker, snapshot in snapshots.items():
+            alerts.extend(detect_alerts(ticker, self.snapshots.get(ticker), snapshot))
+            self.snapshots[ticker] = snapshot
+        for alert in alerts:
+            self.on_alert(alert)
+
+        changed = list(dict.fromkeys(a["ticker"] for a in alerts))
+        if self.analyze and changed:
+            results = await self._analyze(changed, llm_slots or threading.BoundedSemaphore(self.llm_concurrency))
+            for result in results:
+                details = result.get("pdf_path") or result.get("error") or ""
+                print(f"[System] {result['ticker']}: analysis {result['status']} {details}".rstrip())
+            self.analyses.extend(results)
+        self.cycles += 1
+        return alerts
+
+    async def run(self, cycles: int = None):
+        """Refresh every `interval` seconds until cancelled (or for `cycles` cycles)."""
+        await asyncio.to_thread(self._load_snapshots)
+        llm_slots = threading.BoundedSemaphore(self.llm_concurrency)
+        while cycles is None or self.cycles < cycles:
+            start = time.monotonic()
+            alerts = await self.run_cycle(llm_slots)
+            elapsed = time.monotonic() - start
+            print(f"[System] {datetime.now():%H:%M:%S} cycle {self.cycles}: "
+                  f"{len(self.snapshots)}/{len(self.tickers)} tickers, {len(alerts)} alerts, {elapsed:.1f}s")
+            if cycles is not None and self.cycles >= cycles:
+                break
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from .utils.analysis_record import AnalysisRecord
+from .utils.tracing import annotate, bind, span, traced
+from .utils.wiki_cache import cached_summary, get_company_summary
+
+# LangChain, pandas and yfinance are imported inside the functions that use
+# them, so importing this module (e.g. for the CLI defaults) stays cheap
+
+# Defaults sized for the Mistral free tier and Yahoo's unofficial endpoints
+DEFAULT_CONCURRENCY = 4
+DEFAULT_LLM_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 180.0
+
+# Characters of the Wikipedia overview passed to the prose LLM
+OVERVIEW_CHARS = 1500
+
+
+def _company_overview(data) -> str:
+    """Wikipedia overview for the bundle's company, from the local store when cached."""
+    cached = cached_summary(data.ticker)
+    if cached:
+        return cached
+    try:
+        return get_company_summary(data.info.get("longName", data.ticker), ticker=data.ticker)
+    except Exception:
+        return ""
+
+
+def _fallback_summary(overview: str) -> str:
+    # First few sentences of the first Wikipedia page, without the "Page:/Summary:" headers
+    text = overview.split("Summary:", 1)[-1].split("\n\n", 1)[0].strip()
+    return " ".join(re.split(r"(?<=[.!?])\s+", text)[:3]).strip() or "No summary available."
+
+
+@traced("pipeline.stock")
+def run_stock_pipeline(
+    ticker: str, prose_llm, llm_slots: threading.Semaphore = None, indicators=None,
+) -> AnalysisRecord:
+    """
+    Compute-only stock analysis: market data and the Wikipedia lookup run in
+    parallel, then a single LLM call writes the summary and conclusion, which
+    are merged into the computed record. Numbers never go through the LLM.
+    `indicators` is the ticker's row of a precomputed indicator panel.
+    """
+    from langchain.messages import HumanMessage, SystemMessage
+
+    from .agents.stock_analyst_agent import PROSE_PROMPT
+    from .tools.report_writer_tools import extract_json_from_text
+    from .tools.stock_analyst_tools import build_stock_report
+    from .utils.sentiment import sentiment_for_ticker
+    from .utils.stock_utils import MarketData
+
+    annotate(ticker=ticker)
+    data = MarketData(ticker)
+    with span("pipeline.fetch", ticker=ticker), ThreadPoolExecutor(max_workers=2) as pool:
+        history = pool.submit(bind(lambda: data.history))
+        overview = pool.submit(bind(_company_overview), data)
+        history.result()
+        overview = overview.result()[:OVERVIEW_CHARS]
+
+    analysis = AnalysisRecord.from_dict(build_stock_report(ticker, data=data, indicators=indicators))
+
+    # Join in aggregated news sentiment when the news store has recent items
+    try:
+        analysis.news_sentiment = sentiment_for_ticker(ticker)
+    except Exception:
+        analysis.news_sentiment = None
+
+    messages = [
+        SystemMessage(content=PROSE_PROMPT),
+        HumanMessage(content=(
+            f"METRICS:\n{analysis.to_json()}\n\n"
+            f"WIKIPEDIA:\n{overview or 'Not available.'}"
+        )),
+    ]
+    try:
+        with span("pipeline.prose"), llm_slots or nullcontext():
+            response = prose_llm.invoke(messages)
+        with span("parse.json"):
+            prose = extract_json_from_text(response.content)
+    except Exception:
+        prose = {}
+
+    summary = prose.get("summary")
+    conclusion = prose.get("conclusion")
+    analysis.summary = summary if isinstance(summary, str) and summary else _fallback_summary(overview)
+    if isinstance(conclusion, str) and conclusion:
+        analysis.conclusion = conclusion
+    return analysis
+
+
+@traced("analyze_ticker")
+def analyze_ticker(
+    ticker: str,
+    stock_agent=None,
+    report: bool = False,
+    output_dir: str = "./reports",
+    llm_slots: threading.Semaphore = None,
+    prose_llm=None,
+    indicators=None,
+) -> dict:
+    """
+    Run the stock analysis (and optionally the PDF report) for one ticker.
+    With `prose_llm` the compute-only pipeline is used, otherwise the
+    tool-calling `stock_agent`. `llm_slots` bounds concurrent LLM calls.
+    `indicators` (a row of compute_indicator_panel) replaces the per-ticker
+    RSI, MACD and volatility computations in either mode.
+    """
+    from langchain.messages import HumanMessage
+
+    from .tools.report_writer_tools import build_report
+    from .tools.stock_analyst_tools import indicator_rows
+    from .utils.answer_utils import extract_final_answer
+
+    result = {"ticker": ticker.upper(), "status": "ok"}
+    annotate(ticker=result["ticker"], mode="pipeline" if prose_llm is not None else "agent")
+
+    if prose_llm is not None:
+        analysis = run_stock_pipeline(ticker, prose_llm, llm_slots, indicators)
+    else:
+        rows = {ticker: indicators} if indicators is not None else {}
+        with span("agent.stock"), llm_slots or nullcontext(), indicator_rows(rows):
+            analysis_response = stock_agent.invoke({
+                "messages": [HumanMessage(content=f"Analyze {ticker}")]
+            })
+        # The agent's answer is the only untyped input: validate it once here
+        try:
+            with span("parse.json"):
+                analysis = AnalysisRecord.from_json(extract_final_answer(analysis_response))
+        except (json.JSONDecodeError, ValueError):
+            result["status"] = "invalid_json"
+            return result
+
+    result["analysis"] = analysis
+    result["close"] = analysis.price.close
+    result["rsi_14d"] = analysis.momentum.rsi_14d
+
+    if report:
+        with span("report.build"):
+            report_result = build_report(analysis, output_dir=output_dir)
+        if report_result.get("success"):
+            result["pdf_path"] = report_result["pdf_path"]
+        else:
+            result["status"] = "report_failed"
+            result["error"] = report_result.get("error")
+
+    return result
+
+
+def record_analyses(analyses: list, db_path=None) -> int:
+    """
+    Persist AnalysisRecords (or agent text / JSON) to the decisions table in
+    one batch. Unparseable outputs are skipped; a failing store only warns.
+    """
+    from .utils.decision_store import record_decisions
+
+    records = []
+    for analysis in analyses:
+        if isinstance(analysis, str):
+            try:
+                analysis = AnalysisRecord.from_json(analysis)
+            except (json.JSONDecodeError, ValueError):
+                continue
+        records.append(analysis)
+    try:
+        return record_decisions(records, db_path=db_path)
+    except Exception as e:
+        print(f"[Warning] Could not record analyses: {e}")
+        return 0
+
+
+async def run_in_thread(timeout: float, fn, *args):
+    """
+    Run `fn(*args)` in its own daemon thread and raise asyncio.TimeoutError
+    once `timeout` has passed. A thread cannot be interrupted, so a timed-out
+    call is abandoned and the caller gets its slot back at the deadline; the
+    clients' request timeouts (see utils.clients) end the call eventually.
+    Unlike asyncio.to_thread, abandoned calls never hold executor threads or
+    delay the event loop's shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    call = bind(fn)  # spans opened by fn nest under the caller's
+
+    def settle(result, error):
+        if future.done():  # timed out (cancelled) meanwhile
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target():
+        try:
+            result, error = call(*args), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # the loop is closed: nobody is waiting for this result
+
+    threading.Thread(target=target, name=f"run_in_thread:{getattr(fn, '__name__', 'call')}", daemon=True).start()
+    return await asyncio.wait_for(future, timeout)
+
+
+async def run_batch(
+    tickers: list,
+    stock_agent=None,
+    report: bool = False,
+    output_dir: str = "./reports",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    prose_llm=None,
+    record: bool = True,
+) -> list:
+    """
+    Analyze `tickers` concurrently on a bounded thread pool.
+    Each ticker gets its own timeout; results come back in input order. A ticker
+    over its timeout is reported as "timeout" and its slot goes to the next one.
+    With `report`, the PDFs are then compiled as one batch (see build_reports).
+    With `record`, the analyses are stored in the decisions table in one batch.
+    """
+    from .tools.report_writer_tools import build_reports
+    from .utils import indicator_panel
+
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    workers = asyncio.Semaphore(concurrency)
+    llm_slots = threading.BoundedSemaphore(llm_concurrency)
+
+    # One batched download warms the OHLCV cache so the analyses only read
+    # local history, and the indicators of every ticker come out of one
+    # vectorised pass over the close panel instead of one pass per ticker
+    rows = {}
+    try:
+        panel = await asyncio.to_thread(indicator_panel.screen_tickers, tickers)
+        rows = {t: row for t, row in panel.iterrows() if row.notna().all()}
+    except Exception as e:
+        print(f"[Warning] Price prefetch failed: {e}")
+
+    async def run_one(ticker):
+        async with workers:
+            start = time.perf_counter()
+            try:
+                result = await run_in_thread(
+                    timeout,
+                    analyze_ticker,
+                    ticker,
+                    stock_agent,
+                    False,  # reports are compiled as one batch below
+                    output_dir,
+                    llm_slots,
+                    prose_llm,
+                    rows.get(ticker),
+                )
+            except asyncio.TimeoutError:
+                result = {"ticker": ticker, "status": "timeout"}
+            except Exception as e:
+                result = {"ticker": ticker, "status": "error", "error": str(e)}
+            result["seconds"] = round(time.perf_counter() - start, 2)
+            return result
+
+    results = await asyncio.gather(*(run_one(t) for t in tickers))
+    if record:
+        await asyncio.to_thread(record_analyses, [r["analysis"] for r in results if r["status"] == "ok"])
+
+    # Reports compile after the analyses, as parallel pdflatex runs
+    if report:
+        done = [r for r in results if r["status"] == "ok"]
+        reports = await asyncio.to_thread(
+            build_reports, [r["analysis"] for r in done], output_dir
+        )
+        for r, report_result in zip(done, reports):
+            if report_result.get("success"):
+                r["pdf_path"] = report_result["pdf_path"]
+            else:
+                r["status"] = "report_failed"
+                r["error"] = report_result.get("error")
+    return results
+
+
+def format_summary(results: list) -> str:
+    """Plain-text summary table of a batch run."""
+    def fmt(val, spec):
+        return format(val, spec) if isinstance(val, (int, float)) else "-"
+
+    lines = [
+        f"{'TICKER':<10} {'STATUS':<14} {'CLOSE':>10} {'RSI':>7} {'SECONDS':>8}  DETAILS",
+        "-" * 72,
+    ]
+    for r in results:
+        details = r.get("pdf_path") or r.get("error") or ""
+        lines.append(
+            f"{r['ticker']:<10} {r['status']:<14} {fmt(r.get('close'), '10.2f'):>10} "
+            f"{fmt(r.get('rsi_14d'), '7.2f'):>7} {fmt(r.get('seconds'), '8.2f'):>8}  {details}"
+        )
+    ok = sum(r["status"] == "ok" for r in results)
+    lines.append("-" * 72)
+    lines.append(f"{ok}/{len(results)} succeeded")
+    return "\n".join(lines)
@@ -0,0 +1,441 @@
+import asyncio
+import itertools
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from aiohttp import web
+
+from .pipeline import DEFAULT_LLM_CONCURRENCY, DEFAULT_TIMEOUT, analyze_ticker, record_analyses, run_in_thread
+from .utils.tracing import span
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4  # jobs running at once
+DEFAULT_QUEUE_SIZE = 32  # jobs waiting; further submissions get a 429
+DEFAULT_DRAIN_TIMEOUT = 60.0  # seconds given to queued and running jobs on shutdown
+MAX_JOBS = 1000  # finished jobs kept for polling
+MAX_WAIT = 60.0  # longest ?wait= a client may hold a connection
+MAX_SCREEN_TICKERS = 500  # tickers per /screen/tickers request
+
+_seq = itertools.count(1)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """One queued analysis or report. `result` is JSON-ready once the job is done."""
+
+    __slots__ = ("id", "kind", "key", "params", "status", "result", "error", "pdf_path",
+                 "created", "started", "finished", "done")
+
+    def __init__(self, kind: str, key: tuple, params: dict):
+        self.id = f"{next(_seq)}-{uuid.uuid4().hex[:8]}"
+        self.kind = kind
+        self.key = key
+        self.params = params
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.pdf_path = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": {k: v for k, v in self.params.items() if k != "analysis"},
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.finished and self.started:
+            data["seconds"] = round(self.finished - self.started, 2)
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error:
+            data["error"] = self.error
+        if self.pdf_path:
+            data["pdf_url"] = f"/jobs/{self.id}/pdf"
+        return data
+
+
+class JobQueue:
+    """
+    Bounded queue of jobs served by `workers` tasks on the event loop. The
+    blocking analysis and LaTeX work runs in threads, sharing the process-wide
+    price and Wikipedia caches, provider clients and `llm_slots`. Identical
+    jobs already queued or running are joined instead of submitted twice.
+    """
+
+    def __init__(
+        self,
+        mode: str = "pipeline",
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        output_dir: str = "./reports",
+    ):
+        self.mode = mode
+        self.workers = workers
+        self.timeout = timeout
+        self.output_dir = output_dir
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.llm_slots = threading.BoundedSemaphore(llm_concurrency)
+        self.jobs = OrderedDict()
+        self.inflight = {}
+        self.accepting = True
+        self.running = 0
+        self.completed = 0
+        self.mean_seconds = None  # moving average of job durations, for Retry-After
+        self._tasks = []
+        self._llms = {}
+        self._llm_lock = threading.Lock()
+
+    # ---- Lifecycle ----
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT):
+        """Stop accepting jobs, let the queued and running ones finish, then stop the workers."""
+        self.accepting = False
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            print(f"[Warning] {self.queue.qsize() + self.running} jobs unfinished after {drain_timeout:.0f}s")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self.queue.empty():
+            self._finish(self.queue.get_nowait(), "cancelled", error="Server shutting down")
+
+    # ---- Submission ----
+
+    def submit(self, kind: str, params: dict, key: tuple = None) -> Job:
+        """Queue a job (or return the identical one in flight). Raises QueueFull when saturated."""
+        key = key or (kind, uuid.uuid4().hex)
+        if key in self.inflight:
+            return self.inflight[key]
+        job = Job(kind, key, params)
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull()
+        self.inflight[key] = job
+        self.jobs[job.id] = job
+        self._evict()
+        return job
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up (one job finishing on any worker)."""
+        return max(1, math.ceil((self.mean_seconds or 10.0) / self.workers))
+
+    def _evict(self):
+        # Oldest finished jobs go first; unfinished ones are never dropped
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= MAX_JOBS:
+                break
+            if self.jobs[job_id].finished:
+                del self.jobs[job_id]
+
+    # ---- Workers ----
+
+    def _llm(self, kind: str):
+        # Built once on first use and shared by every worker thread
+        with self._llm_lock:
+            if kind not in self._llms:
+                from .agents.stock_analyst_agent import build_agent, build_prose_llm
+                self._llms[kind] = build_prose_llm() if kind == "prose" else build_agent()
+            return self._llms[kind]
+
+    def _analyze(self, ticker: str, report: bool) -> dict:
+        if self.mode == "pipeline":
+            stock_agent, prose_llm = None, self._llm("prose")
+        else:
+            stock_agent, prose_llm = self._llm("agent"), None
+        result = analyze_ticker(ticker, stock_agent, report, self.output_dir, self.llm_slots, prose_llm)
+        if result.get("analysis") is not None:
+            record_analyses([result["analysis"]])
+        return result
+
+    def _report(self, analysis: dict) -> dict:
+        from .tools.report_writer_tools import build_report
+
+        with span("report.build"):
+            return build_report(analysis, output_dir=self.output_dir)
+
+    def _run(self, job: Job) -> dict:
+        with span("request", job=job.kind, ticker=job.params.get("ticker")):
+            if job.kind == "analyze":
+                return self._analyze(job.params["ticker"], job.params["report"])
+            return self._report(job.params["analysis"])
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            job.started = time.time()
+            self.running += 1
+            try:
+                # A job over its timeout is abandoned: the worker moves on at the deadline
+                result = await run_in_thread(self.timeout, self._run, job)
+            except asyncio.TimeoutError:
+                self._finish(job, "timeout", error=f"Job exceeded {self.timeout:.0f}s")
+            except asyncio.CancelledError:
+                self._finish(job, "cancelled", error="Server shutting down")
+                raise
+            except Exception as e:
+                self._finish(job, "error", error=str(e))
+            else:
+                self._complete(job, result)
+            finally:
+                self.running -= 1
+                self.queue.task_done()
+
+    def _complete(self, job: Job, result: dict):
+        if job.kind == "report":
+            if result.get("success"):
+                job.pdf_path = result["pdf_path"]
+                job.result = {"pdf_path": result["pdf_path"], "size_kb": result.get("size_kb")}
+                self._finish(job, "done")
+            else:
+                self._finish(job, "report_failed", error=result.get("error"))
+            return
+        analysis = result.get("analysis")
+        job.result = analysis.to_dict() if analysis is not None else None
+        job.pdf_path = result.get("pdf_path")
+        if result["status"] == "ok":
+            self._finish(job, "done")
+        else:
+            self._finish(job, result["status"], error=result.get("error"))
+
+    def _finish(self, job: Job, status: str, error: str = None):
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        if job.started:
+            seconds = job.finished - job.started
+            self.mean_seconds = seconds if self.mean_seconds is None else 0.8 * self.mean_seconds + 0.2 * seconds
+        self.completed += 1
+        self.inflight.pop(job.key, None)
+        job.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "accepting": self.accepting,
+            "mode": self.mode,
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "completed": self.completed,
+            "mean_job_seconds": round(self.mean_seconds, 2) if self.mean_seconds is not None else None,
+        }
+
+
+# ---- Handlers ----
+
+QUEUE_KEY = web.AppKey("queue", JobQueue)
+
+
+def _error(status: int, message: str, headers: dict = None):
+    return web.json_response({"error": message}, status=status, headers=headers)
+
+
+async def _body(request: web.Request) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text='{"error": "Body must be JSON"}', content_type="application/json")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text='{"error": "Body must be a JSON object"}', content_type="application/json")
+    return body
+
+
+def _ticker(value) -> str:
+    ticker = str(value or "").strip().upper()
+    if not ticker or len(ticker) > 15 or not all(c.isalnum() or c in ".-^=" for c in ticker):
+        raise web.HTTPBadRequest(text='{"error": "Missing or invalid ticker"}', content_type="application/json")
+    return ticker
+
+
+async def _submit(request: web.Request, kind: str, params: dict, key: tuple = None):
+    """Queue a job and answer 202 with its status URL (or its state, if it finishes within ?wait=)."""
+    queue = request.app[QUEUE_KEY]
+    # Validate everything before queueing: a rejected request must not leave a job behind
+    try:
+        wait = float(request.query.get("wait", 0))
+    except ValueError:
+        wait = -1.0
+    if not wait >= 0:  # also rejects NaN
+        return _error(400, "wait must be a number of seconds")
+    wait = min(wait, MAX_WAIT)
+    if not queue.accepting:
+        return _error(503, "Server is shutting down", {"Retry-After": "30"})
+    try:
+        job = queue.submit(kind, params, key)
+    except QueueFull:
+        return _error(429, "Job queue is full, retry later", {"Retry-After": str(queue.retry_after())})
+
+    if wait > 0:
+        try:
+            await asyncio.wait_for(asyncio.shield(job.done.wait()), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    if job.finished:
+        return web.json_response(job.to_dict())
+    return web.json_response(job.to_dict(), status=202, headers={"Location": f"/jobs/{job.id}"})
+
+
+async def analyze(request: web.Request):
+    """POST /analyze {"ticker": "AAPL", "report": false}"""
+    body = await _body(request)
+    ticker = _ticker(body.get("ticker"))
+    with_report = bool(body.get("report", False))
+    params = {"ticker": ticker, "report": with_report}
+    return await _submit(request, "analyze", params, ("analyze", ticker, with_report))
+
+
+async def report(request: web.Request):
+    """POST /report {"ticker": "AAPL"} (analysis and PDF) or {"analysis": {...}} (PDF only)"""
+    body = await _body(request)
+    if "analysis" in body:
+        from .utils.analysis_record import AnalysisRecord
+
+        try:
+            record = AnalysisRecord.from_dict(body["analysis"])
+        except ValueError as e:
+            return _error(400, f"Invalid analysis: {e}")
+        if not record.has_metrics():
+            return _error(400, "Invalid analysis: no price or momentum metrics")
+        return await _submit(request, "report", {"ticker": record.ticker, "analysis": record.to_dict()})
+    ticker = _ticker(body.get("ticker"))
+    return await _submit(request, "analyze", {"ticker": ticker, "report": True}, ("analyze", ticker, True))
+
+
+def _job(request: web.Request) -> Job:
+    job = request.app[QUEUE_KEY].jobs.get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(text='{"error": "Unknown job"}', content_type="application/json")
+    return job
+
+
+async def job_status(request: web.Request):
+    """GET /jobs/{job_id}"""
+    return web.json_response(_job(request).to_dict())
+
+
+async def job_pdf(request: web.Request):
+    """GET /jobs/{job_id}/pdf"""
+    job = _job(request)
+    if not job.pdf_path or not Path(job.pdf_path).exists():
+        return _error(404, "No report for this job" if job.finished else "Report not ready")
+    return web.FileResponse(job.pdf_path, headers={"Content-Type": "application/pdf"})
+
+
+async def screen(request: web.Request):
+    """GET /screen?column=rsi_14d&op=>&value=70[&day=2025-01-31] over today's stored analyses"""
+    from .utils.decision_store import screen_decisions
+
+    try:
+        value = float(request.query["value"])
+        rows = await asyncio.to_thread(
+            screen_decisions,
+            request.query.get("column", "rsi_14d"),
+            request.query.get("op", ">"),
+            value,
+            request.query.get("day"),
+        )
+    except KeyError:
+        return _error(400, "value is required")
+    except ValueError as e:
+        return _error(400, str(e))
+    return web.json_response({"count": len(rows), "results": rows})
+
+
+async def screen_ticker_list(request: web.Request):
+    """GET /screen/tickers?tickers=AAPL,MSFT[&column=rsi_14d&op=>&value=70] computed from cached prices"""
+    from .utils.indicator_panel import screen_tickers
+
+    tickers = list(dict.fromkeys(_ticker(t) for t in request.query.get("tickers", "").split(",") if t.strip()))
+    if not tickers or len(tickers) > MAX_SCREEN_TICKERS:
+        return _error(400, f"tickers must list 1 to {MAX_SCREEN_TICKERS} symbols")
+    try:
+        value = float(request.query["value"]) if "value" in request.query else None
+        table = await asyncio.to_thread(
+            screen_tickers,
+            tickers,
+            column=request.query.get("column", "rsi_14d") if value is not None else None,
+            op=request.query.get("op", ">"),
+            value=value,
+        )
+    except ValueError as e:
+        return _error(400, str(e))
+    # NaN (not enough history) is not valid JSON
+    rows = [
+        {"ticker": ticker, **{k: (None if v != v else float(v)) for k, v in row.items()}}
+        for ticker, row in table.iterrows()
+    ]
+    return web.json_response({"count": len(rows), "results": rows})
+
+
+async def health(request: web.Request):
+    """GET /health"""
+    queue = request.app[QUEUE_KEY]
+    return web.json_response(queue.stats(), status=200 if queue.accepting else 503)
+
+
+# ---- App ----
+
+def create_app(queue: JobQueue = None, drain_timeout: float = DEFAULT_DRAIN_TIMEOUT) -> web.Application:
+    app = web.Application()
+    app[QUEUE_KEY] = queue or JobQueue()
+
+    async def lifecycle(app):
+        app[QUEUE_KEY].start()
+        yield
+        await app[QUEUE_KEY].close(drain_timeout)  # no-op when on_shutdown already drained it
+
+    async def drain(app):
+        # Runs once the server stops listening; requests on open connections get a 503
+        queue = app[QUEUE_KEY]
+        print(f"[System] Draining {queue.queue.qsize() + queue.running} jobs...")
+        await queue.close(drain_timeout)
+
+    app.cleanup_ctx.append(lifecycle)
+    app.on_shutdown.append(drain)
+    app.add_routes([
+        web.post("/analyze", analyze),
+        web.post("/report", report),
+        web.get("/jobs/{job_id}", job_status),
+        web.get("/jobs/{job_id}/pdf", job_pdf),
+        web.get("/screen", screen),
+        web.get("/screen/tickers", screen_ticker_list),
+        web.get("/health", health),
+    ])
+    return app
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    **queue_options,
+):
+    """Run the HTTP API until SIGINT/SIGTERM, then drain the queue before exiting."""
+    app = create_app(JobQueue(**queue_options), drain_timeout)
+    web.run_app(app, host=host, port=port, shutdown_timeout=drain_timeout, print=lambda msg: print(f"[System] {msg}"))
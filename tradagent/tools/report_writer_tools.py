@@ -1,8 +1,17 @@
+import hashlib
+import os
 import subprocess
 import json
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from langchain.tools import tool
 
+from ..utils.analysis_record import AnalysisRecord
+from ..utils.tracing import bind, span, traced
+
 def extract_json_from_text(text: str) -> dict:
     """
     Extract JSON from text that may contain additional content.
@@ -73,92 +82,235 @@ def format_market_cap(market_cap):
     return str(market_cap)
 
 
-@tool
-def generate_report_from_analysis(
-    analysis_json: str,
-    filename: str = None,
-    output_dir: str = "./reports",
-) -> dict:
+# Precompiled preamble formats live here (built once with `pdflatex -ini`)
+LATEX_CACHE_DIR = Path(
+    os.environ.get("TRADAGENT_LATEX_CACHE", Path.home() / ".cache" / "tradagent" / "latex")
+)
+
+# Static part of every report preamble, dumped once into a pdflatex format file.
+# hyperref is loaded per document: it hooks \begin{document} and is unsafe to dump.
+STATIC_PREAMBLE = r"""\documentclass[11pt,a4paper]{article}
+
+% ---------- Packages ----------
+\usepackage[utf8]{inputenc}
+\usepackage[T1]{fontenc}
+\usepackage{lmodern}
+\usepackage{geometry}
+\usepackage{amsmath}
+\usepackage{booktabs}
+\usepackage{fancyhdr}
+\usepackage{setspace}
+\usepackage{placeins}
+\usepackage{graphicx}
+\usepackage{enumitem}
+"""
+
+# .aux entries that mean a second pass can change the output
+_CROSSREF_MARKERS = ("\\newlabel", "\\@writefile", "\\bibcite")
+_MAX_PASSES = 3
+
+_format_lock = threading.Lock()
+_format_names = {}
+
+
+def _format_name() -> str:
+    digest = hashlib.sha1(STATIC_PREAMBLE.encode("utf-8")).hexdigest()[:12]
+    return f"tradagent_{digest}"
+
+
+def _build_format(name: str):
+    """Dump STATIC_PREAMBLE into LATEX_CACHE_DIR/<name>.fmt (atomic, safe across processes)."""
+    LATEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=LATEX_CACHE_DIR) as tmp:
+        source = Path(tmp) / f"{name}.tex"
+        source.write_text(STATIC_PREAMBLE + "\n\\dump\n", encoding="utf-8")
+        try:
+            subprocess.run(
+                [
+                    "pdflatex",
+                    "-ini",
+                    f"-jobname={name}",
+                    "-interaction=nonstopmode",
+                    "-output-directory",
+                    tmp,
+                    "&pdflatex",
+                    str(source),
+                ],
+                capture_output=True,
+                timeout=120,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return
+        built = Path(tmp) / f"{name}.fmt"
+        if built.exists():
+            os.replace(built, LATEX_CACHE_DIR / f"{name}.fmt")
+
+
+def get_preamble_format():
+    """Name of the precompiled preamble format, built on first use; None if unavailable."""
+    name = _format_name()
+    with _format_lock:
+        if name not in _format_names:
+            if not (LATEX_CACHE_DIR / f"{name}.fmt").exists():
+                _build_format(name)
+            _format_names[name] = name if (LATEX_CACHE_DIR / f"{name}.fmt").exists() else None
+        return _format_names[name]
+
+
+def _discard_format(name: str):
+    # A format dumped by another TeX version cannot be loaded: rebuild next time
+    with _format_lock:
+        _format_names.pop(name, None)
+        (LATEX_CACHE_DIR / f"{name}.fmt").unlink(missing_ok=True)
+
+
+def _needs_rerun(aux_before: str, aux_after: str, log: str) -> bool:
+    """Only rerun pdflatex when the .aux says cross-references changed."""
+    if "Rerun to get" in log or "Label(s) may have changed" in log:
+        return True
+    return aux_after != aux_before and any(m in aux_after for m in _CROSSREF_MARKERS)
+
+
+@traced("latex.pdflatex")
+def _run_pdflatex(tex_file: Path, output_path: Path, fmt: str = None):
+    cmd = ["pdflatex", "-interaction=nonstopmode"]
+    env = None
+    if fmt:
+        cmd.append(f"-fmt={fmt}")
+        env = {**os.environ, "TEXFORMATS": f"{LATEX_CACHE_DIR}{os.pathsep}"}
+    cmd += ["-output-directory", str(output_path), str(tex_file)]
+    return subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace',  # Replace invalid UTF-8 sequences
+        timeout=60,
+        env=env,
+    )
+
+
+def _compile_passes(tex_file: Path, output_path: Path, fmt: str = None):
+    """Run pdflatex once, then again only while cross-references are unsettled."""
+    aux_file = tex_file.with_suffix(".aux")
+    last = None
+    for _ in range(_MAX_PASSES):
+        aux_before = aux_file.read_text(errors="replace") if aux_file.exists() else ""
+        last = _run_pdflatex(tex_file, output_path, fmt)
+        aux_after = aux_file.read_text(errors="replace") if aux_file.exists() else ""
+        if not _needs_rerun(aux_before, aux_after, last.stdout or ""):
+            break
+    return last
+
+
+def _publish(built_pdf: Path, pdf_file: Path):
+    """Move a finished PDF into place atomically (readers never see a partial file)."""
+    staging = pdf_file.with_name(f".{pdf_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copyfile(built_pdf, staging)
+    os.replace(staging, pdf_file)
+
+
+@traced("latex.compile")
+def compile_latex(document: str, filename: str, output_path: Path) -> dict:
     """
-    Generate a professional PDF report from a stock analysis dictionary.
-    
-    Args:
-        analysis_json: JSON string containing the complete stock analysis with keys:
-                      ticker, company_name, summary, current_price, market_cap, volume,
-                      volatility, momentum, valuation, conclusion
-        filename: Optional base filename (default: {ticker}_report)
-        output_dir: Output directory for the PDF (default: ./reports)
-    
-    Returns:
-        dict with {success, pdf_path | error, size_kb?}
+    Compile a document (everything after STATIC_PREAMBLE) to `output_path/filename.pdf`.
+
+    Each build runs in its own temporary directory, so concurrent builds never
+    share .aux/.log files, and only the finished PDF is moved into `output_path`.
+    Uses the precompiled preamble format when available, else the full preamble.
     """
-    try:
-        # Extract and parse the analysis JSON (handles text around JSON)
-        analysis = extract_json_from_text(analysis_json)
-    except json.JSONDecodeError as e:
-        return {
-            "success": False, 
-            "error": f"Invalid JSON format: {str(e)}",
-            "received_text": analysis_json[:500]  # Show first 500 chars for debugging
-        }
-
-    ticker = analysis.get("ticker", "UNKNOWN")
-    company_name = analysis.get("company_name", ticker)
-    summary = analysis.get("summary", "No summary available.")
-    
-    # Extract price data
-    price_data = analysis.get("price", {})
-    if isinstance(price_data, dict):
-        current_price = price_data.get("close", 0.0)
-    else:
-        current_price = analysis.get("current_price", 0.0)
-    
-    market_cap = analysis.get("market_cap", "N/A")
-    
-    # Extract volatility
-    volatility = analysis.get("volatility", {})
-    vol_30d = volatility.get("vol_30d", 0.0)
-    vol_90d = volatility.get("vol_90d", 0.0)
-    vol_1y = volatility.get("vol_1y", 0.0)
-    
-    # Extract momentum
-    momentum = analysis.get("momentum", {})
-    rsi = momentum.get("rsi_14d", 0.0)
-    
-    # Determine RSI interpretation
-    if rsi < 30:
+    output_path.mkdir(parents=True, exist_ok=True)
+    pdf_file = output_path / f"{filename}.pdf"
+    fmt = get_preamble_format()
+
+    with tempfile.TemporaryDirectory(prefix=f"{filename}_") as build_dir:
+        build_path = Path(build_dir)
+        tex_file = build_path / f"{filename}.tex"
+        built_pdf = build_path / f"{filename}.pdf"
+
+        try:
+            tex_file.write_text(document if fmt else STATIC_PREAMBLE + document, encoding="utf-8")
+            last = _compile_passes(tex_file, build_path, fmt)
+
+            if fmt and not built_pdf.exists():
+                # Stale or incompatible format: fall back to a plain compile
+                _discard_format(fmt)
+                tex_file.write_text(STATIC_PREAMBLE + document, encoding="utf-8")
+                last = _compile_passes(tex_file, build_path)
+
+            if built_pdf.exists():
+                _publish(built_pdf, pdf_file)
+                return {
+                    "success": True,
+                    "pdf_path": str(pdf_file),
+                    "size_kb": round(pdf_file.stat().st_size / 1024, 2),
+                    "message": f"PDF compiled successfully: {pdf_file}",
+                }
+
+            return {
+                "success": False,
+                "error": "PDF file was not created",
+                "log": (last.stderr if last else ""),
+            }
+
+        except subprocess.TimeoutExpired:
+            return {"success": False, "error": "LaTeX compilation timed out (>60s)"}
+        except FileNotFoundError:
+            return {
+                "success": False,
+                "error": "pdflatex not found. Install TeX Live (e.g., texlive-latex-base texlive-latex-extra)",
+            }
+        except Exception as e:
+            return {"success": False, "error": f"Compilation error: {e}"}
+
+
+@traced("latex.render")
+def render_analysis_document(analysis) -> str:
+    """Render an AnalysisRecord (or analysis dict) into the report document (everything after STATIC_PREAMBLE)."""
+    if not isinstance(analysis, AnalysisRecord):
+        analysis = AnalysisRecord.from_dict(analysis)
+
+    ticker = analysis.ticker
+    company_name = analysis.company_name or ticker
+    summary = analysis.summary or "No summary available."
+    current_price = analysis.price.close
+
+    vol_30d = analysis.volatility.vol_30d
+    vol_90d = analysis.volatility.vol_90d
+    vol_1y = analysis.volatility.vol_1y
+
+    rsi = analysis.momentum.rsi_14d
+
+    # Determine RSI interpretation (missing values are reported as such, not as 0)
+    if rsi is None:
+        rsi_interp = "not available"
+    elif rsi < 30:
         rsi_interp = "Oversold"
     elif rsi > 70:
         rsi_interp = "Overbought"
     else:
         rsi_interp = "Neutral"
-    
-    # Handle MACD - can be a dict or flat values
-    macd_data = momentum.get("macd", {})
-    if isinstance(macd_data, dict):
-        macd = macd_data.get("macd", 0.0)
-        signal = macd_data.get("signal", 0.0)
-        histogram = macd_data.get("histogram", 0.0)
-    else:
-        macd = momentum.get("macd", 0.0)
-        signal = momentum.get("signal", 0.0)
-        histogram = momentum.get("histogram", 0.0)
-    
+
+    macd = analysis.momentum.macd.macd
+    signal = analysis.momentum.macd.signal
+    histogram = analysis.momentum.macd.histogram
+
     # Determine momentum bias
-    if histogram > 0 and rsi > 50:
+    if histogram is None or rsi is None:
+        momentum_bias = "undetermined trend"
+    elif histogram > 0 and rsi > 50:
         momentum_bias = "bullish short-term trend"
     elif histogram < 0 and rsi < 50:
         momentum_bias = "bearish short-term trend"
     else:
         momentum_bias = "neutral trend"
-    
-    # Extract valuation
-    valuation = analysis.get("valuation", {})
-    eps_trailing = valuation.get("eps_trailing", "N/A")
-    eps_forward = valuation.get("eps_forward", "N/A")
-    pe_trailing = valuation.get("pe_trailing", "N/A")
-    pe_forward = valuation.get("pe_forward", "N/A")
-    price_to_sales = valuation.get("price_to_sales", "N/A")
+
+    valuation = analysis.valuation
+    eps_trailing = valuation.eps_trailing
+    eps_forward = valuation.eps_forward
+    pe_trailing = valuation.pe_trailing
+    pe_forward = valuation.pe_forward
+    price_to_sales = valuation.price_to_sales
     
     # Format numeric values for LaTeX
     def fmt_val(val):
@@ -174,13 +326,27 @@ def generate_report_from_analysis(
         if isinstance(val, (int, float)):
             return f"\\${val:.2f}"
         return str(val)
+
+    def fmt_pct(val):
+        return "N/A" if val is None else f"{val*100:.2f}\\%"
     
+    if rsi is None:
+        rsi_outlook = ""
+    else:
+        rsi_outlook = (
+            f', with {"oversold" if rsi < 30 else "overbought" if rsi > 70 else "neutral"} conditions potentially '
+            f'signaling a technical {"rebound" if rsi < 30 else "correction" if rsi > 70 else "consolidation"}'
+        )
+
     # Generate conclusion dynamically
-    conclusion = analysis.get("conclusion", None)
+    conclusion = analysis.conclusion
     if not conclusion:
         # Build conclusion based on data
         valuation_level = "valuation premium" if isinstance(pe_trailing, (int, float)) and pe_trailing > 25 else "fair valuation"
-        momentum_desc = "negative momentum" if histogram < 0 else "positive momentum"
+        if histogram is None:
+            momentum_desc = "unclear momentum"
+        else:
+            momentum_desc = "negative momentum" if histogram < 0 else "positive momentum"
         
         conclusion = (
             f"{company_name} remains a structurally strong company with a dominant market position "
@@ -202,9 +368,9 @@ def generate_report_from_analysis(
 \\textbf{{Metric}} & \\textbf{{Value}} \\\\
 \\midrule
 Current Stock Price & {fmt_price(current_price)} \\\\
-30-day Volatility & {vol_30d*100:.2f}\\% \\\\
-90-day Volatility & {vol_90d*100:.2f}\\% \\\\
-1-year Volatility & {vol_1y*100:.2f}\\% \\\\
+30-day Volatility & {fmt_pct(vol_30d)} \\\\
+90-day Volatility & {fmt_pct(vol_90d)} \\\\
+1-year Volatility & {fmt_pct(vol_1y)} \\\\
 \\bottomrule
 \\end{{tabular}}
 \\end{{table}}
@@ -217,15 +383,15 @@ Current Stock Price & {fmt_price(current_price)} \\\\
 \\toprule
 \\textbf{{Indicator}} & \\textbf{{Value}} \\\\
 \\midrule
-RSI (14-day) & {rsi:.2f} ({rsi_interp}) \\\\
-MACD Line & {macd:.2f} \\\\
-Signal Line & {signal:.2f} \\\\
-MACD Histogram & {histogram:.2f} \\\\
+RSI (14-day) & {fmt_val(rsi)} ({rsi_interp}) \\\\
+MACD Line & {fmt_val(macd)} \\\\
+Signal Line & {fmt_val(signal)} \\\\
+MACD Histogram & {fmt_val(histogram)} \\\\
 \\bottomrule
 \\end{{tabular}}
 \\end{{table}}
 
-Momentum indicators suggest a \\textbf{{{momentum_bias}}}, with {"oversold" if rsi < 30 else "overbought" if rsi > 70 else "neutral"} conditions potentially signaling a technical {"rebound" if rsi < 30 else "correction" if rsi > 70 else "consolidation"}.
+Momentum indicators suggest a \\textbf{{{momentum_bias}}}{rsi_outlook}.
 
 \\section*{{Valuation Metrics}}
 
@@ -247,27 +413,9 @@ Price-to-Sales & {fmt_val(price_to_sales)} \\\\
 \\section*{{Conclusion}}
 {conclusion}"""
     
-    # Use ticker as filename if not provided
-    if filename is None:
-        filename = f"{ticker}_report"
-    
-    # Create output directory
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    
-    # Build full LaTeX document (format exact de l'exemple)
-    full_latex = f"""\\documentclass[11pt,a4paper]{{article}}
-
-% ---------- Packages ----------
-\\usepackage[utf8]{{inputenc}}
-\\usepackage[T1]{{fontenc}}
-\\usepackage{{lmodern}}
-\\usepackage{{geometry}}
-\\usepackage{{amsmath}}
-\\usepackage{{booktabs}}
+    # Document after the static preamble (format exact de l'exemple)
+    document = f"""
 \\usepackage{{hyperref}}
-\\usepackage{{fancyhdr}}
-\\usepackage{{setspace}}
 
 % ---------- Layout ----------
 \\geometry{{
@@ -302,64 +450,87 @@ Price-to-Sales & {fmt_val(price_to_sales)} \\\\
 
 \\end{{document}}
 """
-    
-    # Write .tex file
-    tex_file = output_path / f"{filename}.tex"
-    tex_file.write_text(full_latex, encoding="utf-8")
-    
-    pdf_file = output_path / f"{filename}.pdf"
-    
-    try:
-        # Compile LaTeX to PDF (run twice for proper formatting)
-        last = None
-        for _ in range(2):
-            last = subprocess.run(
-                [
-                    "pdflatex",
-                    "-interaction=nonstopmode",
-                    "-output-directory",
-                    str(output_path),
-                    str(tex_file),
-                ],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',  # Replace invalid UTF-8 sequences
-                timeout=60,
-            )
-        
-        if pdf_file.exists():
-            # Clean auxiliary files AND the source .tex file
-            for ext in (".aux", ".log", ".out", ".toc", ".tex"):
-                aux = output_path / f"{filename}{ext}"
-                if aux.exists():
-                    try:
-                        aux.unlink()
-                    except Exception:
-                        pass
-            
+
+    return document
+
+
+def build_report(analysis, filename: str = None, output_dir: str = "./reports") -> dict:
+    """
+    Render and compile one report from an AnalysisRecord, an analysis dict or
+    JSON text. Thread-safe, so build_reports can run it on a thread pool.
+    """
+    if isinstance(analysis, str):
+        try:
+            # Validate once at the text boundary (handles text around JSON)
+            analysis = AnalysisRecord.from_json(analysis)
+        except (json.JSONDecodeError, ValueError) as e:
             return {
-                "success": True,
-                "pdf_path": str(pdf_file),
-                "size_kb": round(pdf_file.stat().st_size / 1024, 2),
-                "message": f"PDF compiled successfully: {pdf_file}",
+                "success": False,
+                "error": f"Invalid JSON format: {str(e)}",
+                "received_text": analysis[:500]  # Show first 500 chars for debugging
             }
-        
-        return {
-            "success": False,
-            "error": "PDF file was not created",
-            "log": (last.stderr if last else ""),
-        }
+
+    elif not isinstance(analysis, AnalysisRecord):
+        try:
+            analysis = AnalysisRecord.from_dict(analysis)
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid analysis: {str(e)}"}
+
+    # Use ticker as filename if not provided
+    if filename is None:
+        filename = f"{analysis.ticker}_report"
+
+    return compile_latex(render_analysis_document(analysis), filename, Path(output_dir))
+
+
+def build_reports(analyses: list, output_dir: str = "./reports", max_workers: int = None) -> list:
+    """
+    Batch API: compile many reports in parallel, sized to the cores. Each report
+    is a pdflatex subprocess, so threads are enough to run them side by side
+    (and avoid forking the multithreaded batch runner or server).
+    Takes AnalysisRecords (or dicts / JSON strings) and returns one result dict per analysis, in order.
+    """
+    if not analyses:
+        return []
+
+    # Build the preamble format once up front instead of racing in every worker
+    get_preamble_format()
+
+    workers = min(max_workers or os.cpu_count() or 1, len(analyses))
+    if workers == 1:
+        return [build_report(a, output_dir=output_dir) for a in analyses]
+
+    with span("latex.compile_batch", reports=len(analyses), workers=workers), ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(bind(build_report), a, None, output_dir) for a in analyses]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"success": False, "error": f"Report worker failed: {e}"})
+        return results
+
+
+@tool
+def generate_report_from_analysis(
+    analysis_json: str,
+    filename: str = None,
+    output_dir: str = "./reports",
+) -> dict:
+    """
+    Generate a professional PDF report from a stock analysis dictionary.
+    
+    Args:
+        analysis_json: JSON string containing the complete stock analysis with keys:
+                      ticker, company_name, summary, current_price, market_cap, volume,
+                      volatility, momentum, valuation, conclusion
+        filename: Optional base filename (default: {ticker}_report)
+        output_dir: Output directory for the PDF (default: ./reports)
     
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "LaTeX compilation timed out (>60s)"}
-    except FileNotFoundError:
-        return {
-            "success": False,
-            "error": "pdflatex not found. Install TeX Live (e.g., texlive-latex-base texlive-latex-extra)",
-        }
-    except Exception as e:
-        return {"success": False, "error": f"Compilation error: {e}"}
+    Returns:
+        dict with {success, pdf_path | error, size_kb?}
+    """
+    return build_report(analysis_json, filename, output_dir)
 
 
 @tool
@@ -374,94 +545,26 @@ def generate_pdf_report(
     Args:
         latex_code: The BODY of the LaTeX (no preamble, no \\begin{document}).
         filename: Base filename without extension (e.g., "AAPL_report").
-        output_dir: Output directory for .tex and .pdf (default: ./reports).
+        output_dir: Output directory for the PDF (default: ./reports).
 
     Returns:
         dict with {success, pdf_path | error, log?, size_kb?}.
     """
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-
     safe_title = "Financial Report"
     safe_author = "TRADAgent"
 
-    full_latex = (
-        "\\documentclass[11pt,a4paper]{article}\\n"
-        "\\usepackage[utf8]{inputenc}\\n"
-        "\\usepackage[T1]{fontenc}\\n"
-        "\\usepackage{lmodern}\\n"
-        "\\usepackage{geometry}\\n"
-        "\\usepackage{amsmath}\\n"
-        "\\usepackage{booktabs}\\n"
-        "\\usepackage{hyperref}\\n"
-        "\\usepackage{placeins}\\n"
-        "\\usepackage{graphicx}\\n"
-        "\\usepackage{fancyhdr}\\n"
-        "\\usepackage{enumitem}\\n\\n"
-        "\\geometry{left=25mm,right=25mm,top=28mm,bottom=30mm}\\n\\n"
-        "\\pagestyle{fancy}\\fancyhf{}\\rhead{\\thepage}\\lhead{" + safe_title + "}\\renewcommand{\\headrulewidth}{0.4pt}\\n\\n"
-        "\\title{" + safe_title + "}\\n\\author{" + safe_author + "}\\n\\date{\\today}\\n\\n"
-        "\\begin{document}\\n\\n"
-        "\\maketitle\\n"
-        + latex_code + "\\n\\n"
-        "\\end{document}\\n"
+    document = (
+        "\n\\usepackage{hyperref}\n\n"
+        "\\geometry{left=25mm,right=25mm,top=28mm,bottom=30mm}\n\n"
+        "\\pagestyle{fancy}\\fancyhf{}\\rhead{\\thepage}\\lhead{" + safe_title + "}\\renewcommand{\\headrulewidth}{0.4pt}\n\n"
+        "\\title{" + safe_title + "}\n\\author{" + safe_author + "}\n\\date{\\today}\n\n"
+        "\\begin{document}\n\n"
+        "\\maketitle\n"
+        + latex_code + "\n\n"
+        "\\end{document}\n"
     )
 
-    tex_file = output_path / f"{filename}.tex"
-    tex_file.write_text(full_latex, encoding="utf-8")
-
-    pdf_file = output_path / f"{filename}.pdf"
-
-    try:
-        last = None
-        for _ in range(2):
-            last = subprocess.run(
-                [
-                    "pdflatex",
-                    "-interaction=nonstopmode",
-                    "-output-directory",
-                    str(output_path),
-                    str(tex_file),
-                ],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',  # Replace invalid UTF-8 sequences
-                timeout=60,
-            )
-
-        if pdf_file.exists():
-            # Clean auxiliary files AND the source .tex file
-            for ext in (".aux", ".log", ".out", ".toc", ".tex"):
-                aux = output_path / f"{filename}{ext}"
-                if aux.exists():
-                    try:
-                        aux.unlink()
-                    except Exception:
-                        pass
-
-            return {
-                "success": True,
-                "pdf_path": str(pdf_file),
-                "size_kb": round(pdf_file.stat().st_size / 1024, 2),
-                "message": f"PDF compiled successfully: {pdf_file}",
-            }
-
-        return {
-            "success": False,
-            "error": "PDF file was not created",
-            "log": (last.stderr if last else ""),
-        }
-
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "LaTeX compilation timed out (>60s)"}
-    except FileNotFoundError:
-        return {
-            "success": False,
-            "error": "pdflatex not found. Install TeX Live (e.g., texlive-latex-base texlive-latex-extra)",
-        }
-    except Exception as e:
-        return {"success": False, "error": f"Compilation error: {e}"}
+    return compile_latex(document, filename, Path(output_dir))
 
 
 # Expose both tools - the new one is preferred
@@ -1,45 +1,84 @@
-import yfinance as yf 
+import contextlib
+import contextvars
+
 import numpy as np
 import pandas as pd
 
 from langchain.tools import tool
-from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
-from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
 
 from ..utils.stock_utils import *
+from ..utils.tracing import span, traced
+from ..utils.wiki_cache import get_company_summary
+
 
+# Precomputed compute_indicator_panel rows by ticker (see run_batch), read by
+# get_stock_report so a batch computes its indicators in one vectorised pass
+_indicator_rows = contextvars.ContextVar("tradagent_indicator_rows", default={})
 
-wikipedia_tool = WikipediaQueryRun(
-    api_wrapper=WikipediaAPIWrapper(
-        top_k_results=3,
-        doc_content_chars_max=4000,
-        wiki_client=None
-    )
-)
 
+@contextlib.contextmanager
+def indicator_rows(rows: dict):
+    """Serve get_stock_report's momentum and volatility from `rows` {ticker: panel row}."""
+    token = _indicator_rows.set({t.upper(): row for t, row in rows.items()})
+    try:
+        yield
+    finally:
+        _indicator_rows.reset(token)
 
 
 @tool
-def get_stock_report(ticker: str) -> dict:
+def wikipedia_tool(query: str) -> str:
     """
-    Returns a comprehensive stock-level quantitative report with all micro and macro metrics.
+    Look up a company overview on Wikipedia (served from the local summary store when available).
+    """
+    with span("tool.wikipedia", query=query):
+        return get_company_summary(query)
+
+
+@traced("compute.stock_report")
+def build_stock_report(ticker: str, data: MarketData = None, indicators=None) -> dict:
+    """
+    Build the quantitative report from a single market data bundle
+    (one history pull and one info pull, shared by every metric).
+
+    `indicators` is an optional row of the compute_indicator_panel table;
+    when given, momentum and volatility are read from it instead of recomputed.
     """
-    stock = yf.Ticker(ticker)
-    info = stock.info
-    
+    data = data or load_market_data(ticker)
+    info = data.info
+
+    if indicators is not None:
+        volatility = {k: float(indicators[k]) for k in ("vol_30d", "vol_90d", "vol_1y")}
+        momentum = {
+            "rsi_14d": float(indicators["rsi_14d"]),
+            "macd": {k: float(indicators[k]) for k in ("macd", "signal", "histogram")},
+        }
+    else:
+        volatility = compute_volatility(ticker, data=data)
+        momentum = {
+            "rsi_14d": compute_rsi(ticker, data=data),
+            "macd": compute_macd(ticker, data=data)
+        }
+
     return {
         "ticker": ticker.upper(),
         "company_name": info.get("longName", ticker),
-        "price": get_latest_ohlc(ticker),
+        "price": get_latest_ohlc(ticker, data=data),
         "market_cap": info.get("marketCap", "N/A"),
-        "volatility": compute_volatility(ticker),
-        "momentum": {
-            "rsi_14d": compute_rsi(ticker),
-            "macd": compute_macd(ticker)
-        },
-        "valuation": get_earnings_and_valuation(ticker)
+        "volatility": volatility,
+        "momentum": momentum,
+        "valuation": get_earnings_and_valuation(ticker, data=data)
     }
 
+
+@tool
+def get_stock_report(ticker: str) -> dict:
+    """
+    Returns a comprehensive stock-level quantitative report with all micro and macro metrics.
+    """
+    with span("tool.get_stock_report", ticker=ticker):
+        return build_stock_report(ticker, indicators=_indicator_rows.get().get(ticker.upper()))
+
 TOOLS = [
     get_stock_report,
     wikipedia_tool
@@ -0,0 +1,155 @@
+from dataclasses import dataclass, field
+
+import orjson
+
+# Serialization options: numpy scalars (from pandas metrics) and non-str dict keys are accepted
+_DUMP_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _float(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None  # NaN -> None
+
+
+def _section(data: dict, key: str) -> dict:
+    value = data.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+# Metrics are None when missing or invalid (NULL in the decisions table), never 0.0
+
+@dataclass(slots=True)
+class Price:
+    open: float = None
+    high: float = None
+    low: float = None
+    close: float = None
+    volume: int = None
+
+
+@dataclass(slots=True)
+class Volatility:
+    vol_30d: float = None
+    vol_90d: float = None
+    vol_1y: float = None
+
+
+@dataclass(slots=True)
+class MACD:
+    macd: float = None
+    signal: float = None
+    histogram: float = None
+
+
+@dataclass(slots=True)
+class Momentum:
+    rsi_14d: float = None
+    macd: MACD = field(default_factory=MACD)
+
+
+@dataclass(slots=True)
+class Valuation:
+    eps_trailing: float = None
+    eps_forward: float = None
+    pe_trailing: float = None
+    pe_forward: float = None
+    price_to_sales: float = None
+
+
+@dataclass(slots=True)
+class AnalysisRecord:
+    """
+    One stock analysis, from the computed metrics to the report and the
+    decisions table. Serializes to the same JSON layout build_stock_report
+    produces, so agents and stored rows read it unchanged.
+    """
+
+    ticker: str
+    company_name: str = ""
+    price: Price = field(default_factory=Price)
+    market_cap: float = None
+    volatility: Volatility = field(default_factory=Volatility)
+    momentum: Momentum = field(default_factory=Momentum)
+    valuation: Valuation = field(default_factory=Valuation)
+    summary: str = ""
+    conclusion: str = ""
+    news_sentiment: dict = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AnalysisRecord":
+        """
+        Validate and coerce an analysis dict (tool output or LLM answer).
+        Missing or malformed numbers become None; MACD values may be nested
+        under momentum.macd or flat in momentum. Raises ValueError when the
+        ticker is missing, e.g. for JSON that is not an analysis at all.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected an analysis object, got {type(data).__name__}")
+        ticker = str(data.get("ticker") or "").strip().upper()
+        if not ticker:
+            raise ValueError("Analysis has no ticker")
+
+        price = data.get("price")
+        if not isinstance(price, dict):
+            price = {"close": data.get("current_price")}
+        volatility = _section(data, "volatility")
+        momentum = _section(data, "momentum")
+        macd = _section(momentum, "macd") or momentum
+        valuation = _section(data, "valuation")
+        sentiment = data.get("news_sentiment")
+        volume = _float(price.get("volume"))
+
+        return cls(
+            ticker=ticker,
+            company_name=str(data.get("company_name") or ticker),
+            price=Price(
+                open=_float(price.get("open")),
+                high=_float(price.get("high")),
+                low=_float(price.get("low")),
+                close=_float(price.get("close")),
+                volume=int(volume) if volume is not None else None,
+            ),
+            market_cap=_float(data.get("market_cap")),
+            volatility=Volatility(*(_float(volatility.get(k)) for k in ("vol_30d", "vol_90d", "vol_1y"))),
+            momentum=Momentum(
+                rsi_14d=_float(momentum.get("rsi_14d")),
+                macd=MACD(*(_float(macd.get(k)) for k in ("macd", "signal", "histogram"))),
+            ),
+            valuation=Valuation(*(_float(valuation.get(k)) for k in (
+                "eps_trailing", "eps_forward", "pe_trailing", "pe_forward", "price_to_sales",
+            ))),
+            summary=str(data.get("summary") or ""),
+            conclusion=str(data.get("conclusion") or ""),
+            news_sentiment=sentiment if isinstance(sentiment, dict) else None,
+        )
+
+    @classmethod
+    def from_json(cls, text) -> "AnalysisRecord":
+        """
+        Parse an analysis from JSON, or from LLM output with text around the
+        JSON (the one place the lenient extract_json_from_text is needed).
+        """
+        try:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            from ..tools.report_writer_tools import extract_json_from_text
+
+            data = extract_json_from_text(text)
+        return cls.from_dict(data)
+
+    def has_metrics(self) -> bool:
+        """True when at least one price or momentum value is known."""
+        return any(v is not None for v in (
+            self.price.close, self.momentum.rsi_14d, self.momentum.macd.macd, self.momentum.macd.histogram,
+        ))
+
+    def to_json(self) -> str:
+        return orjson.dumps(self, option=_DUMP_OPTIONS).decode()
+
+    def to_dict(self) -> dict:
+        return orjson.loads(orjson.dumps(self, option=_DUMP_OPTIONS))
@@ -0,0 +1,242 @@
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+NATURAL_GAS_CSV = Path(__file__).resolve().parent.parent / "test" / "natural_gas_daily_clean.csv"
+
+TRADING_DAYS = 252
+DEFAULT_COST_BPS = 5.0  # per unit of turnover (flat -> long = 1, long -> short = 2)
+
+METRIC_COLUMNS = [
+    "total_return", "cagr", "ann_vol", "sharpe", "max_drawdown", "trades", "exposure", "hit_rate",
+]
+
+
+def load_series(path=NATURAL_GAS_CSV) -> pd.Series:
+    """Daily close series from a `date,value` CSV such as natural_gas_daily_clean.csv."""
+    frame = pd.read_csv(path, parse_dates=["date"])
+    series = frame.set_index("date")["value"].astype(float).sort_index()
+    return series[~series.index.duplicated(keep="last")].dropna()
+
+
+# ---- Indicators over the whole history ----
+
+def rolling_rsi(closes: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Simple-average RSI at every bar (same definition as compute_rsi).
+    Rolling means come from differences of cumulative sums; the first
+    `window` bars are NaN.
+    """
+    delta = np.diff(closes, prepend=np.nan)
+    gain = np.concatenate([[0.0], np.cumsum(np.clip(delta[1:], 0, None))])
+    loss = np.concatenate([[0.0], np.cumsum(-np.clip(delta[1:], None, 0))])
+
+    rsi = np.full(len(closes), np.nan)
+    avg_gain = gain[window:] - gain[:-window]
+    avg_loss = loss[window:] - loss[:-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi[window:] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return rsi
+
+
+def ema(closes: np.ndarray, span: int) -> np.ndarray:
+    """Adjusted EWM (pandas `ewm(span).mean()`, as in compute_macd) over the whole history."""
+    return pd.Series(closes).ewm(span=span).mean().to_numpy()
+
+
+def macd_histogram(closes: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9, cache: dict = None) -> np.ndarray:
+    """MACD minus its signal line at every bar. `cache` keeps EMAs by span across calls."""
+    emas = cache if cache is not None else {}
+    for span in (fast, slow):
+        if span not in emas:
+            emas[span] = ema(closes, span)
+    macd = emas[fast] - emas[slow]
+    return macd - ema(macd, signal)
+
+
+# ---- Signals, positions and PnL ----
+
+def momentum_positions(histogram: np.ndarray, rsi: np.ndarray, rsi_level: float = 50.0, long_only: bool = False) -> np.ndarray:
+    """
+    Target position per bar from the report's momentum bias:
+    +1 when histogram > 0 and RSI > level (bullish), -1 when histogram < 0
+    and RSI < level (bearish), flat otherwise or while RSI is warming up.
+    `rsi` may be a (windows x bars) matrix to get one row of positions per window.
+    """
+    # NaN RSI compares False both ways, so warm-up bars stay flat
+    bullish = (histogram > 0) & (rsi > rsi_level)
+    if long_only:
+        return bullish.astype(float)
+    bearish = (histogram < 0) & (rsi < rsi_level)
+    return bullish.astype(float) - bearish
+
+
+def simulate(closes: np.ndarray, positions: np.ndarray, cost_bps: float = DEFAULT_COST_BPS) -> dict:
+    """
+    Daily strategy returns for `positions` decided on each close and held
+    over the next bar, net of `cost_bps` per unit of turnover.
+    Works along the last axis, so a matrix of positions is simulated at once.
+    """
+    returns = np.zeros(len(closes))
+    returns[1:] = closes[1:] / closes[:-1] - 1
+
+    held = np.zeros_like(positions)
+    held[..., 1:] = positions[..., :-1]
+    turnover = np.abs(np.diff(held, axis=-1, prepend=0.0))
+    strategy = held * returns - turnover * cost_bps / 10_000
+    return {"returns": strategy, "held": held, "turnover": turnover}
+
+
+def performance(strategy: np.ndarray, held: np.ndarray, turnover: np.ndarray) -> dict:
+    """Summary statistics of daily strategy returns (one value per row for a matrix)."""
+    equity = np.cumprod(1 + strategy, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1
+    final = equity[..., -1]
+    years = strategy.shape[-1] / TRADING_DAYS
+    vol = strategy.std(axis=-1, ddof=1) * np.sqrt(TRADING_DAYS)
+    active = held != 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "total_return": final - 1,
+            "cagr": np.where(final > 0, np.abs(final) ** (1 / years) - 1, -1.0),
+            "ann_vol": vol,
+            "sharpe": np.where(vol > 0, strategy.mean(axis=-1) * TRADING_DAYS / vol, 0.0),
+            "max_drawdown": drawdown.min(axis=-1),
+            "trades": np.count_nonzero(turnover, axis=-1),
+            "exposure": active.mean(axis=-1),
+            "hit_rate": np.nan_to_num(((strategy > 0) & active).sum(axis=-1) / active.sum(axis=-1)),
+        }
+
+
+def run_backtest(
+    series: pd.Series,
+    rsi_window: int = 14,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    rsi_level: float = 50.0,
+    cost_bps: float = DEFAULT_COST_BPS,
+    long_only: bool = False,
+) -> tuple:
+    """
+    Backtest the RSI/MACD momentum bias over a close series.
+    Returns (metrics dict, daily frame with indicators, position, equity).
+    """
+    closes = series.to_numpy(dtype=float)
+    rsi = rolling_rsi(closes, rsi_window)
+    histogram = macd_histogram(closes, fast, slow, signal)
+    positions = momentum_positions(histogram, rsi, rsi_level, long_only)
+    result = simulate(closes, positions, cost_bps)
+
+    daily = pd.DataFrame(
+        {
+            "close": closes,
+            "rsi": rsi,
+            "histogram": histogram,
+            "position": result["held"],
+            "returns": result["returns"],
+            "equity": np.cumprod(1 + result["returns"]),
+        },
+        index=series.index,
+    )
+    metrics = performance(result["returns"], result["held"], result["turnover"])
+    return {name: value.item() for name, value in metrics.items()}, daily
+
+
+# ---- Parameter sweeps ----
+
+_worker_state = None
+
+
+def _init_worker(closes: np.ndarray, rsi_windows: list):
+    global _worker_state
+    _worker_state = (closes, np.vstack([rolling_rsi(closes, w) for w in rsi_windows]))
+
+
+def _run_chunk(chunk: list, rsi_windows: list, rsi_level: float, cost_bps: float, long_only: bool, state=None) -> list:
+    """
+    Backtest a chunk of (fast, slow, signal) MACD settings against every RSI
+    window at once: the RSIs form one matrix, so each MACD setting costs one
+    vectorised simulation however many windows are swept.
+    """
+    closes, rsis = state or _worker_state
+    emas = {}
+    rows = []
+    for fast, slow, signal in chunk:
+        histogram = macd_histogram(closes, fast, slow, signal, cache=emas)
+        positions = momentum_positions(histogram, rsis, rsi_level, long_only)
+        result = simulate(closes, positions, cost_bps)
+        metrics = performance(result["returns"], result["held"], result["turnover"])
+        for i, rsi_window in enumerate(rsi_windows):
+            rows.append({
+                "rsi_window": rsi_window, "fast": fast, "slow": slow, "signal": signal,
+                **{name: values[i].item() for name, values in metrics.items()},
+            })
+    return rows
+
+
+def parameter_grid(fast_spans, slow_spans, signal_spans) -> list:
+    """All (fast, slow, signal) MACD settings with fast < slow."""
+    return [
+        combo for combo in itertools.product(fast_spans, slow_spans, signal_spans)
+        if combo[0] < combo[1]
+    ]
+
+
+def sweep(
+    series: pd.Series,
+    rsi_windows=range(7, 29),
+    fast_spans=range(5, 21),
+    slow_spans=range(20, 41, 2),
+    signal_spans=range(5, 13),
+    rsi_level: float = 50.0,
+    cost_bps: float = DEFAULT_COST_BPS,
+    long_only: bool = False,
+    max_workers: int = None,
+    sort_by: str = "sharpe",
+) -> pd.DataFrame:
+    """
+    Backtest every (rsi_window, fast, slow, signal) combination and rank them by `sort_by`.
+
+    The MACD settings are split into a few chunks per worker; each worker
+    computes the RSI matrix once (pool initializer) and reuses EMAs across
+    its chunk. With one worker everything runs in-process.
+    """
+    closes = series.to_numpy(dtype=float)
+    rsi_windows = list(rsi_windows)
+    grid = parameter_grid(fast_spans, slow_spans, signal_spans)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1 or len(grid) < 16:
+        state = (closes, np.vstack([rolling_rsi(closes, w) for w in rsi_windows]))
+        rows = _run_chunk(grid, rsi_windows, rsi_level, cost_bps, long_only, state=state)
+    else:
+        size = -(-len(grid) // (max_workers * 4))
+        chunks = [grid[i:i + size] for i in range(0, len(grid), size)]
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(closes, rsi_windows)
+        ) as pool:
+            futures = [pool.submit(_run_chunk, c, rsi_windows, rsi_level, cost_bps, long_only) for c in chunks]
+            rows = [row for future in futures for row in future.result()]
+
+    table = pd.DataFrame(rows, columns=["rsi_window", "fast", "slow", "signal"] + METRIC_COLUMNS)
+    return table.sort_values(sort_by, ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.backtest [path/to/series.csv]
+    series = load_series(sys.argv[1] if len(sys.argv) > 1 else NATURAL_GAS_CSV)
+    metrics, _ = run_backtest(series)
+    print(f"RSI(14) / MACD(12, 26, 9) over {len(series)} bars:")
+    for name in METRIC_COLUMNS:
+        print(f"  {name:<13} {metrics[name]:.4f}")
+
+    results = sweep(series)
+    print(f"\nTop 10 of {len(results)} parameter combinations by Sharpe ratio:")
+    print(results.head(10).to_string(index=False, float_format=lambda x: f"{x:.4f}"))
@@ -0,0 +1,350 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import get_mistral_api_key
+
+USER_AGENT = "Mozilla/5.0 (compatible; TRADAgent/0.1)"
+DEFAULT_POOL_SIZE = 16
+
+
+def _limit(provider: str, rate: float, burst: int) -> tuple:
+    """(requests/second, burst) for a provider; TRADAGENT_RATE_<PROVIDER> overrides the rate."""
+    return float(os.environ.get(f"TRADAGENT_RATE_{provider.upper()}", rate)), burst
+
+
+# Sized for the free tiers: Mistral ~1 req/s, Finnhub 60/min, Alpha Vantage 5/min
+PROVIDER_LIMITS = {
+    "mistral": _limit("mistral", 1.0, 2),
+    "yahoo": _limit("yahoo", 2.0, 4),
+    "wikipedia": _limit("wikipedia", 5.0, 5),
+    "finnhub": _limit("finnhub", 1.0, 5),
+    "alpha_vantage": _limit("alpha_vantage", 5 / 60, 1),
+}
+
+
+def _timeout(provider: str, seconds: float) -> float:
+    """Seconds one request to a provider may take; TRADAGENT_TIMEOUT_<PROVIDER> overrides it."""
+    return float(os.environ.get(f"TRADAGENT_TIMEOUT_{provider.upper()}", seconds))
+
+
+# Per request, so a hung connection fails instead of holding a batch or server slot
+MISTRAL_TIMEOUT = _timeout("mistral", 90)
+YAHOO_TIMEOUT = _timeout("yahoo", 20)
+# Connection errors and timeouts ChatMistralAI retries itself (429/5xx are retried by the transport)
+MISTRAL_CLIENT_RETRIES = 2
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.environ.get("TRADAGENT_MAX_RETRIES", 4))
+BACKOFF_BASE = 0.5  # seconds, doubled per attempt
+BACKOFF_MAX = 30.0
+
+# Per provider: requests sent, retries, seconds spent waiting for a token
+STATS = defaultdict(Counter)
+
+
+class HostRateLimiter:
+    """
+    Token bucket per key (a host or a provider): `rate` requests/second with
+    bursts of `burst`. Keys listed in `limits` get their own (rate, burst).
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 1, limits: dict = None):
+        self.rate = rate
+        self.burst = burst
+        self.limits = limits or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str) -> float:
+        """Take a token for `key` if one is available (returns 0), else the seconds until one is."""
+        rate, burst = self.limits.get(key, (self.rate, self.burst))
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def acquire(self, key: str) -> float:
+        """Block until a request to `key` is allowed. Returns the seconds waited."""
+        waited = 0.0
+        while wait := self.try_acquire(key):
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def acquire_async(self, key: str) -> float:
+        """acquire() for coroutines: waits without blocking the event loop."""
+        waited = 0.0
+        while wait := self.try_acquire(key):
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+
+# Process-wide: every client of a provider shares its budget
+RATE_LIMITER = HostRateLimiter(limits=PROVIDER_LIMITS)
+
+
+def _acquire(provider: str):
+    waited = RATE_LIMITER.acquire(provider)
+    STATS[provider]["requests"] += 1
+    STATS[provider]["wait_s"] += waited
+
+
+async def _acquire_async(provider: str):
+    waited = await RATE_LIMITER.acquire_async(provider)
+    STATS[provider]["requests"] += 1
+    STATS[provider]["wait_s"] += waited
+
+
+def retry_after(headers) -> float:
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None."""
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, after: float = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, min(after, BACKOFF_MAX)) if after is not None else delay
+
+
+def _status(exc: Exception):
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def call_with_retry(provider: str, fn, *args, retry_on: tuple = (), **kwargs):
+    """
+    Call a client library function (yfinance, Wikipedia...) under the
+    provider's rate limit, retrying with jittered backoff on throttling,
+    5xx responses, connection errors and the `retry_on` exception types.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        _acquire(provider)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            retryable = (
+                isinstance(e, (requests.ConnectionError, requests.Timeout, *retry_on))
+                or _status(e) in RETRY_STATUSES
+            )
+            if not retryable or attempt == MAX_RETRIES:
+                raise
+            response = getattr(e, "response", None)
+            STATS[provider]["retries"] += 1
+            time.sleep(backoff_delay(attempt, retry_after(getattr(response, "headers", None))))
+
+
+# ---- HTTP sessions ----
+
+class ProviderSession(requests.Session):
+    """requests session that rate-limits and retries (429/5xx, jittered backoff) every call to its provider."""
+
+    def __init__(self, provider: str):
+        super().__init__()
+        self.provider = provider
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            _acquire(self.provider)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                STATS[self.provider]["retries"] += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            STATS[self.provider]["retries"] += 1
+            delay = backoff_delay(attempt, retry_after(response.headers))
+            response.close()
+            time.sleep(delay)
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE, provider: str = None) -> requests.Session:
+    """
+    HTTP session with keep-alive connection pools large enough for `pool_size`
+    workers; with a `provider`, calls are rate-limited and retried.
+    """
+    session = ProviderSession(provider) if provider else requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+_sessions = {}
+_clients = {}
+_registry_lock = threading.Lock()
+
+
+def get_session(provider: str) -> requests.Session:
+    """The process-wide session for a provider (connections are reused across agents and threads)."""
+    with _registry_lock:
+        if provider not in _sessions:
+            _sessions[provider] = build_session(provider=provider)
+        return _sessions[provider]
+
+
+# ---- Mistral ----
+
+def _mistral_limits():
+    import httpx
+
+    return httpx.Limits(max_connections=DEFAULT_POOL_SIZE, max_keepalive_connections=DEFAULT_POOL_SIZE)
+
+
+def _retry_transport():
+    import httpx
+
+    class RetryTransport(httpx.HTTPTransport):
+        """Rate-limits Mistral calls and retries 429/5xx answers with jittered backoff."""
+
+        def handle_request(self, request):
+            for attempt in range(MAX_RETRIES + 1):
+                _acquire("mistral")
+                response = super().handle_request(request)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response
+                STATS["mistral"]["retries"] += 1
+                delay = backoff_delay(attempt, retry_after(response.headers))
+                response.close()
+                time.sleep(delay)
+
+    return RetryTransport(retries=2, limits=_mistral_limits())  # connect errors
+
+
+def _async_retry_transport():
+    import httpx
+
+    class AsyncRetryTransport(httpx.AsyncBaseTransport):
+        """
+        Async twin of RetryTransport, sharing the same Mistral rate limit.
+        Connection pools belong to an event loop, so one pool is kept per
+        running loop (batch runs, the API server) and dropped with it.
+        """
+
+        def __init__(self):
+            self._pools = weakref.WeakKeyDictionary()
+
+        def _pool(self):
+            loop = asyncio.get_running_loop()
+            if loop not in self._pools:
+                self._pools[loop] = httpx.AsyncHTTPTransport(retries=2, limits=_mistral_limits())
+            return self._pools[loop]
+
+        async def handle_async_request(self, request):
+            for attempt in range(MAX_RETRIES + 1):
+                await _acquire_async("mistral")
+                response = await self._pool().handle_async_request(request)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return response
+                STATS["mistral"]["retries"] += 1
+                delay = backoff_delay(attempt, retry_after(response.headers))
+                await response.aclose()
+                await asyncio.sleep(delay)
+
+        async def aclose(self):
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+            if pool is not None:
+                await pool.aclose()
+
+    return AsyncRetryTransport()
+
+
+def _mistral_client_options() -> dict:
+    return {
+        "base_url": os.environ.get("MISTRAL_BASE_URL", "https://api.mistral.ai/v1"),
+        "headers": {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Authorization": f"Bearer {get_mistral_api_key().get_secret_value()}",
+        },
+        "timeout": MISTRAL_TIMEOUT,
+    }
+
+
+def get_mistral_http_client():
+    """Shared keep-alive httpx client for the Mistral API."""
+    import httpx
+
+    with _registry_lock:
+        if "mistral_http" not in _clients:
+            _clients["mistral_http"] = httpx.Client(**_mistral_client_options(), transport=_retry_transport())
+        return _clients["mistral_http"]
+
+
+def get_mistral_async_client():
+    """Shared httpx.AsyncClient for the Mistral API (ainvoke/astream), under the same rate limit."""
+    import httpx
+
+    with _registry_lock:
+        if "mistral_async" not in _clients:
+            _clients["mistral_async"] = httpx.AsyncClient(
+                **_mistral_client_options(), transport=_async_retry_transport(),
+            )
+        return _clients["mistral_async"]
+
+
+def get_chat_model(name: str, temperature: float):
+    """
+    ChatMistralAI shared by every agent asking for the same model and
+    temperature; all of them send through one pooled, rate-limited client
+    (and its async twin for ainvoke).
+    """
+    from langchain_mistralai import ChatMistralAI
+
+    from .llm_cache import get_llm_cache
+    from .tracing import llm_callback
+
+    cache = get_llm_cache()
+    key = ("chat", name, temperature, id(cache))
+    client = get_mistral_http_client()
+    async_client = get_mistral_async_client()
+    with _registry_lock:
+        if key not in _clients:
+            _clients[key] = ChatMistralAI(
+                name=name,
+                api_key=get_mistral_api_key(),
+                temperature=temperature,
+                cache=cache,
+                client=client,
+                async_client=async_client,
+                timeout=int(MISTRAL_TIMEOUT),
+                max_retries=MISTRAL_CLIENT_RETRIES,
+                callbacks=[llm_callback()],  # spans and token counts when tracing is on
+            )
+        return _clients[key]
+
+
+def format_client_stats() -> str:
+    lines = ["PROVIDER        REQUESTS  RETRIES  WAITED"]
+    for provider, stats in sorted(STATS.items()):
+        lines.append(f"{provider:<15} {stats['requests']:>8} {stats['retries']:>8} {stats['wait_s']:>6.1f}s")
+    return "\n".join(lines)
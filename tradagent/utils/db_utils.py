@@ -0,0 +1,15 @@
+import os
+import sqlite3
+from pathlib import Path
+
+# Local store shared by the caches (defaults to the tradagent.db next to main.py,
+# whatever the working directory)
+DB_PATH = Path(os.environ.get("TRADAGENT_DB", Path(__file__).resolve().parents[2] / "tradagent.db"))
+
+
+def connect(db_path=None, **kwargs) -> sqlite3.Connection:
+    """Open a connection to the local store in WAL mode (readers never block the writer)."""
+    conn = sqlite3.connect(str(db_path or DB_PATH), timeout=30, **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,260 @@
+import operator
+import threading
+from datetime import datetime, timedelta, timezone
+
+from .analysis_record import AnalysisRecord
+from .db_utils import connect
+
+# Numeric fields copied out of the analysis JSON into their own columns
+EXTRACTED_COLUMNS = [
+    "close", "rsi_14d", "macd", "macd_histogram", "vol_30d", "vol_90d", "vol_1y", "pe_trailing", "pe_forward",
+]
+
+_QUERYABLE = {"ts_utc", "ticker"} | set(EXTRACTED_COLUMNS)
+_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq}
+
+DEFAULT_BATCH_SIZE = 500
+
+# Same layout as the table shipped in tradagent.db; older stores get the
+# extracted columns added by _migrate
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts_utc TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    decision_json TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_decisions_ticker_ts ON decisions (ticker, ts_utc);
+CREATE INDEX IF NOT EXISTS idx_decisions_ts_rsi ON decisions (ts_utc, rsi_14d);
+"""
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def _migrate(conn, db_path=None):
+    """Create the table, add missing extracted columns (backfilled from the JSON) and indexes."""
+    key = str(db_path)
+    with _migrate_lock:
+        if key in _migrated:
+            return
+        conn.executescript(SCHEMA)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(decisions)")}
+        missing = [c for c in EXTRACTED_COLUMNS if c not in existing]
+        with conn:
+            for column in missing:
+                conn.execute(f"ALTER TABLE decisions ADD COLUMN {column} REAL")
+            if missing:
+                rows = conn.execute("SELECT id, decision_json FROM decisions").fetchall()
+                conn.executemany(
+                    f"UPDATE decisions SET {', '.join(f'{c} = ?' for c in EXTRACTED_COLUMNS)} WHERE id = ?",
+                    [[*_backfill_values(text), row_id] for row_id, text in rows],
+                )
+        conn.executescript(INDEXES)
+        _migrated.add(key)
+
+
+def _backfill_values(text: str) -> list:
+    """Extracted values of a stored row, or NULLs when its JSON is not an analysis."""
+    try:
+        return list(_extract(AnalysisRecord.from_json(text)).values())
+    except ValueError:
+        return [None] * len(EXTRACTED_COLUMNS)
+
+
+def _extract(record: AnalysisRecord) -> dict:
+    """Extracted column values of one analysis record."""
+    return {
+        "close": record.price.close,
+        "rsi_14d": record.momentum.rsi_14d,
+        "macd": record.momentum.macd.macd,
+        "macd_histogram": record.momentum.macd.histogram,
+        "vol_30d": record.volatility.vol_30d,
+        "vol_90d": record.volatility.vol_90d,
+        "vol_1y": record.volatility.vol_1y,
+        "pe_trailing": record.valuation.pe_trailing,
+        "pe_forward": record.valuation.pe_forward,
+    }
+
+
+def _row(analysis, ts_utc: str = None) -> tuple:
+    """
+    Insert row for an AnalysisRecord (dicts and JSON text are validated into
+    one first), or None when the input is not an analysis (e.g. no ticker).
+    """
+    try:
+        if isinstance(analysis, str):
+            analysis = AnalysisRecord.from_json(analysis)
+        elif not isinstance(analysis, AnalysisRecord):
+            analysis = AnalysisRecord.from_dict(analysis)
+    except ValueError:
+        return None
+    # Same fixed-width format as the rows already stored, so ts_utc sorts as text
+    ts_utc = ts_utc or datetime.now(timezone.utc).isoformat(timespec="microseconds")
+    return (ts_utc, analysis.ticker, analysis.to_json(), *_extract(analysis).values())
+
+
+_INSERT = (
+    f"INSERT INTO decisions (ts_utc, ticker, decision_json, {', '.join(EXTRACTED_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (3 + len(EXTRACTED_COLUMNS)))})"
+)
+
+
+def record_decisions(analyses: list, ts_utc: str = None, db_path=None) -> int:
+    """
+    Store analyses (AnalysisRecords, dicts or JSON strings) in one transaction.
+    Returns rows written. Inputs that are not analyses (no ticker) are skipped.
+    """
+    rows = [row for row in (_row(a, ts_utc) for a in analyses) if row]
+    if not rows:
+        return 0
+    conn = connect(db_path)
+    try:
+        _migrate(conn, db_path)
+        with conn:
+            conn.executemany(_INSERT, rows)
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def record_decision(analysis, db_path=None) -> int:
+    return record_decisions([analysis], db_path=db_path)
+
+
+class DecisionWriter:
+    """
+    Buffers analyses and writes them `batch_size` at a time (and on flush/close),
+    so high-volume producers pay for one transaction per batch. One connection
+    is kept open until close(), so the WAL is not checkpointed after every
+    batch. Thread-safe.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, db_path=None):
+        self.batch_size = batch_size
+        self.db_path = db_path
+        self.written = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._conn = None
+
+    def add(self, analysis, ts_utc: str = None):
+        row = _row(analysis, ts_utc)
+        if row is None:
+            return
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) < self.batch_size:
+                return
+            rows, self._buffer = self._buffer, []
+        self._write(rows)
+
+    def flush(self):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        self._write(rows)
+
+    def _write(self, rows: list):
+        if not rows:
+            return
+        with self._write_lock:
+            if self._conn is None:
+                self._conn = connect(self.db_path, check_same_thread=False)
+                _migrate(self._conn, self.db_path)
+            with self._conn:
+                self._conn.executemany(_INSERT, rows)
+            self.written += len(rows)
+
+    def close(self):
+        self.flush()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---- Queries ----
+
+def _query(sql: str, params: list, db_path=None) -> list:
+    conn = connect(db_path)
+    try:
+        _migrate(conn, db_path)
+        cursor = conn.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def _day_start(day=None) -> str:
+    """ISO timestamp of 00:00 UTC on `day` (a date, datetime or ISO string; today by default)."""
+    if day is None:
+        day = datetime.now(timezone.utc)
+    if isinstance(day, str):
+        return day[:10] + "T00:00:00"
+    return f"{day:%Y-%m-%d}T00:00:00"
+
+
+def last_decisions(ticker: str, n: int = 10, records: bool = False, db_path=None) -> list:
+    """
+    The `n` latest analyses of `ticker`, newest first (walks the (ticker, ts_utc)
+    index backwards; rows stored with the same timestamp come back in insert order, reversed). With `records`, each row also carries its AnalysisRecord
+    (None for stored rows that are not analyses).
+    """
+    columns = ["id", "ts_utc", "ticker"] + EXTRACTED_COLUMNS + (["decision_json"] if records else [])
+    rows = _query(
+        f"SELECT {', '.join(columns)} FROM decisions WHERE ticker = ? ORDER BY ts_utc DESC, id DESC LIMIT ?",
+        [ticker.upper(), n],
+        db_path,
+    )
+    if records:
+        for row in rows:
+            try:
+                row["analysis"] = AnalysisRecord.from_json(row.pop("decision_json"))
+            except ValueError:
+                row["analysis"] = None
+    return rows
+
+
+def decision_history(ticker: str, since=None, until=None, db_path=None) -> list:
+    """Extracted metrics of every analysis of `ticker` in [since, until] (ISO strings or datetimes), oldest first."""
+    start = since.isoformat() if isinstance(since, datetime) else (since or "")
+    end = until.isoformat() if isinstance(until, datetime) else (until or "~")
+    return _query(
+        f"SELECT ts_utc, {', '.join(EXTRACTED_COLUMNS)} FROM decisions "
+        "WHERE ticker = ? AND ts_utc >= ? AND ts_utc <= ? ORDER BY ts_utc, id",
+        [ticker.upper(), start, end],
+        db_path,
+    )
+
+
+def screen_decisions(column: str, op: str, value: float, day=None, db_path=None) -> list:
+    """
+    Tickers whose latest analysis on `day` (UTC, today by default) satisfies
+    `column op value`, e.g. screen_decisions("rsi_14d", ">", 70).
+    Only that day's slice of the (ts_utc, rsi_14d) index is read.
+    """
+    if column not in _QUERYABLE or op not in _OPERATORS:
+        raise ValueError(f"Unsupported filter: {column} {op}")
+    start = _day_start(day)
+    end = (datetime.fromisoformat(start) + timedelta(days=1)).isoformat()
+    columns = ", ".join(["ticker", "ts_utc"] + EXTRACTED_COLUMNS)
+    # Latest row per ticker; the id breaks ties between rows of the same timestamp
+    rows = _query(
+        f"SELECT {columns} FROM (SELECT {columns}, ROW_NUMBER() OVER "
+        "(PARTITION BY ticker ORDER BY ts_utc DESC, id DESC) AS latest FROM decisions "
+        "WHERE ts_utc >= ? AND ts_utc < ?) WHERE latest = 1 ORDER BY ticker",
+        [start, end],
+        db_path,
+    )
+    return [row for row in rows if row[column] is not None and _OPERATORS[op](row[column], value)]
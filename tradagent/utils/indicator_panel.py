@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from .price_cache import get_close_panel
+
+INDICATOR_COLUMNS = [
+    "close", "rsi_14d", "macd", "signal", "histogram", "vol_30d", "vol_90d", "vol_1y",
+]
+
+# Comparisons accepted by screen_tickers (same operators as screen_decisions)
+SCREEN_OPERATORS = {">": "gt", ">=": "ge", "<": "lt", "<=": "le", "=": "eq"}
+
+
+def _align_last(values: np.ndarray) -> np.ndarray:
+    """
+    Push each column's valid values to the bottom, keeping their order.
+    Every column then reads like its own gap-free history ending on the last
+    row, so rolling windows match the per-ticker functions exactly.
+    """
+    order = np.argsort(~np.isnan(values), axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0)
+
+
+def _ewm_last(values: np.ndarray, span: int) -> np.ndarray:
+    """Full adjusted EWM (pandas `ewm(span).mean()`) of every column, leading NaNs skipped."""
+    decay = 1 - 2 / (span + 1)
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+
+    num = np.zeros(values.shape[1])
+    den = np.zeros(values.shape[1])
+    out = np.empty_like(values)
+    for t in range(values.shape[0]):
+        num = num * decay + x[t]
+        den = den * decay + valid[t]
+        out[t] = num / np.where(den > 0, den, np.nan)
+    return out
+
+
+def _rsi(closes: np.ndarray, window: int) -> np.ndarray:
+    """Simple-average RSI of the last `window` moves per column."""
+    delta = np.diff(closes[-(window + 1):], axis=0)
+    gain = np.clip(delta, 0, None).mean(axis=0)
+    loss = -np.clip(delta, None, 0).mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def _tail_std(returns: np.ndarray, n: int = None) -> np.ndarray:
+    """Annualised sample std of the last `n` valid returns per column (all if n is None)."""
+    window = returns if n is None else returns[-n:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nanstd(window, axis=0, ddof=1) * np.sqrt(252)
+
+
+def compute_indicator_panel(closes: pd.DataFrame, rsi_window: int = 14) -> pd.DataFrame:
+    """
+    RSI, MACD/signal/histogram and 30d/90d/1y volatility for every column of a
+    date x ticker close panel in one vectorised pass.
+
+    Returns one row per ticker with the same values compute_rsi, compute_macd
+    and compute_volatility give for that ticker alone.
+    """
+    closes = closes.sort_index()
+    values = _align_last(closes.to_numpy(dtype=float))
+
+    # MACD runs over the trailing 6 months, like compute_macd
+    recent = closes.index > closes.index[-1] - pd.DateOffset(months=6)
+    macd_values = _align_last(closes.to_numpy(dtype=float)[recent])
+    macd = _ewm_last(macd_values, 12) - _ewm_last(macd_values, 26)
+    signal = _ewm_last(macd, 9)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(values[1:] / values[:-1])
+
+    table = pd.DataFrame(
+        {
+            "close": values[-1],
+            "rsi_14d": _rsi(values, rsi_window),
+            "macd": macd[-1],
+            "signal": signal[-1],
+            "histogram": macd[-1] - signal[-1],
+            "vol_30d": _tail_std(returns, 30),
+            "vol_90d": _tail_std(returns, 90),
+            "vol_1y": _tail_std(returns),
+        },
+        index=pd.Index(closes.columns, name="ticker"),
+    )
+    return table[INDICATOR_COLUMNS]
+
+
+def screen_tickers(tickers: list, days: int = 366, column: str = None, op: str = ">", value: float = None) -> pd.DataFrame:
+    """
+    Indicator table for `tickers` from one batched (cached) close download.
+    With `column` and `value`, only the rows where `column op value`, e.g.
+    screen_tickers(sp500, column="rsi_14d", op=">", value=70).
+    """
+    if column is not None and (column not in INDICATOR_COLUMNS or op not in SCREEN_OPERATORS):
+        raise ValueError(f"Unsupported filter: {column} {op}")
+    table = compute_indicator_panel(get_close_panel(tickers, days=days))
+    if column is None or value is None:
+        return table
+    return table[getattr(table[column], SCREEN_OPERATORS[op])(value)]
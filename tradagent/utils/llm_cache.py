@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+import time
+import warnings
+from collections import Counter
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, Generation
+
+from .db_utils import connect
+
+LLM_CACHE_TTL = float(os.environ.get("TRADAGENT_LLM_CACHE_TTL", 24 * 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("TRADAGENT_LLM_CACHE_MAX_ENTRIES", 10_000))
+
+# Only chat results are ever revived from the cache
+_CACHED_TYPES = [ChatGeneration, ChatGenerationChunk, Generation, AIMessage, AIMessageChunk]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LangChain cache for chat model responses, stored in the local SQLite store.
+
+    LangChain keys lookups on the serialized message list (system prompt and
+    message contents) and on the LLM string (model name, temperature, bound
+    tools...); both are hashed into one key. Entries expire after `ttl`
+    seconds and the least recently used ones are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, db_path=None, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+        conn = connect(self.db_path)
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        conn = connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT created_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            if now - row[0] > self.ttl:
+                with conn:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._count("misses")
+                self._count("expired")
+                return None
+            with conn:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        finally:
+            conn.close()
+
+        self._count("hits")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return loads(row[1], allowed_objects=_CACHED_TYPES)
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                    (key, now, now, dumps(return_val)),
+                )
+                evicted = conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        finally:
+            conn.close()
+        self._count("writes")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self, **kwargs) -> None:
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM llm_cache")
+        finally:
+            conn.close()
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def format_stats(self) -> str:
+        return (
+            f"LLM cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+            f"({self.hit_rate():.0%} hit rate), {self.stats['evictions']} evictions"
+        )
+
+
+_llm_cache = None
+
+
+def enable_llm_cache(**kwargs) -> SQLiteLLMCache:
+    """Turn on the shared LLM cache (opt-in; TRADAGENT_LLM_CACHE=1 does the same)."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = SQLiteLLMCache(**kwargs)
+    return _llm_cache
+
+
+def get_llm_cache():
+    """The shared cache if enabled, else None (LangChain then calls the API directly)."""
+    if _llm_cache is None and os.environ.get("TRADAGENT_LLM_CACHE", "").lower() in {"1", "true", "yes"}:
+        enable_llm_cache()
+    return _llm_cache
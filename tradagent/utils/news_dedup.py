@@ -0,0 +1,175 @@
+import re
+import sys
+import zlib
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from .news_store import iter_feed_items, url_hash
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: pairs at 0.45 / 0.6 Jaccard become candidates 72% / 98% of the time
+SIMILARITY_THRESHOLD = 0.45  # estimated Jaccard for a candidate to join a cluster
+SHINGLE_SIZE = 3  # words
+MIN_TITLE_WORDS = 6  # shorter headlines ("Stock market today") do not identify a story
+
+# Multiply-shift hash family: h(x) = ((a*x + b) mod 2**64) >> 32 with odd a
+_rng = np.random.default_rng(20260113)
+_PERM_A = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|cmpid|ref|src|source|mod|guccounter)$", re.I)
+
+
+def canonical_url(url: str) -> str:
+    """URL with the fragment, tracking parameters, trailing slash and host case normalized away."""
+    parts = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-bit hashes of the distinct word n-grams of `text` (lowercased, punctuation dropped)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64)
+
+
+def minhash(hashes: np.ndarray) -> np.ndarray:
+    """MinHash signature (NUM_PERM values) of a shingle hash set."""
+    if not len(hashes):
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    # uint64 arithmetic wraps, which is the mod 2**64 of the hash family
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def title_key(title: str):
+    """Exact-match key for a syndicated headline; None for titles too short to identify a story."""
+    words = _WORD.findall((title or "").lower())
+    return " ".join(words) if len(words) >= MIN_TITLE_WORDS else None
+
+
+def item_text(item: dict) -> str:
+    return f"{item.get('title') or ''} {item.get('summary') or ''}"
+
+
+class NearDuplicateIndex:
+    """
+    Streaming clusterer for feed items.
+
+    Items with the same canonical URL or the same (long enough) headline land
+    in the same cluster directly: syndicated copies keep the headline but get
+    their own summary. The rest are matched by MinHash/LSH over title +
+    summary. Only each cluster's first item (its representative) is indexed,
+    so adding an item costs
+    NUM_PERM hashes plus a few bucket lookups whatever the index size, and
+    memory grows with the number of distinct stories, not articles.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, bands: int = BANDS):
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide {NUM_PERM}")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.clusters = []  # cluster id -> list of items, representative first
+        self._signatures = []  # cluster id -> representative signature
+        self._keys = {}  # URL hash / headline -> cluster id
+        self._buckets = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, item: dict) -> int:
+        """Assign `item` to a cluster (new or existing). Returns the cluster id."""
+        url = item.get("url")
+        keys = [k for k in (url_hash(canonical_url(url)) if url else None, title_key(item.get("title"))) if k]
+        for key in keys:
+            if key in self._keys:
+                cluster_id = self._keys[key]
+                self.clusters[cluster_id].append(item)
+                for other in keys:
+                    self._keys.setdefault(other, cluster_id)
+                return cluster_id
+
+        hashes = shingles(item_text(item))
+        if not len(hashes):
+            # No title or summary: every such item would share the empty
+            # signature, so it only joins clusters through its URL
+            self.clusters.append([item])
+            self._signatures.append(None)
+            for key in keys:
+                self._keys.setdefault(key, len(self.clusters) - 1)
+            return len(self.clusters) - 1
+
+        signature = minhash(hashes)
+        band_keys = self._band_keys(signature)
+        candidates = {c for band, k in zip(self._buckets, band_keys) for c in band.get(k, ())}
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            score = float(np.mean(self._signatures[candidate] == signature))
+            if score >= best_score:
+                best, best_score = candidate, score
+
+        if best is None:
+            best = len(self.clusters)
+            self.clusters.append([item])
+            self._signatures.append(signature)
+            for band, k in zip(self._buckets, band_keys):
+                band.setdefault(k, []).append(best)
+        else:
+            self.clusters[best].append(item)
+        for key in keys:
+            self._keys.setdefault(key, best)
+        return best
+
+    def representatives(self) -> list:
+        """One item per cluster (the earliest published), with the cluster size and member URLs attached."""
+        unique = []
+        for members in self.clusters:
+            first = min(members, key=lambda m: m.get("time_published") or "~")
+            unique.append({
+                **first,
+                "cluster_size": len(members),
+                "cluster_sources": sorted({m.get("source") for m in members if m.get("source")}),
+                "cluster_urls": list(dict.fromkeys(m.get("url") for m in members if m.get("url"))),
+            })
+        return unique
+
+    @property
+    def items(self) -> int:
+        return sum(len(members) for members in self.clusters)
+
+
+def deduplicate(items, threshold: float = SIMILARITY_THRESHOLD, bands: int = BANDS) -> list:
+    """
+    Collapse exact (same URL) and near-duplicate (similar title + summary)
+    feed items to one representative each, carrying `cluster_size`.
+    """
+    index = NearDuplicateIndex(threshold=threshold, bands=bands)
+    for item in items:
+        index.add(item)
+    return index.representatives()
+
+
+def deduplicate_paths(paths: list, **kwargs) -> list:
+    """Representatives across several feed dumps (files or directories of *.json), streamed."""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.json")) if path.is_dir() else [path])
+    return deduplicate((item for f in files for item in iter_feed_items(f)), **kwargs)
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.news_dedup tradagent/test/data/news
+    unique = deduplicate_paths(sys.argv[1:] or ["tradagent/test/data/news"])
+    total = sum(item["cluster_size"] for item in unique)
+    print(f"{total} articles -> {len(unique)} stories ({1 - len(unique) / max(total, 1):.1%} duplicates)")
+    for item in sorted(unique, key=lambda i: -i["cluster_size"])[:10]:
+        print(f"  {item['cluster_size']:>3}  {item['title'][:90]}")
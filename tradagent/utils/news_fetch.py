@@ -0,0 +1,205 @@
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+
+from .clients import HostRateLimiter, build_session
+from .db_utils import connect
+from .news_dedup import NearDuplicateIndex, canonical_url
+from .news_store import url_hash
+
+DEFAULT_WORKERS = 16
+DEFAULT_RATE_PER_HOST = 2.0  # requests per second to any single host
+DEFAULT_TIMEOUT = 10.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_content (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER,
+    title TEXT,
+    text TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+
+class _TextExtractor(HTMLParser):
+    """Fallback extractor: <title> plus the text of <p> elements."""
+
+    def __init__(self):
+        super().__init__()
+        self.title = ""
+        self.paragraphs = []
+        self._tag = None
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style", "noscript"):
+            self._skip += 1
+        elif tag in ("p", "title"):
+            self._tag = tag
+            if tag == "p":
+                self.paragraphs.append("")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style", "noscript"):
+            self._skip = max(0, self._skip - 1)
+        elif tag == self._tag:
+            self._tag = None
+
+    def handle_data(self, data):
+        if self._skip or self._tag is None:
+            return
+        if self._tag == "title":
+            self.title += data
+        else:
+            self.paragraphs[-1] += data
+
+
+def extract_article_text(html: str, url: str = "") -> tuple:
+    """(title, body text) of an article page; uses newspaper3k when installed."""
+    try:
+        from newspaper import Article
+
+        article = Article(url or "http://localhost/")
+        article.download(input_html=html)
+        article.parse()
+        if article.text:
+            return article.title, article.text
+    except Exception:
+        pass
+
+    parser = _TextExtractor()
+    parser.feed(html)
+    text = "\n\n".join(" ".join(p.split()) for p in parser.paragraphs if p.strip())
+    return " ".join(parser.title.split()), text
+
+
+def _fetch_one(session: requests.Session, url: str, timeout: float) -> dict:
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        return {"url": url, "status": None, "title": None, "text": None, "error": str(e)}
+    if response.status_code != 200:
+        return {"url": url, "status": response.status_code, "title": None, "text": None}
+    title, text = extract_article_text(response.text, url)
+    return {"url": url, "status": 200, "title": title, "text": text}
+
+
+def _load_cached(conn, urls: list) -> dict:
+    cached = {}
+    for url in urls:
+        row = conn.execute(
+            "SELECT status, title, text FROM article_content WHERE url_hash = ? AND status = 200",
+            (url_hash(url),),
+        ).fetchone()
+        if row:
+            cached[url] = {"url": url, "status": row[0], "title": row[1], "text": row[2], "cached": True}
+    return cached
+
+
+def _store(conn, results: list):
+    now = datetime.now(timezone.utc).isoformat()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO article_content VALUES (?, ?, ?, ?, ?, ?)",
+            [(url_hash(r["url"]), r["url"], r["status"], r["title"], r["text"], now) for r in results],
+        )
+
+
+def fetch_articles(
+    urls: list,
+    max_workers: int = DEFAULT_WORKERS,
+    rate_per_host: float = DEFAULT_RATE_PER_HOST,
+    timeout: float = DEFAULT_TIMEOUT,
+    session: requests.Session = None,
+    db_path=None,
+) -> dict:
+    """
+    Fetch and parse article bodies concurrently, keyed by URL.
+
+    Bodies already in the content cache are not refetched. The rest are
+    downloaded over one pooled session on a thread pool, with each host
+    limited to `rate_per_host` requests per second. The rate limit is applied
+    when URLs are handed to the pool, so a throttled host waits in its own
+    queue instead of holding a worker that other hosts could use. Failed
+    fetches are recorded but retried on the next run.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        results = _load_cached(conn, urls)
+        missing = [u for u in urls if u not in results]
+        if not missing:
+            return results
+
+        session = session or build_session(max_workers)
+        # Article hosts are arbitrary sites: each one gets its own bucket
+        limiter = HostRateLimiter(rate=rate_per_host)
+        queues = defaultdict(deque)
+        for url in missing:
+            queues[urlsplit(url).netloc].append(url)
+        batch = []
+        running = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while queues or running:
+                # Hand out every URL whose host has a token, up to one per free worker
+                ready_in = None
+                for host, queue in list(queues.items()):
+                    while queue and len(running) < max_workers:
+                        delay = limiter.try_acquire(host)
+                        if delay:
+                            ready_in = delay if ready_in is None else min(ready_in, delay)
+                            break
+                        running.add(pool.submit(_fetch_one, session, queue.popleft(), timeout))
+                    if not queue:
+                        del queues[host]
+                if not running:
+                    time.sleep(ready_in)
+                    continue
+                done, running = wait(running, timeout=ready_in, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[result["url"]] = result
+                    batch.append(result)
+                if len(batch) >= 100:
+                    _store(conn, batch)
+                    batch = []
+        if batch:
+            _store(conn, batch)
+        return results
+    finally:
+        conn.close()
+
+
+def enrich_feed_items(items: list, dedupe: bool = False, **kwargs) -> list:
+    """
+    Add the fetched article `body` to each NEWS_SENTIMENT feed item. Items
+    with the same canonical URL share one fetch. With `dedupe`, near-duplicate
+    copies of a story (see news_dedup) also share their representative's
+    fetch; `body_url` then names the page the body was taken from.
+    """
+    source = {}
+    by_url = {}
+    for item in items:
+        url = item.get("url")
+        source[id(item)] = by_url.setdefault(canonical_url(url), url) if url else None
+    if dedupe:
+        index = NearDuplicateIndex()
+        for item in items:
+            index.add(item)
+        for members in index.clusters:
+            for member in members:
+                source[id(member)] = source[id(members[0])]
+    bodies = fetch_articles(list(dict.fromkeys(u for u in source.values() if u)), **kwargs)
+    for item in items:
+        url = source[id(item)]
+        item["body"] = bodies.get(url, {}).get("text")
+        item["body_url"] = url
+    return items
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .db_utils import connect
+
+# Alpha Vantage NEWS_SENTIMENT timestamps ("20260113T075810") sort lexicographically
+TIME_FORMAT = "%Y%m%dT%H%M%S"
+
+_CHUNK_SIZE = 64 * 1024
+_INSERT_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_articles (
+    id INTEGER PRIMARY KEY,
+    url_hash TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT,
+    summary TEXT,
+    source TEXT,
+    time_published TEXT NOT NULL,
+    overall_sentiment_score REAL,
+    overall_sentiment_label TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_news_articles_time ON news_articles (time_published);
+
+CREATE TABLE IF NOT EXISTS news_ticker_sentiment (
+    ticker TEXT NOT NULL,
+    time_published TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    relevance_score REAL,
+    sentiment_score REAL,
+    sentiment_label TEXT,
+    PRIMARY KEY (ticker, time_published, article_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS news_topics (
+    topic TEXT NOT NULL,
+    time_published TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    relevance_score REAL,
+    PRIMARY KEY (topic, time_published, article_id)
+) WITHOUT ROWID;
+"""
+
+
+def format_time(value) -> str:
+    """Feed timestamp for a datetime, or for `now - value` when given a timedelta."""
+    if isinstance(value, timedelta):
+        value = datetime.now(timezone.utc) - value
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    return str(value)
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.strptime(value, TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.strip().encode("utf-8")).hexdigest()
+
+
+def read_feed_header(path) -> dict:
+    """Top-level string fields that precede "feed" (items, score definitions)."""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(_CHUNK_SIZE)
+    head = head.split('"feed"', 1)[0]
+    return dict(re.findall(r'"(\w+)"\s*:\s*"((?:[^"\\]|\\.)*)"', head))
+
+
+def iter_feed_items(path, chunk_size: int = _CHUNK_SIZE):
+    """
+    Stream the items of a NEWS_SENTIMENT dump one by one.
+    Only the current item (plus one read chunk) is ever held in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        eof = False
+
+        # Skip the header up to the opening bracket of "feed"
+        while True:
+            match = re.search(r'"feed"\s*:\s*\[', buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            # Keep a tail in case the key is split across chunks
+            buffer = buffer[-16:] + chunk
+
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _insert_items(conn, items: list) -> int:
+    """Insert a batch of feed items, skipping URLs already stored. Returns new articles."""
+    tickers = []
+    topics = []
+    added = 0
+    for item in items:
+        url = item.get("url")
+        published = item.get("time_published")
+        if not url or not published:
+            continue
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO news_articles "
+            "(url_hash, url, title, summary, source, time_published, "
+            "overall_sentiment_score, overall_sentiment_label) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url_hash(url),
+                url,
+                item.get("title"),
+                item.get("summary"),
+                item.get("source"),
+                published,
+                _float(item.get("overall_sentiment_score")),
+                item.get("overall_sentiment_label"),
+            ),
+        )
+        if cursor.rowcount == 0:
+            continue
+        added += 1
+        article_id = cursor.lastrowid
+        for ts in item.get("ticker_sentiment", []):
+            tickers.append((
+                ts.get("ticker", "").upper(),
+                published,
+                article_id,
+                _float(ts.get("relevance_score")),
+                _float(ts.get("ticker_sentiment_score")),
+                ts.get("ticker_sentiment_label"),
+            ))
+        for topic in item.get("topics", []):
+            topics.append((topic.get("topic"), published, article_id, _float(topic.get("relevance_score"))))
+
+    conn.executemany("INSERT OR IGNORE INTO news_ticker_sentiment VALUES (?, ?, ?, ?, ?, ?)", tickers)
+    conn.executemany("INSERT OR IGNORE INTO news_topics VALUES (?, ?, ?, ?)", topics)
+    return added
+
+
+def ingest_feed(path, db_path=None) -> int:
+    """Stream one feed dump into the store in batched transactions. Returns new articles."""
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        added = 0
+        batch = []
+        for item in iter_feed_items(path):
+            batch.append(item)
+            if len(batch) >= _INSERT_BATCH:
+                with conn:
+                    added += _insert_items(conn, batch)
+                batch = []
+        if batch:
+            with conn:
+                added += _insert_items(conn, batch)
+        return added
+    finally:
+        conn.close()
+
+
+def ingest_path(path, db_path=None) -> dict:
+    """Ingest a feed file or every *.json feed under a directory (e.g. daily dumps)."""
+    path = Path(path)
+    files = sorted(path.rglob("*.json")) if path.is_dir() else [path]
+    return {str(f): ingest_feed(f, db_path=db_path) for f in files}
+
+
+def _query(sql: str, params: list, db_path=None) -> list:
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        cursor = conn.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+def _time_range(since, until) -> tuple:
+    return format_time(since) if since is not None else "", format_time(until) if until is not None else "~"
+
+
+def query_ticker_news(
+    ticker: str,
+    since=None,
+    until=None,
+    min_relevance: float = 0.0,
+    limit: int = None,
+    db_path=None,
+) -> list:
+    """
+    Articles mentioning `ticker` published in [since, until], newest first.
+    `since`/`until` take datetimes, feed timestamps, or a timedelta back from now
+    (e.g. since=timedelta(hours=48)). Only the (ticker, time) index range is read.
+    """
+    start, end = _time_range(since, until)
+    sql = (
+        "SELECT t.ticker, t.time_published, t.relevance_score, t.sentiment_score, "
+        "t.sentiment_label, a.title, a.url, a.source, a.summary, a.overall_sentiment_score "
+        "FROM news_ticker_sentiment t JOIN news_articles a ON a.id = t.article_id "
+        "WHERE t.ticker = ? AND t.time_published >= ? AND t.time_published <= ? "
+        "AND t.relevance_score >= ? ORDER BY t.time_published DESC"
+    )
+    params = [ticker.upper(), start, end, min_relevance]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return _query(sql, params, db_path)
+
+
+def query_topic_news(topic: str, since=None, until=None, limit: int = None, db_path=None) -> list:
+    """Articles tagged with `topic` published in [since, until], newest first."""
+    start, end = _time_range(since, until)
+    sql = (
+        "SELECT n.topic, n.time_published, n.relevance_score, a.title, a.url, a.source, "
+        "a.summary, a.overall_sentiment_score, a.overall_sentiment_label "
+        "FROM news_topics n JOIN news_articles a ON a.id = n.article_id "
+        "WHERE n.topic = ? AND n.time_published >= ? AND n.time_published <= ? "
+        "ORDER BY n.time_published DESC"
+    )
+    params = [topic, start, end]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return _query(sql, params, db_path)
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.news_store tradagent/test/data/news/macro
+    for source, added in ingest_path(sys.argv[1]).items():
+        print(f"{source}: {added} new articles")
@@ -0,0 +1,238 @@
+import math
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from .db_utils import connect
+from .news_dedup import deduplicate
+from .news_store import parse_time, query_ticker_news, url_hash
+
+# Mistral tokenizes English news prose at roughly 4 characters per token
+CHARS_PER_TOKEN = 4
+
+DEFAULT_BATCH_TOKENS = 3000  # article text per request
+DEFAULT_RUN_TOKENS = 40_000  # prompt + expected output across a whole run
+DEFAULT_ARTICLE_TOKENS = 150  # longer summaries are truncated
+OUTPUT_TOKENS_PER_ARTICLE = 45  # one-sentence takeaway plus impact label
+DEFAULT_SUMMARY_CONCURRENCY = 2
+DEFAULT_RECENCY_HALF_LIFE = timedelta(hours=24)
+
+IMPACTS = {"bullish", "bearish", "neutral"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_summaries (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    takeaway TEXT NOT NULL,
+    impact TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, tokens: int) -> str:
+    text = " ".join((text or "").split())
+    limit = tokens * CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def rank_articles(articles: list, asof: datetime = None, half_life: timedelta = DEFAULT_RECENCY_HALF_LIFE) -> list:
+    """
+    Articles sorted by relevance x 0.5^(age / half_life), boosted by the
+    log of the near-duplicate cluster size (stories many outlets carried).
+    """
+    asof = asof or datetime.now(timezone.utc)
+
+    def score(article):
+        age = (asof - parse_time(article["time_published"])).total_seconds()
+        decay = 0.5 ** (max(age, 0) / half_life.total_seconds())
+        return (article.get("relevance_score") or 0.0) * decay * (1 + math.log(article.get("cluster_size", 1)))
+
+    return sorted(articles, key=score, reverse=True)
+
+
+def pack_batches(articles: list, batch_tokens: int = DEFAULT_BATCH_TOKENS,
+                 article_tokens: int = DEFAULT_ARTICLE_TOKENS) -> list:
+    """Greedily pack ranked articles, in order, into batches of at most `batch_tokens` of text."""
+    batches = []
+    current, used = [], 0
+    for article in articles:
+        text = _truncate(f"{article.get('title') or ''}. {article.get('summary') or ''}", article_tokens)
+        cost = estimate_tokens(text) + 4  # numbering and newline
+        if current and used + cost > batch_tokens:
+            batches.append(current)
+            current, used = [], 0
+        current.append({**article, "text": text})
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def batch_cost(batch: list) -> int:
+    """Estimated tokens of one request: instructions, article text and the expected answer."""
+    from ..agents.news_analyst_agent import NEWS_PROMPT
+
+    return (
+        estimate_tokens(NEWS_PROMPT)
+        + sum(estimate_tokens(a["text"]) + 4 for a in batch)
+        + OUTPUT_TOKENS_PER_ARTICLE * len(batch)
+    )
+
+
+# ---- Cache ----
+
+def load_cached(urls: list, db_path=None) -> dict:
+    """Cached {"takeaway", "impact"} per URL."""
+    if not urls:
+        return {}
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        by_hash = {url_hash(u): u for u in urls}
+        keys = list(by_hash)
+        rows = []
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows += conn.execute(
+                f"SELECT url_hash, takeaway, impact FROM news_summaries WHERE url_hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        return {by_hash[h]: {"takeaway": takeaway, "impact": impact} for h, takeaway, impact in rows}
+    finally:
+        conn.close()
+
+
+def store_summaries(summaries: dict, db_path=None):
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO news_summaries VALUES (?, ?, ?, ?, ?)",
+                [(url_hash(url), url, s["takeaway"], s["impact"], now) for url, s in summaries.items()],
+            )
+    finally:
+        conn.close()
+
+
+# ---- Summarization ----
+
+def _summarize_batch(batch: list, llm, usage: dict, lock: threading.Lock) -> dict:
+    """One request for a whole batch. Returns {url: summary} for the articles the answer covered."""
+    from langchain.messages import HumanMessage, SystemMessage
+
+    from ..agents.news_analyst_agent import NEWS_PROMPT
+    from ..tools.report_writer_tools import extract_json_from_text
+
+    lines = "\n".join(f"[{i}] {a['text']}" for i, a in enumerate(batch, 1))
+    response = llm.invoke([SystemMessage(content=NEWS_PROMPT), HumanMessage(content=f"ARTICLES:\n{lines}")])
+
+    tokens = getattr(response, "usage_metadata", None) or {}
+    with lock:
+        usage["requests"] += 1
+        usage["tokens"] += tokens.get("total_tokens") or batch_cost(batch)
+
+    answer = extract_json_from_text(response.content)
+    results = {}
+    for entry in answer.get("articles", []):
+        try:
+            article = batch[int(entry["id"]) - 1]
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        takeaway = entry.get("takeaway")
+        if not isinstance(takeaway, str) or not takeaway.strip():
+            continue
+        impact = str(entry.get("impact", "")).lower()
+        results[article["url"]] = {"takeaway": takeaway.strip(), "impact": impact if impact in IMPACTS else "neutral"}
+    return results
+
+
+def summarize_news(
+    tickers: list,
+    llm,
+    since=timedelta(hours=48),
+    min_relevance: float = 0.2,
+    max_tokens: int = DEFAULT_RUN_TOKENS,
+    batch_tokens: int = DEFAULT_BATCH_TOKENS,
+    concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+    db_path=None,
+) -> dict:
+    """
+    News digest per ticker from the news store.
+
+    Each ticker's articles are deduplicated, ranked by relevance and recency
+    and packed into token-budgeted batches, one LLM request per batch. Batches
+    are taken round-robin across tickers (best first) until `max_tokens` is
+    spent, then sent `concurrency` at a time. Article takeaways are cached by
+    URL, so reruns only pay for new articles; articles left out by the budget
+    are reported in "skipped" and picked up by the next run.
+    """
+    ranked = {}
+    for ticker in dict.fromkeys(t.upper() for t in tickers):
+        articles = query_ticker_news(ticker, since=since, min_relevance=min_relevance, db_path=db_path)
+        ranked[ticker] = rank_articles(deduplicate(articles))
+
+    # An article tagged with several tickers is summarized once
+    cached = load_cached(list({a["url"] for articles in ranked.values() for a in articles}), db_path=db_path)
+    queued = set(cached)
+    queues = {}
+    for ticker, articles in ranked.items():
+        pending = [a for a in articles if a["url"] not in queued]
+        queued.update(a["url"] for a in pending)
+        queues[ticker] = pack_batches(pending, batch_tokens)
+
+    planned, budget = [], max_tokens
+    while any(queues.values()):
+        for queue in queues.values():
+            if queue and batch_cost(queue[0]) <= budget:
+                budget -= batch_cost(queue[0])
+                planned.append(queue.pop(0))
+            elif queue:
+                queue.clear()  # lower-ranked batches of this ticker wait for the next run
+
+    usage = {"requests": 0, "tokens": 0, "cached": len(cached), "failed": 0}
+    lock = threading.Lock()
+    fresh = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(_summarize_batch, batch, llm, usage, lock) for batch in planned]
+        for future in futures:
+            try:
+                fresh.update(future.result())
+            except Exception as e:
+                usage["failed"] += 1
+                print(f"[Warning] News summary batch failed: {e}")
+    if fresh:
+        store_summaries(fresh, db_path=db_path)
+
+    summaries = {**cached, **fresh}
+    digest = {}
+    for ticker, articles in ranked.items():
+        covered = [{**a, **summaries[a["url"]]} for a in articles if a["url"] in summaries]
+        digest[ticker] = {
+            "articles": [
+                {k: a.get(k) for k in ("title", "url", "source", "time_published", "cluster_size", "takeaway", "impact")}
+                for a in covered
+            ],
+            "impact": {impact: sum(a["impact"] == impact for a in covered) for impact in sorted(IMPACTS)},
+            "skipped": len(articles) - len(covered),
+        }
+    return {"tickers": digest, "usage": usage}
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.news_summary COIN JPM MS
+    from ..agents.news_analyst_agent import build_news_llm
+
+    result = summarize_news(sys.argv[1:], build_news_llm())
+    for ticker, digest in result["tickers"].items():
+        print(f"{ticker}: {digest['impact']} ({digest['skipped']} articles over budget)")
+        for article in digest["articles"][:5]:
+            print(f"  [{article['impact']}] {article['takeaway']}")
+    print(f"[System] {result['usage']}")
@@ -0,0 +1,453 @@
+import json
+import math
+import sys
+from collections import deque
+from datetime import datetime, timezone
+
+from .db_utils import connect
+
+TRADING_DAYS = 252
+
+# Windows of the rolling volatilities (vol_1y uses the last trading year of moves)
+VOL_WINDOWS = {"vol_30d": 30, "vol_90d": 90, "vol_1y": TRADING_DAYS}
+
+# Relative change of an already-seen close that means the history was re-adjusted
+_RESEED_TOLERANCE = 1e-6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indicator_state (
+    ticker TEXT PRIMARY KEY,
+    last_date TEXT,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+# ---- Single indicators ----
+# Each keeps at most `window` values, updates in O(1) with push(x) and can
+# report the value it would have after a tentative x with peek(x).
+
+class OnlineRSI:
+    """
+    RSI of close-to-close moves. "sma" smoothing matches compute_rsi (mean of
+    the last `window` moves); "wilder" seeds with that mean, then uses
+    avg = (avg * (window - 1) + move) / window.
+    """
+
+    def __init__(self, window: int = 14, smoothing: str = "sma"):
+        if smoothing not in ("sma", "wilder"):
+            raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+        self.window = window
+        self.smoothing = smoothing
+        self.last_close = None
+        self.moves = deque(maxlen=window)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+
+    def _next(self, close: float) -> tuple:
+        """(avg_gain, avg_loss, count) once `close` is pushed, without changing the state."""
+        if self.last_close is None:
+            return self.avg_gain, self.avg_loss, self.count
+        n = self.window
+        move = close - self.last_close
+        gain, loss = max(move, 0.0), max(-move, 0.0)
+
+        if self.smoothing == "wilder" and self.count >= n:
+            return (self.avg_gain * (n - 1) + gain) / n, (self.avg_loss * (n - 1) + loss) / n, self.count + 1
+        if len(self.moves) == n:
+            # The oldest move leaves the window
+            gain -= max(self.moves[0], 0.0)
+            loss -= max(-self.moves[0], 0.0)
+        return self.avg_gain + gain / n, self.avg_loss + loss / n, self.count + 1
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float, count: int, window: int) -> float:
+        if count < window:
+            return math.nan
+        if avg_loss <= 0:
+            return 100.0 if avg_gain > 0 else math.nan
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def push(self, close: float) -> float:
+        self.avg_gain, self.avg_loss, self.count = self._next(close)
+        if self.last_close is not None:
+            self.moves.append(close - self.last_close)
+            # Re-sum the window now and then so rounding from add/subtract never builds up
+            if self.smoothing == "sma" and self.count % (16 * self.window) == 0:
+                self.avg_gain = sum(max(m, 0.0) for m in self.moves) / self.window
+                self.avg_loss = sum(max(-m, 0.0) for m in self.moves) / self.window
+        self.last_close = close
+        return self.value
+
+    def peek(self, close: float) -> float:
+        return self._rsi(*self._next(close), self.window)
+
+    @property
+    def value(self) -> float:
+        return self._rsi(self.avg_gain, self.avg_loss, self.count, self.window)
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "smoothing": self.smoothing,
+            "last_close": self.last_close,
+            "moves": list(self.moves),
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "OnlineRSI":
+        rsi = cls(state["window"], state["smoothing"])
+        rsi.last_close = state["last_close"]
+        rsi.moves.extend(state["moves"])
+        rsi.avg_gain = state["avg_gain"]
+        rsi.avg_loss = state["avg_loss"]
+        rsi.count = state["count"]
+        return rsi
+
+
+class OnlineEMA:
+    """
+    Adjusted EWM, identical to pandas `ewm(span).mean()` over the same points:
+    num = num * decay + x, den = den * decay + 1, value = num / den.
+    """
+
+    def __init__(self, span: int):
+        self.span = span
+        self.decay = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+
+    def push(self, x: float) -> float:
+        self.num = self.num * self.decay + x
+        self.den = self.den * self.decay + 1
+        return self.value
+
+    def peek(self, x: float) -> float:
+        return (self.num * self.decay + x) / (self.den * self.decay + 1)
+
+    @property
+    def value(self) -> float:
+        return self.num / self.den if self.den else math.nan
+
+    def to_dict(self) -> dict:
+        return {"span": self.span, "num": self.num, "den": self.den}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "OnlineEMA":
+        ema = cls(state["span"])
+        ema.num = state["num"]
+        ema.den = state["den"]
+        return ema
+
+
+class OnlineMACD:
+    """MACD (fast EMA - slow EMA), its signal EMA and the histogram, as in compute_macd."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = OnlineEMA(fast)
+        self.slow = OnlineEMA(slow)
+        self.signal = OnlineEMA(signal)
+
+    @staticmethod
+    def _values(macd: float, signal: float) -> dict:
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+    def push(self, close: float) -> dict:
+        macd = self.fast.push(close) - self.slow.push(close)
+        return self._values(macd, self.signal.push(macd))
+
+    def peek(self, close: float) -> dict:
+        macd = self.fast.peek(close) - self.slow.peek(close)
+        return self._values(macd, self.signal.peek(macd))
+
+    @property
+    def value(self) -> dict:
+        macd = self.fast.value - self.slow.value
+        return self._values(macd, self.signal.value)
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "OnlineMACD":
+        macd = cls()
+        macd.fast = OnlineEMA.from_dict(state["fast"])
+        macd.slow = OnlineEMA.from_dict(state["slow"])
+        macd.signal = OnlineEMA.from_dict(state["signal"])
+        return macd
+
+
+class OnlineVolatility:
+    """Annualised sample std of the last `window` daily log returns (as in compute_volatility)."""
+
+    def __init__(self, window: int = 30):
+        self.window = window
+        self.last_close = None
+        self.returns = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.pushes = 0
+
+    def _next(self, close: float) -> tuple:
+        if self.last_close is None or close <= 0 or self.last_close <= 0:
+            return self.total, self.total_sq, len(self.returns)
+        r = math.log(close / self.last_close)
+        total, total_sq, n = self.total + r, self.total_sq + r * r, len(self.returns) + 1
+        if len(self.returns) == self.window:
+            old = self.returns[0]
+            total, total_sq, n = total - old, total_sq - old * old, n - 1
+        return total, total_sq, n
+
+    @staticmethod
+    def _vol(total: float, total_sq: float, n: int) -> float:
+        if n < 2:
+            return math.nan
+        variance = max((total_sq - total * total / n) / (n - 1), 0.0)
+        return math.sqrt(variance * TRADING_DAYS)
+
+    def push(self, close: float) -> float:
+        if self.last_close is not None and close > 0 and self.last_close > 0:
+            self.total, self.total_sq, _ = self._next(close)
+            self.returns.append(math.log(close / self.last_close))
+            self.pushes += 1
+            if self.pushes % (16 * self.window) == 0:
+                self.total = sum(self.returns)
+                self.total_sq = sum(r * r for r in self.returns)
+        self.last_close = close
+        return self.value
+
+    def peek(self, close: float) -> float:
+        return self._vol(*self._next(close))
+
+    @property
+    def value(self) -> float:
+        return self._vol(self.total, self.total_sq, len(self.returns))
+
+    def to_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "last_close": self.last_close,
+            "returns": list(self.returns),
+            "total": self.total,
+            "total_sq": self.total_sq,
+            "pushes": self.pushes,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "OnlineVolatility":
+        vol = cls(state["window"])
+        vol.last_close = state["last_close"]
+        vol.returns.extend(state["returns"])
+        vol.total = state["total"]
+        vol.total_sq = state["total_sq"]
+        vol.pushes = state["pushes"]
+        return vol
+
+
+# ---- Per-ticker state ----
+
+class TickerIndicators:
+    """
+    Online RSI, MACD and volatilities of one ticker, fed one daily bar at a time.
+
+    The bar of the latest date stays pending until a bar with a later date
+    arrives, so intraday updates of today's close are O(1) peeks that can be
+    revised any number of times; only completed bars are pushed.
+    """
+
+    def __init__(self, ticker: str, rsi_window: int = 14, rsi_smoothing: str = "sma"):
+        self.ticker = ticker.upper()
+        self.rsi = OnlineRSI(rsi_window, rsi_smoothing)
+        self.macd = OnlineMACD()
+        self.vols = {name: OnlineVolatility(window) for name, window in VOL_WINDOWS.items()}
+        self.committed_date = None
+        self.committed_close = None
+        self.pending = None  # (date, close) of the latest, possibly partial, bar
+
+    def _commit(self, day: str, close: float):
+        self.rsi.push(close)
+        self.macd.push(close)
+        for vol in self.vols.values():
+            vol.push(close)
+        self.committed_date = day
+        self.committed_close = close
+
+    def update(self, day: str, close: float) -> dict:
+        """Feed the close of `day` (ISO date). Earlier dates than the pending bar are ignored."""
+        close = float(close)
+        if self.pending is not None:
+            pending_day, pending_close = self.pending
+            if day < pending_day:
+                return self.snapshot()
+            if day > pending_day:
+                self._commit(pending_day, pending_close)
+        self.pending = (day, close)
+        return self.snapshot()
+
+    @property
+    def last_date(self):
+        return self.pending[0] if self.pending else self.committed_date
+
+    def snapshot(self) -> dict:
+        """Indicator values including the pending bar, keyed like compute_indicator_panel's columns."""
+        if self.pending is None:
+            return {"date": self.committed_date, "close": self.committed_close, "rsi_14d": self.rsi.value,
+                    **self.macd.value, **{name: vol.value for name, vol in self.vols.items()}}
+        day, close = self.pending
+        return {
+            "date": day,
+            "close": close,
+            "rsi_14d": self.rsi.peek(close),
+            **self.macd.peek(close),
+            **{name: vol.peek(close) for name, vol in self.vols.items()},
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "rsi": self.rsi.to_dict(),
+            "macd": self.macd.to_dict(),
+            "vols": {name: vol.to_dict() for name, vol in self.vols.items()},
+            "committed_date": self.committed_date,
+            "committed_close": self.committed_close,
+            "pending": list(self.pending) if self.pending else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TickerIndicators":
+        indicators = cls(state["ticker"])
+        indicators.rsi = OnlineRSI.from_dict(state["rsi"])
+        indicators.macd = OnlineMACD.from_dict(state["macd"])
+        indicators.vols = {name: OnlineVolatility.from_dict(v) for name, v in state["vols"].items()}
+        indicators.committed_date = state["committed_date"]
+        indicators.committed_close = state["committed_close"]
+        indicators.pending = tuple(state["pending"]) if state["pending"] else None
+        return indicators
+
+    @classmethod
+    def from_closes(cls, ticker: str, closes, **kwargs) -> "TickerIndicators":
+        """Seed from a date-indexed close series (e.g. get_history(ticker)["Close"])."""
+        indicators = cls(ticker, **kwargs)
+        for day, close in zip(closes.index.strftime("%Y-%m-%d"), closes.to_numpy(dtype=float)):
+            if not math.isnan(close):
+                indicators.update(day, close)
+        return indicators
+
+
+# ---- Persistence ----
+
+def save_states(states: list, db_path=None):
+    """Store TickerIndicators in one transaction."""
+    now = datetime.now(timezone.utc).isoformat()
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO indicator_state VALUES (?, ?, ?, ?)",
+                [(s.ticker, s.last_date, json.dumps(s.to_dict()), now) for s in states],
+            )
+    finally:
+        conn.close()
+
+
+def load_states(tickers: list, db_path=None) -> dict:
+    """Stored TickerIndicators by ticker; tickers never saved are missing."""
+    tickers = [t.upper() for t in tickers]
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        rows = conn.execute(
+            f"SELECT ticker, state FROM indicator_state WHERE ticker IN ({','.join('?' * len(tickers))})",
+            tickers,
+        ).fetchall()
+    finally:
+        conn.close()
+    return {ticker: TickerIndicators.from_dict(json.loads(state)) for ticker, state in rows}
+
+
+def _needs_reseed(indicators: TickerIndicators, closes) -> bool:
+    """True when the history no longer holds the committed bar unchanged (re-adjusted or too old)."""
+    if indicators.committed_date is None:
+        return True
+    dates = closes.index.strftime("%Y-%m-%d")
+    matches = closes.to_numpy(dtype=float)[dates == indicators.committed_date]
+    if len(matches) == 0 or math.isnan(matches[0]):
+        return True
+    return abs(matches[0] / indicators.committed_close - 1) > _RESEED_TOLERANCE
+
+
+def advance(ticker: str, indicators: TickerIndicators, closes) -> TickerIndicators:
+    """
+    Bring `indicators` up to date with a close series: only bars after the
+    committed one are fed. Missing state, or a history that was re-adjusted
+    (split, dividend) since the state was saved, is seeded from `closes`.
+    """
+    if indicators is None or _needs_reseed(indicators, closes):
+        return TickerIndicators.from_closes(ticker, closes)
+    dates = closes.index.strftime("%Y-%m-%d")
+    newer = dates > indicators.committed_date
+    for day, close in zip(dates[newer], closes.to_numpy(dtype=float)[newer]):
+        if not math.isnan(close):
+            indicators.update(day, close)
+    return indicators
+
+
+def update_indicators(tickers: list, days: int = 366, db_path=None, **cache_kwargs) -> dict:
+    """
+    Latest indicator snapshot per ticker from the cached prices and stored state.
+    Prices are refreshed with one batched get_close_panel call; each ticker then
+    costs O(new bars) instead of a recompute over months of history.
+    """
+    from .price_cache import get_close_panel
+
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    panel = get_close_panel(tickers, days=days, db_path=db_path, **cache_kwargs)
+    states = load_states(tickers, db_path=db_path)
+
+    updated = []
+    snapshots = {}
+    for ticker in tickers:
+        closes = panel[ticker].dropna()
+        if closes.empty:
+            continue
+        state = advance(ticker, states.get(ticker), closes)
+        updated.append(state)
+        snapshots[ticker] = state.snapshot()
+    save_states(updated, db_path=db_path)
+    return snapshots
+
+
+def compare_with_batch(ticker: str, data=None, rel_tol: float = 1e-3) -> dict:
+    """
+    Differences between the online snapshot seeded from `data` and
+    compute_rsi / compute_macd / compute_volatility on the same history, as
+    {name: (online, batch)} for the values outside `rel_tol` (relative to the
+    close for MACD values). compute_macd starts its EWMs 6 months back and the
+    online state a year back, hence the tolerance.
+    """
+    from .stock_utils import MarketData, compute_macd, compute_rsi, compute_volatility
+
+    data = data or MarketData(ticker)
+    online = TickerIndicators.from_closes(ticker, data.history["Close"]).snapshot()
+    batch = {"rsi_14d": compute_rsi(ticker, data=data), **compute_macd(ticker, data=data), **compute_volatility(ticker, data=data)}
+
+    mismatches = {}
+    for name, expected in batch.items():
+        scale = abs(online["close"]) if name in ("macd", "signal", "histogram") else abs(expected)
+        if not math.isclose(online[name], expected, rel_tol=0, abs_tol=rel_tol * (scale or 1.0)):
+            mismatches[name] = (online[name], expected)
+    return mismatches
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.online_indicators AAPL MSFT ...
+    for ticker, snapshot in update_indicators(sys.argv[1:]).items():
+        print(ticker, {k: round(v, 4) if isinstance(v, float) else v for k, v in snapshot.items()})
+        for name, (online, batch) in compare_with_batch(ticker).items():
+            print(f"  [Warning] {name}: online {online:.6f} vs batch {batch:.6f}")
@@ -0,0 +1,236 @@
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+from .db_utils import connect
+from .tracing import span
+
+# How long a fetched history is considered fresh before the last bars are refreshed
+OHLCV_TTL = timedelta(seconds=int(os.environ.get("TRADAGENT_OHLCV_TTL", 15 * 60)))
+
+# Relative move of an overlapping bar that means the series was re-adjusted (split/dividend)
+_ADJUSTMENT_TOLERANCE = 1e-6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlcv (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ohlcv_meta (
+    ticker TEXT PRIMARY KEY,
+    covered_from TEXT NOT NULL,
+    last_date TEXT,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _to_rows(ticker: str, hist: pd.DataFrame) -> list:
+    """Convert a yfinance history frame (None when Yahoo returned nothing) into ohlcv rows keyed by ISO date."""
+    if hist is None or hist.empty:
+        return []
+    hist = hist.dropna(subset=["Close"])
+    if hist.empty:
+        return []
+    dates = hist.index.strftime("%Y-%m-%d")
+    return [
+        (ticker, d, float(o), float(h), float(lo), float(c), int(v) if v == v else 0)
+        for d, o, h, lo, c, v in zip(
+            dates, hist["Open"], hist["High"], hist["Low"], hist["Close"], hist["Volume"]
+        )
+    ]
+
+
+def _fetch(tickers: list, start: str) -> dict:
+    """Download daily bars from `start` for all `tickers` in one request."""
+    import yfinance as yf
+    from yfinance.exceptions import YFRateLimitError
+
+    from .clients import YAHOO_TIMEOUT, call_with_retry
+
+    with span("fetch.yahoo.history", tickers=len(tickers), start=start):
+        if len(tickers) == 1:
+            hist = call_with_retry(
+                "yahoo", yf.Ticker(tickers[0]).history, start=start, timeout=YAHOO_TIMEOUT,
+                retry_on=(YFRateLimitError,),
+            )
+            return {tickers[0]: hist}
+
+        frame = call_with_retry(
+            "yahoo", yf.download, tickers, start=start, group_by="ticker", auto_adjust=True, progress=False,
+            threads=True, timeout=YAHOO_TIMEOUT, retry_on=(YFRateLimitError,),
+        )
+    return {t: frame[t] for t in tickers if t in frame.columns.get_level_values(0)}
+
+
+def _store(conn, ticker: str, rows: list, covered_from: str, replace: bool = False):
+    if replace:
+        conn.execute("DELETE FROM ohlcv WHERE ticker = ?", (ticker,))
+    conn.executemany("INSERT OR REPLACE INTO ohlcv VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    last_date = conn.execute(
+        "SELECT MAX(date) FROM ohlcv WHERE ticker = ?", (ticker,)
+    ).fetchone()[0]
+    conn.execute(
+        "INSERT OR REPLACE INTO ohlcv_meta VALUES (?, ?, ?, ?)",
+        (ticker, covered_from, last_date, _utcnow().isoformat()),
+    )
+
+
+def _is_readjusted(conn, ticker: str, rows: list, anchor: str) -> bool:
+    """True if the refetched anchor bar (a completed bar) no longer matches the cached one."""
+    fresh = next((r for r in rows if r[1] == anchor), None)
+    cached = conn.execute(
+        "SELECT close FROM ohlcv WHERE ticker = ? AND date = ?", (ticker, anchor)
+    ).fetchone()
+    if fresh is None or cached is None or not cached[0]:
+        return False
+    return abs(fresh[5] / cached[0] - 1) > _ADJUSTMENT_TOLERANCE
+
+
+def _refetch_full(conn, ranges: dict):
+    """Fetch and replace whole ranges ({ticker: covered_from}) in one download."""
+    if not ranges:
+        return
+    frames = _fetch(list(ranges), min(ranges.values()))
+    for ticker, covered_from in ranges.items():
+        rows = [r for r in _to_rows(ticker, frames.get(ticker)) if r[1] >= covered_from]
+        # No data this time (delisted, throttled...): keep whatever is cached
+        _store(conn, ticker, rows, covered_from, replace=bool(rows))
+
+
+def refresh_histories(
+    conn, tickers: list, start: str, ttl: timedelta = OHLCV_TTL, force: bool = False
+):
+    """
+    Bring the cached bars for `tickers` up to date from `start`.
+    Only the missing ranges are downloaded (one batched request for all stale
+    tickers); nothing is fetched for tickers refreshed inside the TTL. A ticker
+    Yahoo had no bars for is remembered as such (last_date NULL) and only
+    retried once the TTL has expired.
+    """
+    placeholders = ",".join("?" * len(tickers))
+    metas = {
+        row[0]: row[1:]
+        for row in conn.execute(
+            "SELECT ticker, covered_from, last_date, fetched_at FROM ohlcv_meta "
+            f"WHERE ticker IN ({placeholders})",
+            tickers,
+        )
+    }
+
+    # Cold start (or older data requested): fetch the whole range once
+    cold = {}
+    anchors = {}
+    now = _utcnow()
+    for ticker in tickers:
+        meta = metas.get(ticker)
+        expired = meta is not None and (force or now - datetime.fromisoformat(meta[2]) >= ttl)
+        if meta is None or meta[0] > start or (meta[1] is None and expired):
+            cold[ticker] = min(start, meta[0]) if meta else start
+        elif meta[1] is None:
+            continue  # no data last time, still within the TTL
+        elif expired:
+            # The last cached bar may have been a partial intraday bar, so refetch from
+            # the bar before it and use that completed bar to detect re-adjustments
+            anchor = conn.execute(
+                "SELECT date FROM ohlcv WHERE ticker = ? ORDER BY date DESC LIMIT 1 OFFSET 1",
+                (ticker,),
+            ).fetchone()
+            anchors[ticker] = anchor[0] if anchor else meta[1]
+
+    _refetch_full(conn, cold)
+
+    if anchors:
+        readjusted = {}
+        frames = _fetch(list(anchors), min(anchors.values()))
+        for ticker, anchor in anchors.items():
+            rows = [r for r in _to_rows(ticker, frames.get(ticker)) if r[1] >= anchor]
+            if _is_readjusted(conn, ticker, rows, anchor):
+                readjusted[ticker] = metas[ticker][0]
+            else:
+                _store(conn, ticker, rows, metas[ticker][0])
+        _refetch_full(conn, readjusted)
+
+
+def read_history(conn, ticker: str, start: str) -> pd.DataFrame:
+    """Read cached bars from `start` as a yfinance-shaped frame."""
+    rows = conn.execute(
+        "SELECT date, open, high, low, close, volume FROM ohlcv "
+        "WHERE ticker = ? AND date >= ? ORDER BY date",
+        (ticker, start),
+    ).fetchall()
+    hist = pd.DataFrame(rows, columns=["Date"] + COLUMNS)
+    hist.index = pd.DatetimeIndex(pd.to_datetime(hist.pop("Date")), name="Date")
+    return hist
+
+
+def get_history(
+    ticker: str,
+    days: int = 366,
+    ttl: timedelta = OHLCV_TTL,
+    force: bool = False,
+    db_path=None,
+) -> pd.DataFrame:
+    """
+    Daily OHLCV bars for the last `days` calendar days, served from the local cache.
+    Repeat calls within the TTL need no download; otherwise only the gap is fetched.
+    """
+    ticker = ticker.upper()
+    start = (date.today() - timedelta(days=days)).isoformat()
+
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            refresh_histories(conn, [ticker], start, ttl=ttl, force=force)
+        return read_history(conn, ticker, start)
+    finally:
+        conn.close()
+
+
+def get_close_panel(
+    tickers: list,
+    days: int = 366,
+    ttl: timedelta = OHLCV_TTL,
+    force: bool = False,
+    db_path=None,
+) -> pd.DataFrame:
+    """
+    Date x ticker panel of daily closes for `tickers`.
+    Stale tickers are refreshed with a single batched download.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    start = (date.today() - timedelta(days=days)).isoformat()
+
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            refresh_histories(conn, tickers, start, ttl=ttl, force=force)
+        placeholders = ",".join("?" * len(tickers))
+        rows = conn.execute(
+            "SELECT date, ticker, close FROM ohlcv "
+            f"WHERE ticker IN ({placeholders}) AND date >= ?",
+            tickers + [start],
+        ).fetchall()
+    finally:
+        conn.close()
+
+    long = pd.DataFrame(rows, columns=["Date", "ticker", "close"])
+    panel = long.pivot(index="Date", columns="ticker", values="close")
+    panel.index = pd.DatetimeIndex(pd.to_datetime(panel.index), name="Date")
+    return panel.reindex(columns=tickers).sort_index()
@@ -0,0 +1,80 @@
+import re
+from collections import Counter
+
+# Upper-case symbol, optionally with an exchange/class suffix (BRK.B, BTC-USD, MC.PA)
+TICKER_PATTERN = re.compile(r"^\$?([A-Z]{1,5}(?:[.-][A-Z]{1,4})?)$")
+
+ANALYSIS_WORDS = {
+    "analyze", "analyse", "analysis", "analyzing", "check", "evaluate", "review",
+    "quote", "stock", "stocks", "shares", "ticker", "look", "at",
+}
+REPORT_WORDS = {"report", "reports", "pdf", "document", "doc", "write-up", "writeup"}
+FILLER_WORDS = {
+    "a", "an", "the", "and", "then", "also", "please", "me", "for", "of", "on",
+    "generate", "create", "make", "produce", "build", "with", "give", "get", "run",
+    "full", "quick", "i", "want", "need", "can", "you", "it", "its", "to", "do",
+}
+KNOWN_WORDS = ANALYSIS_WORDS | REPORT_WORDS | FILLER_WORDS
+
+# How often each routing path was taken ("rules" here, "llm" recorded by the caller)
+ROUTE_STATS = Counter()
+
+
+def _tokens(text: str) -> list:
+    return [t for t in re.split(r"[\s,;:!?()\"']+", text.strip()) if t]
+
+
+def extract_tickers(text: str) -> list:
+    """Upper-case ticker-looking tokens of `text`, in order, without known keywords."""
+    tickers = []
+    for token in _tokens(text):
+        token = token.rstrip(".")
+        match = TICKER_PATTERN.match(token)
+        if match and token.lower() not in KNOWN_WORDS and match.group(1) not in tickers:
+            tickers.append(match.group(1))
+    return tickers
+
+
+def _ambiguous_keywords(text: str) -> list:
+    """
+    Keywords written like tickers ("IT", "AT"): they may be symbols (IT is
+    Gartner), so a query containing one is left to the LLM. Report words
+    are acronyms (PDF, DOC) and stay keywords.
+    """
+    words = ANALYSIS_WORDS | FILLER_WORDS
+    tokens = (t.rstrip(".") for t in _tokens(text))
+    return [t for t in tokens if len(t) > 1 and t.isupper() and TICKER_PATTERN.match(t) and t.lower() in words]
+
+
+def route_query(text: str):
+    """
+    Build the orchestrator plan locally for unambiguous queries.
+
+    Returns the same dict the orchestrator agent produces
+    ({run_stock_analysis, run_report_generation, clean_query}), or None
+    when the query needs the LLM (several tickers, unknown words, keywords
+    that could be tickers...).
+    """
+    tickers = extract_tickers(text)
+    if len(tickers) != 1 or _ambiguous_keywords(text):
+        return None
+
+    ticker = tickers[0]
+    words = [t.rstrip(".").lower() for t in _tokens(text) if t.rstrip(".").lstrip("$") != ticker]
+    if any(w not in KNOWN_WORDS for w in words):
+        return None
+
+    ROUTE_STATS["rules"] += 1
+    return {
+        "run_stock_analysis": True,
+        "run_report_generation": any(w in REPORT_WORDS for w in words),
+        "clean_query": f"Analyze {ticker}",
+    }
+
+
+def format_route_stats() -> str:
+    total = sum(ROUTE_STATS.values())
+    if not total:
+        return "Routing: no queries"
+    parts = [f"{path}={count} ({count / total:.0%})" for path, count in sorted(ROUTE_STATS.items())]
+    return "Routing: " + ", ".join(parts)
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from .db_utils import connect
+from .news_store import SCHEMA, TIME_FORMAT, format_time
+
+# Alpha Vantage sentiment_score_definition:
+# x <= -0.35: Bearish; -0.35 < x <= -0.15: Somewhat-Bearish; -0.15 < x < 0.15: Neutral;
+# 0.15 <= x < 0.35: Somewhat_Bullish; x >= 0.35: Bullish
+BUCKETS = ["bearish", "somewhat_bearish", "neutral", "somewhat_bullish", "bullish"]
+
+DEFAULT_HALF_LIFE = timedelta(hours=24)
+
+
+def sentiment_buckets(scores: np.ndarray) -> np.ndarray:
+    """Bucket index (into BUCKETS) of every score, following the feed header definition."""
+    return np.select(
+        [scores <= -0.35, scores <= -0.15, scores < 0.15, scores < 0.35],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+
+def load_sentiment_frame(tickers: list = None, since=None, until=None, dedupe: bool = True, db_path=None) -> pd.DataFrame:
+    """
+    Columnar (ticker, published, relevance, score, cluster_size) rows from the news store.
+    Filters use the (ticker, time_published) index; `since`/`until` as in query_ticker_news.
+    With `dedupe`, copies of the same story (see news_dedup) count once per ticker:
+    the most relevant copy is kept and `cluster_size` counts the copies.
+    """
+    sql = (
+        "SELECT t.ticker, t.time_published, t.relevance_score, t.sentiment_score, t.article_id, "
+        "a.url, a.title, a.summary "
+        "FROM news_ticker_sentiment t JOIN news_articles a ON a.id = t.article_id "
+        "WHERE t.time_published >= ? AND t.time_published <= ?"
+    )
+    params = [format_time(since) if since is not None else "", format_time(until) if until is not None else "~"]
+    if tickers:
+        sql += f" AND t.ticker IN ({','.join('?' * len(tickers))})"
+        params += [t.upper() for t in tickers]
+
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+    frame = pd.DataFrame(rows, columns=["ticker", "published", "relevance", "score", "article_id", "url", "title", "summary"])
+    frame["published"] = pd.to_datetime(frame["published"], format=TIME_FORMAT, utc=True)
+    frame = frame.dropna(subset=["relevance", "score"])
+    frame["cluster_size"] = 1
+    if dedupe and not frame.empty:
+        frame = _collapse_duplicates(frame)
+    return frame[["ticker", "published", "relevance", "score", "cluster_size"]].reset_index(drop=True)
+
+
+def _collapse_duplicates(frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per (ticker, story): articles are clustered once, then reduced per ticker."""
+    from .news_dedup import NearDuplicateIndex
+
+    index = NearDuplicateIndex()
+    articles = frame.drop_duplicates("article_id").sort_values("published")
+    clusters = {
+        article_id: index.add({"url": url, "title": title, "summary": summary})
+        for article_id, url, title, summary in zip(
+            articles["article_id"], articles["url"], articles["title"], articles["summary"]
+        )
+    }
+    frame = frame.assign(cluster=frame["article_id"].map(clusters))
+    sizes = frame.groupby(["ticker", "cluster"])["cluster"].transform("size")
+    frame = frame.assign(cluster_size=sizes).sort_values("relevance", ascending=False)
+    return frame.drop_duplicates(["ticker", "cluster"]).sort_values("published")
+
+
+def aggregate_ticker_sentiment(
+    frame: pd.DataFrame,
+    asof: datetime = None,
+    half_life: timedelta = DEFAULT_HALF_LIFE,
+) -> pd.DataFrame:
+    """
+    One row per ticker: article count, relevance-weighted score, bucket counts
+    and a time-decayed score (relevance x 0.5^(age / half_life)) as of `asof`.
+    Everything is computed on whole columns and reduced with a single groupby.
+    """
+    columns = ["articles", "weighted_score", "decayed_score", "mean_score", "last_published"] + BUCKETS
+    if frame.empty:
+        return pd.DataFrame(columns=columns).rename_axis("ticker")
+
+    asof = asof or frame["published"].max().to_pydatetime()
+    if asof.tzinfo is None:
+        asof = asof.replace(tzinfo=timezone.utc)
+
+    relevance = frame["relevance"].to_numpy(dtype=float)
+    score = frame["score"].to_numpy(dtype=float)
+    age = (pd.Timestamp(asof) - frame["published"]).dt.total_seconds().to_numpy()
+    decay = relevance * np.power(0.5, np.clip(age, 0, None) / half_life.total_seconds())
+    buckets = sentiment_buckets(score)
+
+    parts = pd.DataFrame({
+        "ticker": frame["ticker"].to_numpy(),
+        "articles": 1,
+        "rel": relevance,
+        "rel_score": relevance * score,
+        "decay": decay,
+        "decay_score": decay * score,
+        "score": score,
+        "last_published": frame["published"].to_numpy(),
+    })
+    for i, name in enumerate(BUCKETS):
+        parts[name] = (buckets == i).astype(int)
+
+    grouped = parts.groupby("ticker").agg(
+        articles=("articles", "sum"),
+        rel=("rel", "sum"),
+        rel_score=("rel_score", "sum"),
+        decay=("decay", "sum"),
+        decay_score=("decay_score", "sum"),
+        mean_score=("score", "mean"),
+        last_published=("last_published", "max"),
+        **{name: (name, "sum") for name in BUCKETS},
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grouped["weighted_score"] = grouped["rel_score"] / grouped["rel"]
+        grouped["decayed_score"] = grouped["decay_score"] / grouped["decay"]
+    return grouped[columns].sort_values("articles", ascending=False)
+
+
+def rolling_decayed_sentiment(
+    frame: pd.DataFrame,
+    freq: str = "1D",
+    half_life: timedelta = DEFAULT_HALF_LIFE,
+) -> pd.DataFrame:
+    """
+    Date x ticker panel of time-decayed, relevance-weighted sentiment sampled every `freq`.
+    Both decayed sums share their EWM weights, so their ratio is the decayed mean.
+    """
+    frame = frame.assign(rel_score=frame["relevance"] * frame["score"])
+    sums = frame.pivot_table(
+        index=pd.Grouper(key="published", freq=freq),
+        columns="ticker",
+        values=["rel_score", "relevance"],
+        aggfunc="sum",
+        fill_value=0.0,
+    ).asfreq(freq, fill_value=0.0)
+
+    halflife = pd.Timedelta(half_life) / pd.Timedelta(freq)
+    numerator = sums["rel_score"].ewm(halflife=halflife).mean()
+    denominator = sums["relevance"].ewm(halflife=halflife).mean()
+    return numerator / denominator.where(denominator > 0)
+
+
+def ticker_sentiment_table(
+    tickers: list = None,
+    since=timedelta(days=7),
+    asof: datetime = None,
+    half_life: timedelta = DEFAULT_HALF_LIFE,
+    dedupe: bool = True,
+    db_path=None,
+) -> pd.DataFrame:
+    """
+    Sentiment table for `tickers` (all tickers when None) over the news store,
+    ready to join onto compute_indicator_panel's per-ticker table. With
+    `dedupe`, each story counts once however many outlets carried it.
+    """
+    frame = load_sentiment_frame(tickers=tickers, since=since, dedupe=dedupe, db_path=db_path)
+    return aggregate_ticker_sentiment(frame, asof=asof, half_life=half_life)
+
+
+def sentiment_for_ticker(ticker: str, since=timedelta(days=7), db_path=None):
+    """Sentiment row for one ticker as a plain dict, or None if the store has no recent news."""
+    table = ticker_sentiment_table([ticker], since=since, asof=datetime.now(timezone.utc), db_path=db_path)
+    if table.empty:
+        return None
+    row = table.iloc[0]
+    return {
+        "articles": int(row["articles"]),
+        "weighted_score": float(row["weighted_score"]),
+        "decayed_score": float(row["decayed_score"]),
+        "buckets": {name: int(row[name]) for name in BUCKETS},
+    }
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+
+# Cold `import main` must stay under this many milliseconds (override with
+# TRADAGENT_STARTUP_BUDGET_MS on slow machines)
+STARTUP_BUDGET_MS = float(os.environ.get("TRADAGENT_STARTUP_BUDGET_MS", 300))
+
+# Modules that must only load when a query actually needs them
+DEFERRED_MODULES = [
+    "langchain",
+    "langchain_core",
+    "langchain_community",
+    "langchain_mistralai",
+    "yfinance",
+    "pandas",
+    "numpy",
+    "finnhub",
+    "newspaper",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str = "main", cwd: str = None) -> dict:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    Returns the total time in ms, the slowest direct imports and which
+    DEFERRED_MODULES were loaded anyway.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    imports = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumul_us, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        cumulative[name] = cumul_us
+        # Indent 1 is the interpreter's own startup plus `module`, 3 its direct imports
+        if indent == 3:
+            imports.append((name, cumul_us / 1000))
+
+    return {
+        "module": module,
+        "total_ms": cumulative.get(module, 0) / 1000,
+        "slowest": sorted(imports, key=lambda x: -x[1])[:10],
+        "deferred_loaded": [m for m in DEFERRED_MODULES if m in cumulative],
+    }
+
+
+def check_startup(module: str = "main", budget_ms: float = STARTUP_BUDGET_MS, cwd: str = None) -> list:
+    """Problems found with the startup path (empty when within budget)."""
+    result = measure_import(module, cwd=cwd)
+    problems = []
+    if result["total_ms"] > budget_ms:
+        problems.append(f"import {module} took {result['total_ms']:.0f} ms (budget {budget_ms:.0f} ms)")
+    for name in result["deferred_loaded"]:
+        problems.append(f"{name} is imported at startup; import it where it is used")
+    return problems
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.startup [module]
+    module = sys.argv[1] if len(sys.argv) > 1 else "main"
+    result = measure_import(module)
+    print(f"import {module}: {result['total_ms']:.1f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)")
+    for name, ms in result["slowest"]:
+        print(f"  {ms:8.1f} ms  {name}")
+    problems = check_startup(module)
+    for problem in problems:
+        print(f"[Error] {problem}")
+    sys.exit(1 if problems else 0)
@@ -1,9 +1,62 @@
-import yfinance as yf
 import numpy as np
 import pandas as pd
 
-def get_latest_ohlc(ticker: str):
-    hist = yf.Ticker(ticker).history(period="1mo")
+from .price_cache import get_history
+from .tracing import span
+
+
+class MarketData:
+    """
+    Per-request bundle of market data for one ticker.
+    Each dataset (1y daily history, info dict) is fetched at most once and
+    every metric is derived from slices of it. History goes through the
+    local OHLCV cache, so repeat analyses only download the missing bars.
+    """
+
+    def __init__(self, ticker: str, history: pd.DataFrame = None, info: dict = None):
+        self.ticker = ticker.upper()
+        self._history = history
+        self._info = info
+
+    @property
+    def history(self) -> pd.DataFrame:
+        if self._history is None:
+            self._history = get_history(self.ticker)
+        return self._history
+
+    @property
+    def info(self) -> dict:
+        if self._info is None:
+            import yfinance as yf
+            from yfinance.exceptions import YFRateLimitError
+
+            from .clients import call_with_retry
+
+            with span("fetch.yahoo.info", ticker=self.ticker):
+                self._info = call_with_retry(
+                    "yahoo", lambda: yf.Ticker(self.ticker).info, retry_on=(YFRateLimitError,)
+                )
+        return self._info
+
+
+def load_market_data(ticker: str) -> MarketData:
+    """Fetch history and info for `ticker` once and return the bundle."""
+    data = MarketData(ticker)
+    data.history
+    data.info
+    return data
+
+
+def _last_months(hist: pd.DataFrame, months: int) -> pd.DataFrame:
+    """Trailing `months` of a history frame, mirroring yfinance's period=<n>mo."""
+    if hist.empty:
+        return hist
+    start = hist.index[-1] - pd.DateOffset(months=months)
+    return hist[hist.index > start]
+
+
+def get_latest_ohlc(ticker: str, data: MarketData = None):
+    hist = (data or MarketData(ticker)).history
     last = hist.iloc[-1]
 
     return {
@@ -14,8 +67,8 @@ def get_latest_ohlc(ticker: str):
         "volume": int(last["Volume"])
     }
 
-def compute_rsi(ticker: str, window=14):
-    hist = yf.Ticker(ticker).history(period="3mo")
+def compute_rsi(ticker: str, window=14, data: MarketData = None):
+    hist = _last_months((data or MarketData(ticker)).history, 3)
     delta = hist["Close"].diff()
 
     gain = delta.clip(lower=0)
@@ -27,8 +80,8 @@ def compute_rsi(ticker: str, window=14):
     return float(rsi.iloc[-1])
 
 
-def compute_macd(ticker: str):
-    hist = yf.Ticker(ticker).history(period="6mo")
+def compute_macd(ticker: str, data: MarketData = None):
+    hist = _last_months((data or MarketData(ticker)).history, 6)
     exp12 = hist["Close"].ewm(span=12).mean()
     exp26 = hist["Close"].ewm(span=26).mean()
 
@@ -41,11 +94,10 @@ def compute_macd(ticker: str):
         "histogram": float((macd - signal).iloc[-1])
     }
 
-def compute_volatility(ticker: str):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period='1y')
+def compute_volatility(ticker: str, data: MarketData = None):
+    hist = (data or MarketData(ticker)).history
 
-    returns = returns = (hist["Close"] / hist["Close"].shift(1)).apply(np.log).dropna()
+    returns = (hist["Close"] / hist["Close"].shift(1)).apply(np.log).dropna()
 
     return {
         "vol_30d": float(returns[-30:].std() * np.sqrt(252)),
@@ -53,8 +105,8 @@ def compute_volatility(ticker: str):
         "vol_1y": float(returns.std() * np.sqrt(252))
     }
 
-def get_earnings_and_valuation(ticker: str):
-    info = yf.Ticker(ticker).info
+def get_earnings_and_valuation(ticker: str, data: MarketData = None):
+    info = (data or MarketData(ticker)).info
 
     return {
         "eps_trailing": info.get("trailingEps"),
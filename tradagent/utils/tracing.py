@@ -0,0 +1,314 @@
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+
+# Standard library only: this module is imported on the startup path
+
+TRACE_DIR = Path(os.environ.get("TRADAGENT_TRACE_DIR", "traces"))
+MAX_SPANS = 50_000  # finished spans kept in memory for the per-request breakdown
+RESERVOIR = 10_000  # latest durations kept per stage for the percentiles
+QUANTILES = (0.5, 0.9, 0.99)
+
+_current = contextvars.ContextVar("tradagent_span", default=None)
+_ids = itertools.count(1)
+
+
+class Span:
+    """One timed stage. Use through span(); nested spans share the trace id."""
+
+    __slots__ = ("name", "attrs", "trace_id", "span_id", "parent_id", "start", "duration_ms", "status",
+                 "_t0", "_token")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.status = "ok"
+        self.duration_ms = None
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def begin(self, activate: bool = True):
+        parent = _current.get()
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = next(_ids)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        if activate:
+            self._token = _current.set(self)
+        return self
+
+    def end(self, error: BaseException = None):
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000
+        if error is not None:
+            self.status = "error"
+            self.attrs["error"] = f"{type(error).__name__}: {error}"
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        TRACER.record(self)
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc)
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+class _NoopSpan:
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans: per-stage latency reservoirs for percentiles,
+    LLM token counters, the recent spans for per-request breakdowns and,
+    when a directory is set, one JSON line per span in spans.jsonl.
+    Disabled by default, so span() costs one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.spans = deque(maxlen=MAX_SPANS)
+        self.latencies = defaultdict(lambda: deque(maxlen=RESERVOIR))
+        self.totals = Counter()  # stage -> count / summed seconds, for OpenMetrics
+        self.tokens = Counter()  # (model, "input" | "output") -> tokens
+        self._lock = threading.Lock()
+        self._file = None
+
+    def enable(self, directory=None):
+        """Start tracing; with `directory`, spans are also appended to <directory>/spans.jsonl."""
+        self.enabled = True
+        if directory is not None:
+            self.directory = Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.directory / "spans.jsonl", "a", encoding="utf-8")
+
+    def record(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) if self._file else None
+        with self._lock:
+            self.spans.append(span)
+            self.latencies[span.name].append(span.duration_ms)
+            self.totals[(span.name, "count")] += 1
+            self.totals[(span.name, "sum")] += span.duration_ms / 1000
+            if line:
+                self._file.write(line + "\n")
+
+    def add_tokens(self, model: str, input_tokens: int = 0, output_tokens: int = 0):
+        with self._lock:
+            self.tokens[(model, "input")] += input_tokens or 0
+            self.tokens[(model, "output")] += output_tokens or 0
+
+    def trace(self, trace_id: str) -> list:
+        with self._lock:
+            return [s for s in self.spans if s.trace_id == trace_id]
+
+    def percentiles(self) -> dict:
+        """Per stage: count, mean and p50/p90/p99 in milliseconds."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self.latencies.items()}
+        return {
+            name: {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                **{f"p{int(q * 100)}": values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES},
+            }
+            for name, values in samples.items() if values
+        }
+
+    def write_metrics(self, path=None) -> Path:
+        """OpenMetrics text: a latency summary per stage and LLM token counters."""
+        path = Path(path or (self.directory or TRACE_DIR) / "metrics.prom")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [
+            "# TYPE tradagent_stage_latency_seconds summary",
+            "# UNIT tradagent_stage_latency_seconds seconds",
+            "# HELP tradagent_stage_latency_seconds Latency of each traced stage.",
+        ]
+        for name, stats in sorted(self.percentiles().items()):
+            for q in QUANTILES:
+                value = stats[f"p{int(q * 100)}"] / 1000
+                lines.append(f'tradagent_stage_latency_seconds{{stage="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'tradagent_stage_latency_seconds_count{{stage="{name}"}} {self.totals[(name, "count")]}')
+            lines.append(f'tradagent_stage_latency_seconds_sum{{stage="{name}"}} {self.totals[(name, "sum")]:.6f}')
+        lines += [
+            "# TYPE tradagent_llm_tokens counter",
+            "# HELP tradagent_llm_tokens Tokens sent to and received from each model.",
+        ]
+        for (model, kind), count in sorted(self.tokens.items()):
+            lines.append(f'tradagent_llm_tokens_total{{model="{model}",kind="{kind}"}} {count}')
+        lines.append("# EOF")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **attrs):
+    """Context manager timing a stage, e.g. `with span("fetch.wikipedia", query=q):`."""
+    if not TRACER.enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def annotate(**attrs):
+    """Add attributes to the current span (no-op when tracing is off)."""
+    current = _current.get()
+    if current is not None:
+        current.set(**attrs)
+
+
+def traced(name: str):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def bind(fn):
+    """`fn` running in the caller's trace context (for thread pool submissions)."""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, fn)
+
+
+# ---- LLM calls ----
+
+_callback = None
+
+
+def llm_callback():
+    """
+    LangChain callback handler recording a span (with token counts) for
+    every chat model call. Attached to every model built by get_chat_model.
+    """
+    global _callback
+    if _callback is None:
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        class TracingCallbackHandler(BaseCallbackHandler):
+            def __init__(self):
+                self._open = {}
+
+            def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+                if not TRACER.enabled:
+                    return
+                params = kwargs.get("invocation_params") or {}
+                model = params.get("model") or params.get("model_name") or "chat"
+                # LLM spans are leaves: not made current, since callbacks may run in another context
+                self._open[run_id] = (Span(f"llm.{model}", {"model": model}).begin(activate=False), model)
+
+            def on_llm_end(self, response, *, run_id, **kwargs):
+                opened = self._open.pop(run_id, None)
+                if opened is None:
+                    return
+                llm_span, model = opened
+                usage = (response.llm_output or {}).get("token_usage") or {}
+                input_tokens = usage.get("prompt_tokens")
+                output_tokens = usage.get("completion_tokens")
+                if input_tokens is None and response.generations and response.generations[0]:
+                    metadata = getattr(response.generations[0][0].message, "usage_metadata", None) or {}
+                    input_tokens = metadata.get("input_tokens")
+                    output_tokens = metadata.get("output_tokens")
+                llm_span.set(input_tokens=input_tokens or 0, output_tokens=output_tokens or 0)
+                TRACER.add_tokens(model, input_tokens, output_tokens)
+                llm_span.end()
+
+            def on_llm_error(self, error, *, run_id, **kwargs):
+                opened = self._open.pop(run_id, None)
+                if opened is not None:
+                    opened[0].end(error)
+
+        _callback = TracingCallbackHandler()
+    return _callback
+
+
+# ---- Reports ----
+
+def format_trace(trace_id: str) -> str:
+    """Indented per-request breakdown: every span of the trace with its time and share of the total."""
+    spans = sorted(TRACER.trace(trace_id), key=lambda s: s.start)
+    if not spans:
+        return ""
+    children = defaultdict(list)
+    ids = {s.span_id for s in spans}
+    roots = []
+    for s in spans:
+        if s.parent_id in ids:
+            children[s.parent_id].append(s)
+        else:
+            roots.append(s)
+    total = sum(s.duration_ms for s in roots) or 1.0
+
+    lines = [f"{'STAGE':<48} {'MS':>10} {'SHARE':>7}  DETAILS"]
+
+    def walk(s, depth):
+        details = " ".join(f"{k}={v}" for k, v in s.attrs.items() if k != "error")
+        if s.status != "ok":
+            details = f"[{s.status}] {s.attrs.get('error', '')} {details}".strip()
+        label = ("  " * depth + s.name)[:48]
+        lines.append(f"{label:<48} {s.duration_ms:>10.1f} {s.duration_ms / total:>6.1%}  {details}")
+        for child in children[s.span_id]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def format_percentiles() -> str:
+    lines = [f"{'STAGE':<40} {'COUNT':>6} {'MEAN MS':>10} {'P50 MS':>10} {'P90 MS':>10} {'P99 MS':>10}"]
+    for name, stats in sorted(TRACER.percentiles().items()):
+        lines.append(
+            f"{name:<40} {stats['count']:>6} {stats['mean']:>10.1f} "
+            f"{stats['p50']:>10.1f} {stats['p90']:>10.1f} {stats['p99']:>10.1f}"
+        )
+    if TRACER.tokens:
+        lines.append("")
+        lines.append(f"{'MODEL':<40} {'INPUT TOKENS':>14} {'OUTPUT TOKENS':>14}")
+        for model in sorted({m for m, _ in TRACER.tokens}):
+            lines.append(f"{model:<40} {TRACER.tokens[(model, 'input')]:>14} {TRACER.tokens[(model, 'output')]:>14}")
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from .db_utils import connect
+from .tracing import span
+
+# Company overviews barely change: keep them for a month by default
+WIKI_TTL = timedelta(days=int(os.environ.get("TRADAGENT_WIKI_TTL_DAYS", 30)))
+
+# One page, trimmed: enough for a 2-3 sentence summary without flooding the prompt
+WIKI_TOP_K = 1
+WIKI_CHARS = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wiki_summaries (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+_wrapper = None
+
+
+def _fetch(query: str) -> str:
+    from .clients import call_with_retry
+
+    global _wrapper
+    if _wrapper is None:
+        from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
+
+        _wrapper = WikipediaAPIWrapper(
+            top_k_results=WIKI_TOP_K,
+            doc_content_chars_max=WIKI_CHARS,
+            wiki_client=None,
+        )
+    with span("fetch.wikipedia", query=query):
+        return call_with_retry("wikipedia", _wrapper.run, query)
+
+
+def _key(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def _read(conn, keys: list):
+    for key in keys:
+        row = conn.execute(
+            "SELECT content, fetched_at FROM wiki_summaries WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            return row
+    return None
+
+
+def cached_summary(key: str, ttl: timedelta = WIKI_TTL, db_path=None):
+    """Fresh stored overview for a ticker or company name, or None (never hits the network)."""
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        row = _read(conn, [_key(key)])
+    finally:
+        conn.close()
+    if row and datetime.now(timezone.utc) - datetime.fromisoformat(row[1]) < ttl:
+        return row[0]
+    return None
+
+
+def get_company_summary(
+    query: str,
+    ticker: str = None,
+    ttl: timedelta = WIKI_TTL,
+    offline: bool = False,
+    db_path=None,
+) -> str:
+    """
+    Wikipedia overview for a company, served from the local store.
+
+    Entries are keyed by company name and, when given, by ticker, so a later
+    lookup by either skips the network. Stale entries are still returned
+    when the refresh fails or `offline` is set.
+    """
+    keys = [_key(k) for k in (ticker, query) if k]
+    now = datetime.now(timezone.utc)
+
+    conn = connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        cached = _read(conn, keys)
+
+        if cached and (offline or now - datetime.fromisoformat(cached[1]) < ttl):
+            return cached[0]
+        if offline:
+            return ""
+
+        try:
+            content = _fetch(query)
+        except Exception:
+            return cached[0] if cached else ""
+        if not content or content.startswith("No good Wikipedia Search Result"):
+            return cached[0] if cached else content
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO wiki_summaries VALUES (?, ?, ?)",
+                [(key, content, now.isoformat()) for key in keys],
+            )
+        return content
+    finally:
+        conn.close()
+
+
+def prewarm_summaries(tickers: list, names: dict = None, max_workers: int = 8) -> dict:
+    """
+    Fill the store for a list of tickers (e.g. an index's constituents).
+    Company names come from `names` when given, otherwise from yfinance.
+    """
+    import yfinance as yf
+
+    names = names or {}
+
+    def warm(ticker):
+        name = names.get(ticker)
+        if name is None:
+            try:
+                name = yf.Ticker(ticker).info.get("longName", ticker)
+            except Exception:
+                name = ticker
+        return ticker, bool(get_company_summary(name, ticker=ticker))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(warm, [t.upper() for t in tickers]))
+
+
+if __name__ == "__main__":
+    # python -m tradagent.utils.wiki_cache AAPL MSFT NVDA ...
+    results = prewarm_summaries(sys.argv[1:])
+    print(f"Cached {sum(results.values())}/{len(results)} company summaries")